@@ -2,121 +2,11 @@
  Chat Page - Interactive Financial Assistant
 """
 import streamlit as st
-import sys
-sys.path.append('..')
-from utils.ai_model import load_ai_model
+from utils.ai_model import call_log, load_ai_model
+from utils.bootstrap import setup_page
 
-st.set_page_config(
-    page_title="Chat - FinanceAI",
-    page_icon="💬",
-    layout="wide"
-)
-
-# Enhanced CSS with 3D Sidebar
-st.markdown("""
-<style>
-    /* 3D Animated Sidebar */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(135deg, 
-            rgba(20, 184, 166, 0.15) 0%, 
-            rgba(59, 130, 246, 0.15) 100%);
-        backdrop-filter: blur(20px);
-        perspective: 1000px;
-        box-shadow: 5px 0 30px rgba(0, 0, 0, 0.1),
-                    inset -1px 0 10px rgba(255, 255, 255, 0.5);
-        border-right: 1px solid rgba(255, 255, 255, 0.3);
-    }
-    
-    [data-testid="stSidebar"] > div:first-child {
-        padding: 2rem 1rem;
-        transform: perspective(1000px) rotateY(-2deg);
-        animation: sidebarFloat 6s ease-in-out infinite;
-    }
-    
-    @keyframes sidebarFloat {
-        0%, 100% {
-            transform: perspective(1000px) rotateY(-2deg) translateY(0px);
-        }
-        50% {
-            transform: perspective(1000px) rotateY(-2deg) translateY(-5px);
-        }
-    }
-    
-    /* Glassmorphism Settings Card */
-    .settings-card {
-        background: rgba(255, 255, 255, 0.7);
-        backdrop-filter: blur(10px);
-        border-radius: 16px;
-        padding: 1.5rem;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1),
-                    inset 0 1px 0 rgba(255, 255, 255, 0.5);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-        margin-bottom: 1rem;
-    }
-    
-    /* Quick Prompt Cards with 3D Effect */
-    .prompt-card {
-        background: white;
-        border-radius: 12px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.07);
-        transition: all 0.3s ease;
-        cursor: pointer;
-        border: 1px solid #E5E7EB;
-    }
-    
-    .prompt-card:hover {
-        transform: translateY(-4px) scale(1.02);
-        box-shadow: 0 12px 24px rgba(20, 184, 166, 0.2);
-        border-color: #14B8A6;
-    }
-    
-    /* Chat Messages */
-    .stChatMessage {
-        animation: slideIn 0.4s ease;
-    }
-    
-    @keyframes slideIn {
-        from {
-            opacity: 0;
-            transform: translateX(-20px);
-        }
-        to {
-            opacity: 1;
-            transform: translateX(0);
-        }
-    }
-    
-    /* Connection Status */
-    .status-indicator {
-        display: inline-block;
-        width: 10px;
-        height: 10px;
-        border-radius: 50%;
-        margin-right: 8px;
-        animation: pulse 2s ease-in-out infinite;
-    }
-    
-    .status-connected {
-        background: #10B981;
-        box-shadow: 0 0 10px rgba(16, 185, 129, 0.5);
-    }
-    
-    .status-disconnected {
-        background: #EF4444;
-    }
-    
-    @keyframes pulse {
-        0%, 100% {
-            opacity: 1;
-        }
-        50% {
-            opacity: 0.5;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+# Page configuration and 3D sidebar styles (styles/chat.css)
+setup_page("Chat - FinanceAI", "💬", styles=("chat",))
 
 # Initialize session state
 if 'messages' not in st.session_state:
@@ -125,6 +15,8 @@ if 'hf_token' not in st.session_state:
     st.session_state.hf_token = ""
 if 'user_type' not in st.session_state:
     st.session_state.user_type = "Professional"
+if 'backend' not in st.session_state:
+    st.session_state.backend = "Remote API"
 
 # Sidebar with 3D effect
 with st.sidebar:
@@ -149,6 +41,20 @@ with st.sidebar:
     )
     st.session_state.user_type = user_type
     
+    # Inference backend selection
+    backend = st.radio(
+        "🖥️ Inference Backend",
+        ["Remote API", "Local (CPU)"],
+        index=0 if st.session_state.backend == "Remote API" else 1,
+        help="Local runs IBM Granite in-process; the first load downloads and warms up the model."
+    )
+    st.session_state.backend = backend
+    use_local = backend == "Local (CPU)"
+    
+    if use_local:
+        quantize = st.checkbox("⚡ Int8 quantization", value=False)
+        num_threads = st.number_input("🧵 CPU threads", min_value=1, max_value=64, value=4, step=1)
+    
     # Clear chat button
     if st.button("🗑️ Clear Chat", use_container_width=True):
         st.session_state.messages = []
@@ -177,9 +83,10 @@ with st.sidebar:
 st.title("💬 FinanceAI Assistant")
 
 # Connection status
-status_class = "status-connected" if st.session_state.hf_token else "status-disconnected"
-status_text = "Connected" if st.session_state.hf_token else "Not Connected"
-status_color = "#10B981" if st.session_state.hf_token else "#EF4444"
+is_ready = bool(st.session_state.hf_token) or use_local
+status_class = "status-connected" if is_ready else "status-disconnected"
+status_text = ("Local Model" if use_local else "Connected") if is_ready else "Not Connected"
+status_color = "#10B981" if is_ready else "#EF4444"
 
 st.markdown(f"""
 <div style="display: flex; justify-content: space-between; align-items: center; padding: 1rem; background: rgba(255,255,255,0.5); border-radius: 12px; margin-bottom: 1rem;">
@@ -194,8 +101,8 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
-# Check for token
-if not st.session_state.hf_token:
+# Check for token (not needed for the local backend)
+if not is_ready:
     st.warning("⚠️ Please enter your Hugging Face API token in the sidebar to start chatting.")
     st.info("""
     **How to get your token:**
@@ -208,7 +115,16 @@ if not st.session_state.hf_token:
 else:
     # Load model
     try:
-        model = load_ai_model(st.session_state.hf_token)
+        if use_local:
+            with st.spinner("Loading local Granite model..."):
+                model = load_ai_model(
+                    st.session_state.hf_token,
+                    backend="local",
+                    quantize=quantize,
+                    num_threads=int(num_threads)
+                )
+        else:
+            model = load_ai_model(st.session_state.hf_token)
     except Exception as e:
         st.error(f"❌ Error loading model: {e}")
         st.stop()
@@ -236,3 +152,37 @@ else:
         st.session_state.messages.append({"role": "user", "content": prompt})
         with st.chat_message("user"):
             st.markdown(prompt)
+    
+    # Stream the assistant reply for the pending user turn (typed or quick prompt)
+    if st.session_state.messages and st.session_state.messages[-1]["role"] == "user":
+        with st.chat_message("assistant"):
+            response = st.write_stream(
+                model.stream_response(
+                    st.session_state.messages,
+                    user_type=st.session_state.user_type.lower()
+                )
+            )
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": response,
+            "prompt_tokens": model.last_prompt_tokens
+        })
+
+# Hidden diagnostics panel: open the page with ?diagnostics=1
+if st.query_params.get("diagnostics") == "1":
+    with st.sidebar:
+        with st.expander("🩺 Diagnostics", expanded=True):
+            summary = call_log.summary()
+            st.caption(f"Last {summary['calls']} model calls • {summary['cache_hits']} cache hits")
+            stages = [("prompt_build", "Prompt build"), ("queue_wait", "Queue wait"), ("ttft", "First token"), ("latency", "Total")]
+            rows = []
+            for field, label in stages:
+                timing = summary['timings'][field]
+                rows.append({'Stage': label, **{q: f"{timing[q] * 1000:,.0f} ms" if q in timing else "–" for q in ("p50", "p95", "p99")}})
+            st.table(rows)
+            st.caption(
+                f"Mean tokens: {summary['mean_prompt_tokens']:,.0f} prompt, "
+                f"{summary['mean_completion_tokens']:,.0f} completion"
+            )
+            if summary['errors']:
+                st.caption("Errors: " + ", ".join(f"{name} ×{count}" for name, count in summary['errors'].items()))
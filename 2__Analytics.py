@@ -1,45 +1,20 @@
 """
 Analytics Page - Financial Dashboard
 """
+import io
+import time
+
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-import sys
-sys.path.append('..')
+from utils.ai_model import load_ai_model
+from utils.bootstrap import setup_page
+from utils.charts import figure_cache, overview_bar, projection_fan, spending_donut
 from utils.financial_advisor import FinancialAdvisor
+from utils.insights import get_insights, monthly_history
+from utils.ledger import LedgerSummary
+from utils.projection import RISK_PROFILES
 
-st.set_page_config(
-    page_title="Analytics - FinanceAI",
-    page_icon="📊",
-    layout="wide"
-)
-
-# Enhanced CSS
-st.markdown("""
-<style>
-    .metric-card {
-        background: white;
-        border-radius: 16px;
-        padding: 1.5rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.07);
-        transition: all 0.3s ease;
-        text-align: center;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 8px 15px rgba(0, 0, 0, 0.12);
-    }
-    
-    .chart-container {
-        background: white;
-        border-radius: 16px;
-        padding: 1.5rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.07);
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Page configuration and card styles (styles/analytics.css)
+setup_page("Analytics - FinanceAI", "📊", styles=("analytics",))
 
 # Initialize financial data in session state
 if 'financial_data' not in st.session_state:
@@ -62,6 +37,10 @@ if 'financial_data' not in st.session_state:
 
 data = st.session_state.financial_data
 
+# Figure cache counters at the start of this rerun, for the timing panel
+rerun_start = time.perf_counter()
+cache_before = figure_cache.stats()
+
 # Title
 st.title("📊 Financial Analytics")
 st.markdown("Visualize your financial data and get AI-powered insights")
@@ -119,58 +98,35 @@ with col1:
     st.markdown("### 🍰 Spending Breakdown")
     
     # Donut chart
-    categories = list(data['spending'].keys())
-    values = list(data['spending'].values())
-    colors = ['#10B981', '#3B82F6', '#F59E0B', '#EF4444', '#14B8A6', '#EC4899', '#6B7280', '#8B5CF6']
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=categories,
-        values=values,
-        hole=.4,
-        marker=dict(colors=colors),
-        textinfo='label+percent',
-        textposition='outside'
-    )])
-    
-    fig.update_layout(
-        showlegend=True,
-        height=400,
-        margin=dict(t=0, b=0, l=0, r=0)
-    )
+    fig = spending_donut(data)
     
     st.plotly_chart(fig, use_container_width=True)
     
+    # The written explanation needs the remote model, connected on the Chat page
+    hf_token = st.session_state.get('hf_token', "")
+    narrate = bool(hf_token) and st.session_state.get('backend', "Remote API") == "Remote API"
     if st.button("💡 Get AI Insights", use_container_width=True):
-        st.info("**AI Insight:** Your housing costs are 34% of income. Consider keeping it under 30% for better financial health.")
+        ledger = st.session_state.get('ledger')
+        history = monthly_history(ledger.pivot()) if ledger is not None and len(ledger.months) >= 2 else None
+        model = None
+        if narrate:
+            model = load_ai_model(hf_token)
+        with st.spinner("Analyzing your spending..."):
+            insights = get_insights(
+                data,
+                history,
+                model=model,
+                user_type=st.session_state.get('user_type', "Professional").lower()
+            )
+        st.info("**AI Insights:**\n\n" + "\n".join(f"- {line}" for line in insights['highlights']))
+        if insights['narrative']:
+            st.markdown(insights['narrative'])
 
 with col2:
     st.markdown("### 📊 Financial Overview")
     
     # Bar chart
-    categories = ['Income', 'Expenses', 'Savings', 'Debt']
-    values = [
-        data['monthly_income'],
-        data['monthly_expenses'],
-        data['monthly_savings'],
-        data['total_debt']
-    ]
-    colors_bar = ['#10B981', '#3B82F6', '#8B5CF6', '#EF4444']
-    
-    fig = go.Figure(data=[go.Bar(
-        x=categories,
-        y=values,
-        marker=dict(color=colors_bar),
-        text=values,
-        texttemplate='$%{text:,}',
-        textposition='outside'
-    )])
-    
-    fig.update_layout(
-        height=400,
-        margin=dict(t=20, b=0, l=0, r=0),
-        yaxis_title="Amount ($)",
-        showlegend=False
-    )
+    fig = overview_bar(data)
     
     st.plotly_chart(fig, use_container_width=True)
     
@@ -183,6 +139,73 @@ with col2:
 
 st.markdown("<br>", unsafe_allow_html=True)
 
+# Monte Carlo projection
+st.markdown("### 🔮 Long-term Projection")
+st.caption("Thousands of simulated futures with random raises, inflation and market returns. Bands show the middle 50% and 90% of outcomes.")
+
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    years = st.slider("Years", min_value=1, max_value=40, value=10)
+with col2:
+    current_savings = st.number_input("Current Savings ($)", value=10000, min_value=0, step=500)
+with col3:
+    debt_payment = st.number_input("Monthly Debt Payment ($)", value=min(100, data['total_debt']), min_value=0, step=25)
+with col4:
+    risk_profile = st.selectbox("Investment Mix", list(RISK_PROFILES), index=1)
+
+fig, outlook = projection_fan(data, years, current_savings, debt_payment, risk_profile)
+st.plotly_chart(fig, use_container_width=True)
+
+debt_free_month = outlook['debt_free_month']
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric(f"Median Savings in {years} Years", f"${outlook['median']:,.0f}")
+with col2:
+    st.metric("Pessimistic (5th percentile)", f"${outlook['p5']:,.0f}")
+with col3:
+    if debt_free_month is None:
+        st.metric("Debt-Free", "Not within horizon")
+    else:
+        st.metric("Debt-Free", "Already" if debt_free_month == 0 else f"In {debt_free_month} months")
+
+st.markdown("<br>", unsafe_allow_html=True)
+
+# Bank transaction import
+st.markdown("### 📂 Import Bank Transactions")
+
+with st.expander("Load a CSV or OFX export from your bank", expanded=False):
+    statement = st.file_uploader("Bank export", type=["csv", "ofx", "qfx"])
+    expenses_positive = st.checkbox("My CSV shows spending as positive amounts")
+    
+    if statement is not None and st.button("📥 Import Transactions", use_container_width=True):
+        statement_format = "csv" if statement.name.lower().endswith(".csv") else "ofx"
+        # Wrap the upload so it is parsed line by line instead of decoded in one piece
+        text = io.TextIOWrapper(statement, encoding="utf-8-sig", errors="replace", newline="")
+        try:
+            st.session_state.ledger = LedgerSummary.ingest(text, statement_format, expenses_positive=expenses_positive)
+        except ValueError as e:
+            st.error(f"❌ Could not read the file: {str(e)}")
+    
+    ledger = st.session_state.get('ledger')
+    if ledger is not None and ledger.months:
+        st.caption(f"{ledger.rows:,} transactions across {len(ledger.months)} months ({ledger.skipped:,} rows skipped)")
+        matching = ledger.categorizer_stats
+        if matching.get('calls'):
+            st.caption(
+                f"{matching['matched'] / matching['calls']:.0%} of purchases matched a merchant rule; "
+                f"{matching['unmatched']:,} went to Other"
+            )
+        month_choice = st.selectbox("Use", ["Average of all months"] + ledger.months[::-1])
+        if st.button("✅ Use These Numbers", use_container_width=True):
+            st.session_state.financial_data = ledger.financial_data(
+                None if month_choice == "Average of all months" else month_choice,
+                total_debt=data['total_debt']
+            )
+            st.rerun()
+        st.dataframe(ledger.pivot().round(0), use_container_width=True)
+
+st.markdown("<br>", unsafe_allow_html=True)
+
 # Update Financial Data Form
 st.markdown("### ⚙️ Update Your Financial Data")
 
@@ -237,3 +260,16 @@ with st.form("financial_data_form"):
         }
         st.success("✅ Financial data updated successfully!")
         st.rerun()
+
+# Render timing
+cache_after = figure_cache.stats()
+with st.sidebar:
+    with st.expander("⏱️ Render Timing"):
+        st.caption(f"Page rerun: {(time.perf_counter() - rerun_start) * 1000:.0f} ms")
+        st.caption(
+            f"Charts: {cache_after['hits'] - cache_before['hits']} cached, "
+            f"{cache_after['misses'] - cache_before['misses']} built "
+            f"({(cache_after['build_seconds'] - cache_before['build_seconds']) * 1000:.0f} ms)"
+        )
+        st.caption(f"Saved by the chart cache this rerun: {(cache_after['saved_seconds'] - cache_before['saved_seconds']) * 1000:.0f} ms")
+        st.caption(f"Saved since startup: {cache_after['saved_seconds']:.2f} s over {cache_after['hits']} hits")
@@ -1,16 +1,52 @@
 """
 Research Hub Page - Save and organize financial research
 """
+import html
+import io
+from collections import OrderedDict
+
 import streamlit as st
-import sys
-sys.path.append('..')
-from utils.database import ResearchDatabase
+from utils.bootstrap import setup_page
+from utils.database import ResearchDatabase, SharedMemoryStorage
+from utils.topic_transfer import read_topics
+
+# Topics rendered per page
+PAGE_SIZE = 20
+# Rendered topic fragments kept per session
+MAX_CACHED_FRAGMENTS = 500
+
+
+def topic_fragments(topic: dict) -> tuple:
+    """
+    Get a topic's rendered content markdown and tag HTML.
+    
+    Fragments are cached in the session by workspace, ``id`` and a hash
+    of the content and tags, so a topic is only rendered again after it
+    changes, even when two edits land within the same second.
+    
+    Args:
+        topic: Topic dict
+    
+    Returns:
+        tuple: (content markdown, tags HTML or empty string)
+    """
+    cache = st.session_state.topic_fragments
+    key = (st.session_state.get('research_namespace'), topic['id'], hash((topic['content'], tuple(topic['tags']))))
+    fragments = cache.get(key)
+    if fragments is None:
+        tags_html = " ".join([
+            f"<span style='background-color: #E0F2FE; padding: 0.25rem 0.75rem; border-radius: 12px; margin-right: 0.5rem; font-size: 0.85rem;'>{html.escape(tag)}</span>"
+            for tag in topic['tags']
+        ])
+        fragments = cache[key] = (f"**Content:**\n\n{topic['content']}", tags_html)
+        if len(cache) > MAX_CACHED_FRAGMENTS:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return fragments
 
-st.set_page_config(
-    page_title="Research Hub - FinanceAI",
-    page_icon="📚",
-    layout="wide"
-)
+
+setup_page("Research Hub - FinanceAI", "📚")
 
 st.title("📚 Financial Research Hub")
 st.markdown("Store and organize your financial research topics with tagging and search")
@@ -18,17 +54,71 @@ st.markdown("Store and organize your financial research topics with tagging and
 # Initialize database
 ResearchDatabase.initialize()
 
+if 'topic_fragments' not in st.session_state:
+    st.session_state.topic_fragments = OrderedDict()
+if 'topic_page_cursors' not in st.session_state:
+    # Cursor of every page visited so far; the last one is the current page
+    st.session_state.topic_page_cursors = [None]
+    st.session_state.topic_page_filters = None
+
 # Sidebar - Topic List
 with st.sidebar:
     st.markdown("## 📖 Research Topics")
     
-    search_query = st.text_input("🔍 Search topics...", placeholder="Enter keywords")
+    if isinstance(ResearchDatabase.get_backend(), SharedMemoryStorage):
+        st.text_input(
+            "🗂️ Workspace",
+            key="research_namespace",
+            help="Topics are shared with everyone using the same workspace name."
+        )
     
-    selected_tag = st.selectbox("🏷️ Filter by Tag", ["All Tags", "Savings", "Investment", "Tax", "Debt", "Budget"])
+    search_query = st.text_input(
+        "🔍 Search topics...",
+        placeholder="Enter keywords",
+        help="Words must all match; use OR for alternatives and word* for prefixes."
+    )
+    
+    tag_counts = ResearchDatabase.get_tag_counts()
+    selected_tags = st.multiselect(
+        "🏷️ Filter by Tag",
+        list(tag_counts),
+        format_func=lambda tag: f"{tag} ({tag_counts[tag]})",
+        placeholder="All Tags"
+    )
+    match_all_tags = st.radio(
+        "Tag match",
+        ["All selected", "Any selected"],
+        horizontal=True,
+        disabled=len(selected_tags) < 2
+    ) == "All selected"
     
     st.markdown("---")
     st.markdown("### 📊 Statistics")
-    st.metric("Total Topics", len(ResearchDatabase.get_all_topics()))
+    total_topics = ResearchDatabase.count_topics()
+    st.metric("Total Topics", total_topics)
+    
+    st.markdown("---")
+    st.markdown("### 📦 Import / Export")
+    
+    if st.button("📤 Prepare JSONL Export", use_container_width=True, disabled=not total_topics):
+        buffer = io.StringIO()
+        exported = ResearchDatabase.export(buffer, "jsonl")
+        st.download_button(
+            f"⬇️ Download {exported} Topics",
+            buffer.getvalue(),
+            file_name="research_topics.jsonl",
+            mime="application/jsonl",
+            use_container_width=True
+        )
+    
+    uploaded = st.file_uploader("📥 Import topics", type=["jsonl", "parquet"])
+    if uploaded is not None and st.button("Import File", use_container_width=True):
+        file_format = "parquet" if uploaded.name.endswith(".parquet") else "jsonl"
+        try:
+            imported = ResearchDatabase.bulk_import(read_topics(uploaded, file_format))
+            st.success(f"✅ Imported {imported} topics")
+        except (ValueError, ImportError) as e:
+            st.error(f"❌ Import failed: {str(e)}")
 
 # Main content
 col1, col2 = st.columns([2, 1])
@@ -58,17 +148,53 @@ with col1:
     # Display topics
     st.markdown("### 📋 Saved Topics")
     
-    topics = ResearchDatabase.get_all_topics()
+    # Start from the first page whenever the filters change
+    filters = (st.session_state.get('research_namespace'), search_query, tuple(selected_tags), match_all_tags)
+    if st.session_state.topic_page_filters != filters:
+        st.session_state.topic_page_filters = filters
+        st.session_state.topic_page_cursors = [None]
+    cursors = st.session_state.topic_page_cursors
     
-    if not topics:
+    # Fetch one extra topic to know whether there is a next page
+    if search_query:
+        # Ranked results have no ID order, so their cursor is an offset
+        offset = cursors[-1] or 0
+        page_topics = ResearchDatabase.search_page(  # Best match first
+            search_query,
+            offset=offset,
+            limit=PAGE_SIZE + 1,
+            tags=selected_tags,
+            match_all=match_all_tags
+        )
+        next_cursor = offset + PAGE_SIZE
+    else:
+        page_topics = ResearchDatabase.list_topics(
+            after_id=cursors[-1],
+            limit=PAGE_SIZE + 1,
+            order="desc",  # Show newest first
+            tags=selected_tags,
+            match_all=match_all_tags
+        )
+        next_cursor = page_topics[PAGE_SIZE - 1]['id'] if len(page_topics) > PAGE_SIZE else None
+    has_next = len(page_topics) > PAGE_SIZE
+    shown_topics = page_topics[:PAGE_SIZE]
+    
+    if not shown_topics and len(cursors) > 1:
+        # The last topics on this page were deleted; go back one page
+        cursors.pop()
+        st.rerun()
+    
+    if not total_topics:
         st.info("📭 No topics saved yet. Add your first research topic above!")
+    elif not shown_topics:
+        st.info("🔍 No topics match the current search and tag filters.")
     else:
-        for topic in reversed(topics):  # Show newest first
+        for topic in shown_topics:
+            content_md, tags_html = topic_fragments(topic)
             with st.expander(f"📌 {topic['title']}", expanded=False):
-                st.markdown(f"**Content:**\n\n{topic['content']}")
+                st.markdown(content_md)
                 
-                if topic['tags']:
-                    tags_html = " ".join([f"<span style='background-color: #E0F2FE; padding: 0.25rem 0.75rem; border-radius: 12px; margin-right: 0.5rem; font-size: 0.85rem;'>{tag}</span>" for tag in topic['tags']])
+                if tags_html:
                     st.markdown(f"**Tags:** {tags_html}", unsafe_allow_html=True)
                 
                 st.caption(f"🕐 Created: {topic['created_at']}")
@@ -79,6 +205,18 @@ with col1:
                         ResearchDatabase.delete_topic(topic['id'])
                         st.success("✅ Topic deleted!")
                         st.rerun()
+        
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("⬅️ Previous", disabled=len(cursors) == 1, use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        with col_page:
+            st.caption(f"Page {len(cursors)}")
+        with col_next:
+            if st.button("Next ➡️", disabled=not has_next, use_container_width=True):
+                cursors.append(next_cursor)
+                st.rerun()
 
 with col2:
     st.markdown("### 🚀 Quick Start")
@@ -105,7 +243,7 @@ with col2:
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Sample topics for first-time users
-    if len(topics) == 0:
+    if total_topics == 0:
         if st.button("📚 Add Sample Topics", use_container_width=True):
             ResearchDatabase.add_topic(
                 "Emergency Fund Strategies",
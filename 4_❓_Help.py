@@ -88,7 +88,7 @@ faqs = [
     },
     {
         "question": "Is my financial data secure?",
-        "answer": "Yes! All data is stored locally in your browser session only. We don't store any personal data on our servers."
+        "answer": "Yes! Your chat and financial data are stored in your browser session only. Research topics are too, unless the app is started with RESEARCH_DB_PATH set, which keeps them in a SQLite file on the server, or with RESEARCH_STORE=shared, which keeps them in server memory for the whole team. With the shared store, topics in a workspace are visible to every session that uses the same workspace name; workspaces are not password-protected, so keep private notes out of them."
     },
     {
         "question": "Do I need a GPU or powerful computer?",
@@ -108,7 +108,7 @@ faqs = [
     },
     {
         "question": "Can I export my financial data or research topics?",
-        "answer": "Currently, data is session-based. You can copy content manually or enable future export capabilities as an enhancement."
+        "answer": "Yes, research topics. In the Research Hub sidebar you can download them as JSONL or import a JSONL or Parquet file. For large collections use the command line: python -m utils.topic_transfer export topics.jsonl --db research.sqlite3 (or import)."
     }
 ]
 
@@ -1,21 +1,834 @@
 """AI Model Integration Module"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Iterator, NamedTuple, Optional, Union
+
 import streamlit as st
-from huggingface_hub import InferenceClient
+
+from utils.batching import BatchScheduler
+from utils.bootstrap import lazy_import
+from utils.local_model import LocalGraniteBackend
+from utils.prompt_builder import BuiltPrompt, PromptBuilder
+
+# Deferred: the local backend never needs it
+huggingface_hub = lazy_import("huggingface_hub")
+
+SYSTEM_PROMPTS = {
+    "student": """You are a helpful financial advisor assistant for students.
+Provide practical, beginner-friendly financial advice tailored to student circumstances.
+Focus on budgeting, savings, and financial planning for their situation.""",
+    "professional": """You are a helpful financial advisor assistant for professionals.
+Provide personalized financial advice for career professionals.
+Consider topics like investments, tax optimization, and long-term financial planning."""
+}
+
+# Size of the most recent prompt built in the current thread or task
+_last_prompt_tokens = contextvars.ContextVar('last_prompt_tokens', default=0)
+
+
+class ResponseCache:
+    """
+    Base class for caches of generated responses.
+    
+    Keys are derived from the full prompt (system prompt plus history) and
+    the sampling parameters, so different users, histories or settings never
+    share an entry. Subclasses provide storage through ``_get``, ``_set``
+    and ``clear``; counters and the caching policy live here.
+    """
+    
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 1024, cache_sampled: bool = True):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl: Seconds an entry stays valid
+            max_entries: Maximum number of entries before eviction
+            cache_sampled: Whether to cache responses generated with temperature > 0
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_sampled = cache_sampled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(prompt: str, model_name: str, max_tokens: int, temperature: float) -> str:
+        """
+        Build a cache key from the prompt and sampling parameters.
+        
+        Whitespace in the prompt is collapsed so trivially different
+        spacing maps to the same entry.
+        
+        Args:
+            prompt: Full generation prompt
+            model_name: Model identifier
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+        
+        Returns:
+            str: Hex digest identifying the request
+        """
+        normalized = " ".join(prompt.split())
+        payload = json.dumps([normalized, model_name, int(max_tokens), round(float(temperature), 4)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def should_cache(self, temperature: float) -> bool:
+        """Return True if responses at this temperature may be cached."""
+        return self.cache_sampled or temperature <= 0
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response and update the hit/miss counters.
+        
+        Args:
+            key: Key from ``make_key``
+        
+        Returns:
+            str: Cached response, or None on a miss or expired entry
+        """
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+    
+    def set(self, key: str, value: str):
+        """
+        Store a response, evicting old entries if the cache is full.
+        
+        Args:
+            key: Key from ``make_key``
+            value: Generated response text
+        """
+        with self._lock:
+            self._set(key, value)
+    
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+        
+        Returns:
+            dict: hits, misses, hit_rate and current size
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self)
+        }
+    
+    def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+    
+    def _set(self, key: str, value: str):
+        raise NotImplementedError
+    
+    def clear(self):
+        """Remove every entry."""
+        raise NotImplementedError
+    
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class LRUResponseCache(ResponseCache):
+    """In-memory response cache with LRU and TTL eviction."""
+    
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 1024, cache_sampled: bool = True):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl: Seconds an entry stays valid
+            max_entries: Maximum number of entries before the least recently used is evicted
+            cache_sampled: Whether to cache responses generated with temperature > 0
+        """
+        super().__init__(ttl=ttl, max_entries=max_entries, cache_sampled=cache_sampled)
+        self._entries = OrderedDict()
+    
+    def _get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def _set(self, key: str, value: str):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """On-disk response cache backed by SQLite, shared across restarts."""
+    
+    def __init__(
+        self,
+        path: str = "response_cache.sqlite3",
+        ttl: float = 86400.0,
+        max_entries: int = 10000,
+        cache_sampled: bool = True
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: SQLite database file
+            ttl: Seconds an entry stays valid
+            max_entries: Maximum number of entries before eviction
+            cache_sampled: Whether to cache responses generated with temperature > 0
+        """
+        super().__init__(ttl=ttl, max_entries=max_entries, cache_sampled=cache_sampled)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+    
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if created_at + self.ttl < now:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return value
+    
+    def _set(self, key: str, value: str):
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, value, now, now)
+        )
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._conn.commit()
+    
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call without trying the backend."""
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient backend errors."""
+    
+    RETRY_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+    
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 20.0):
+        """
+        Initialize the policy.
+        
+        Args:
+            max_retries: Retries after the first attempt
+            base_delay: Backoff ceiling for the first retry in seconds
+            max_delay: Upper bound for any single wait, including Retry-After
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    @staticmethod
+    def _response(error: Exception):
+        """Get the HTTP response attached to an error or to its cause."""
+        # requests' Response is falsy for 4xx/5xx, so compare with None rather than use ``or``
+        response = getattr(error, 'response', None)
+        if response is None:
+            # Text-generation errors (e.g. OverloadedError) wrap the HTTP error as their cause
+            response = getattr(error.__cause__, 'response', None)
+        return response
+    
+    @staticmethod
+    def status_code(error: Exception) -> Optional[int]:
+        """Get the HTTP status of a requests/huggingface_hub or aiohttp error."""
+        response = RetryPolicy._response(error)
+        status = getattr(response, 'status_code', None)
+        if status is None:
+            status = getattr(error, 'status', None)
+        return status if isinstance(status, int) else None
+    
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        """
+        Read the Retry-After header of an HTTP error.
+        
+        Args:
+            error: Exception raised by the client
+        
+        Returns:
+            float: Seconds to wait, or None if the header is missing or invalid
+        """
+        response = RetryPolicy._response(error)
+        headers = getattr(response, 'headers', None)
+        if headers is None:
+            headers = getattr(error, 'headers', None)
+        value = headers.get('Retry-After') if headers else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    
+    def is_retryable(self, error: Exception) -> bool:
+        """Return True for rate limits, server errors, timeouts and dropped connections."""
+        status = self.status_code(error)
+        if status is not None:
+            return status in self.RETRY_STATUSES
+        return isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)) or \
+            type(error).__name__ in ('ConnectionError', 'Timeout', 'ReadTimeout', 'ConnectTimeout')
+    
+    def delay(self, attempt: int, error: Exception = None) -> float:
+        """
+        Seconds to wait before retry number ``attempt`` (0-based).
+        
+        A Retry-After header from the server wins over the computed backoff.
+        """
+        retry_after = self.retry_after(error) if error is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the backend is down.
+    
+    Opens after ``failure_threshold`` consecutive failures, rejects calls
+    for ``reset_timeout`` seconds, then lets a single probe through
+    (half-open); the probe's outcome closes or re-opens the circuit.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before probing
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Return True if a call may go to the backend now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+    
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+    
+    def release(self):
+        """
+        End a call that says nothing about backend health (e.g. a bad request).
+        
+        Leaves the state and failure count alone but frees the half-open
+        probe slot, so the next call can probe instead of being rejected.
+        """
+        with self._lock:
+            self._probing = False
+    
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(token: str) -> CircuitBreaker:
+    """
+    Get the process-wide circuit breaker for an API token.
+    
+    Args:
+        token: Hugging Face API token
+    
+    Returns:
+        CircuitBreaker: Breaker shared by every model using this token
+    """
+    key = hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+    with _circuit_breakers_lock:
+        if key not in _circuit_breakers:
+            _circuit_breakers[key] = CircuitBreaker()
+        return _circuit_breakers[key]
+
+
+class ResilienceMetrics:
+    """Counters for retries, breaker activity and hedged requests."""
+    
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.breaker_rejections = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+    
+    def incr(self, name: str, amount: int = 1):
+        """Increment a counter."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+    
+    def snapshot(self, breaker: CircuitBreaker = None) -> dict:
+        """
+        Get the current counters.
+        
+        Args:
+            breaker: Include trip count and state of this breaker
+        
+        Returns:
+            dict: Counter values
+        """
+        with self._lock:
+            data = {
+                'calls': self.calls,
+                'retries': self.retries,
+                'failures': self.failures,
+                'breaker_rejections': self.breaker_rejections,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins
+            }
+        if breaker is not None:
+            data['breaker_trips'] = breaker.trips
+            data['breaker_state'] = breaker.state
+        return data
+
+
+class CallRecord(NamedTuple):
+    """Timings and sizes of one model call; durations in seconds, None where not applicable."""
+    timestamp: float            # wall-clock start (time.time())
+    kind: str                   # "generate", "stream", "async_generate" or "async_stream"
+    backend: str                # "remote" or "local"
+    prompt_build: float
+    queue_wait: Optional[float]  # batch queue or model lock (local), concurrency semaphore (async)
+    ttft: Optional[float]       # time to first token; streamed calls only
+    latency: float
+    prompt_tokens: int
+    completion_tokens: int
+    cache_hit: bool
+    error: Optional[str]        # exception class name
+
+
+# Timing fields summarized by sinks, in display order
+TIMING_FIELDS = ('prompt_build', 'queue_wait', 'ttft', 'latency')
+
+
+class MetricsSink:
+    """
+    Base class for destinations of per-call records.
+    
+    Subclasses implement ``record``; it runs on the calling thread, so it
+    must be quick and must not raise.
+    """
+    
+    def record(self, call: CallRecord):
+        """Store or export one call."""
+        raise NotImplementedError
+
+
+class RingBufferSink(MetricsSink):
+    """Keep the most recent calls in memory for percentiles and dashboards."""
+    
+    def __init__(self, max_records: int = 1000):
+        """
+        Initialize the buffer.
+        
+        Args:
+            max_records: Calls kept before the oldest is dropped
+        """
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+    
+    def record(self, call: CallRecord):
+        with self._lock:
+            self._records.append(call)
+    
+    def records(self) -> list:
+        """Get the buffered calls, oldest first."""
+        with self._lock:
+            return list(self._records)
+    
+    def percentiles(self, field: str, quantiles: tuple = (50, 95, 99)) -> dict:
+        """
+        Get nearest-rank percentiles of a timing field over the buffered calls.
+        
+        Args:
+            field: One of TIMING_FIELDS
+            quantiles: Percentiles to compute
+        
+        Returns:
+            dict: {"p50": seconds, ...}, or an empty dict if no call has the field
+        """
+        values = sorted(value for value in (getattr(call, field) for call in self.records()) if value is not None)
+        if not values:
+            return {}
+        return {f"p{q}": values[int(q / 100 * (len(values) - 1))] for q in quantiles}
+    
+    def summary(self) -> dict:
+        """
+        Summarize the buffered calls.
+        
+        Returns:
+            dict: calls, cache_hits, errors per class, mean token counts and
+                p50/p95/p99 of every timing field
+        """
+        calls = self.records()
+        errors = {}
+        for call in calls:
+            if call.error:
+                errors[call.error] = errors.get(call.error, 0) + 1
+        return {
+            'calls': len(calls),
+            'cache_hits': sum(call.cache_hit for call in calls),
+            'errors': errors,
+            'mean_prompt_tokens': sum(call.prompt_tokens for call in calls) / len(calls) if calls else 0.0,
+            'mean_completion_tokens': sum(call.completion_tokens for call in calls) / len(calls) if calls else 0.0,
+            'timings': {field: self.percentiles(field) for field in TIMING_FIELDS}
+        }
+    
+    def clear(self):
+        """Drop every buffered call."""
+        with self._lock:
+            self._records.clear()
+
+
+class PrometheusSink(MetricsSink):
+    """
+    Aggregate calls into Prometheus counters and histograms.
+    
+    ``render`` produces the text exposition format; ``serve`` exposes it
+    on /metrics from a background thread for scraping.
+    """
+    
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    
+    def __init__(self, prefix: str = "financeai_llm"):
+        """
+        Initialize the counters.
+        
+        Args:
+            prefix: Metric name prefix
+        """
+        self.prefix = prefix
+        self._calls = {}
+        self._errors = {}
+        self._cache_hits = 0
+        self._tokens = {'prompt': 0, 'completion': 0}
+        self._histograms = {field: ([0] * len(self.BUCKETS), [0.0, 0]) for field in TIMING_FIELDS}
+        self._lock = threading.Lock()
+        self._server = None
+    
+    def record(self, call: CallRecord):
+        with self._lock:
+            key = (call.kind, call.backend)
+            self._calls[key] = self._calls.get(key, 0) + 1
+            if call.error:
+                self._errors[call.error] = self._errors.get(call.error, 0) + 1
+            self._cache_hits += call.cache_hit
+            self._tokens['prompt'] += call.prompt_tokens
+            self._tokens['completion'] += call.completion_tokens
+            for field in TIMING_FIELDS:
+                value = getattr(call, field)
+                if value is None:
+                    continue
+                buckets, total = self._histograms[field]
+                for i, bound in enumerate(self.BUCKETS):
+                    if value <= bound:
+                        buckets[i] += 1
+                total[0] += value
+                total[1] += 1
+    
+    def render(self) -> str:
+        """
+        Get the current values in the Prometheus text format.
+        
+        Returns:
+            str: Exposition text
+        """
+        p = self.prefix
+        lines = [f"# HELP {p}_calls_total Model calls.", f"# TYPE {p}_calls_total counter"]
+        with self._lock:
+            for (kind, backend), count in sorted(self._calls.items()):
+                lines.append(f'{p}_calls_total{{kind="{kind}",backend="{backend}"}} {count}')
+            lines += [f"# HELP {p}_errors_total Failed model calls by error class.", f"# TYPE {p}_errors_total counter"]
+            for error, count in sorted(self._errors.items()):
+                lines.append(f'{p}_errors_total{{error="{error}"}} {count}')
+            lines += [
+                f"# HELP {p}_cache_hits_total Calls answered from the response cache.",
+                f"# TYPE {p}_cache_hits_total counter",
+                f"{p}_cache_hits_total {self._cache_hits}",
+                f"# HELP {p}_tokens_total Prompt and completion tokens.",
+                f"# TYPE {p}_tokens_total counter"
+            ]
+            for kind, count in self._tokens.items():
+                lines.append(f'{p}_tokens_total{{type="{kind}"}} {count}')
+            for field, (buckets, (total, count)) in self._histograms.items():
+                name = f"{p}_{field}_seconds"
+                lines += [f"# HELP {name} {field.replace('_', ' ').capitalize()} per call.", f"# TYPE {name} histogram"]
+                for bound, bucket in zip(self.BUCKETS, buckets):
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {bucket}')
+                lines += [f'{name}_bucket{{le="+Inf"}} {count}', f"{name}_sum {total}", f"{name}_count {count}"]
+        return "\n".join(lines) + "\n"
+    
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """
+        Serve ``render`` on http://host:port/metrics from a daemon thread.
+        
+        Calling it again returns the running server.
+        
+        Args:
+            port: TCP port
+            host: Interface to bind
+        
+        Returns:
+            ThreadingHTTPServer: The server
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        sink = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = sink.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        with self._lock:
+            if self._server is None:
+                self._server = ThreadingHTTPServer((host, port), Handler)
+                threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+            return self._server
+
+
+class JSONLSink(MetricsSink):
+    """Append each call as one JSON line, for offline analysis."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize the sink.
+        
+        Args:
+            path: File to append to (created if missing)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def record(self, call: CallRecord):
+        line = json.dumps(call._asdict(), separators=(",", ":")) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+# Process-wide buffer of recent calls; every model records into it unless given other sinks
+call_log = RingBufferSink()
+# Process-wide Prometheus aggregates, attached by load_ai_model when FINANCEAI_METRICS_PORT is set
+prometheus_metrics = PrometheusSink()
+
+
+class _CallTimer:
+    """Time one model call and send its record to the sinks."""
+    
+    def __init__(self, model: "GraniteAIModel", kind: str):
+        self.model = model
+        self.kind = kind
+        self.timestamp = time.time()
+        self.start = time.perf_counter()
+        self.prompt_build = 0.0
+        self.prompt_tokens = 0
+        self.queue_wait = None
+        self.ttft = None
+        self.cache_hit = False
+    
+    def prompt_built(self, built: BuiltPrompt):
+        """Mark the end of prompt building."""
+        self.prompt_build = time.perf_counter() - self.start
+        self.prompt_tokens = built.prompt_tokens
+    
+    def backend_called(self):
+        """Take the queue wait of the local backend call that just ran, whether or not it succeeded."""
+        if self.model.local_backend is not None:
+            self.queue_wait = self.model.local_backend.last_queue_wait()
+    
+    def first_token(self):
+        """Mark the first streamed chunk (later calls are ignored)."""
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.start
+    
+    def finish(self, text: str = "", error: str = None):
+        """
+        Build the record and pass it to every sink.
+        
+        Args:
+            text: Completion text, for the token count
+            error: Exception class name if the call failed
+        """
+        if not self.model.sinks:
+            return
+        call = CallRecord(
+            timestamp=self.timestamp,
+            kind=self.kind,
+            backend="remote" if self.model.local_backend is None else "local",
+            prompt_build=self.prompt_build,
+            queue_wait=self.queue_wait,
+            ttft=self.ttft,
+            latency=time.perf_counter() - self.start,
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.model.prompt_builder.counter.count(text) if text else 0,
+            cache_hit=self.cache_hit,
+            error=error
+        )
+        for sink in self.model.sinks:
+            try:
+                sink.record(call)
+            except Exception:
+                pass  # a broken sink must not fail the chat
+
+
+# Threads for hedged requests, shared by all models in the process
+_hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="granite-hedge")
 
 
 class GraniteAIModel:
     """AI model integration with Hugging Face Granite model."""
     
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        cache: ResponseCache = None,
+        endpoint_url: str = None,
+        prompt_builder: PromptBuilder = None,
+        local_backend: Union[LocalGraniteBackend, BatchScheduler] = None,
+        retry_policy: RetryPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        hedge: bool = False,
+        hedge_after: float = None,
+        sinks: list = None
+    ):
         """
         Initialize the Granite AI Model.
         
         Args:
             token: Hugging Face API token
+            cache: Optional response cache shared by all callers
+            endpoint_url: Optional inference endpoint used instead of the
+                hosted model (e.g. a dedicated endpoint or a local stub server)
+            prompt_builder: Token-budgeted prompt builder (default budget if omitted)
+            local_backend: Run the model in-process with this backend instead
+                of calling the Inference API
+            retry_policy: Backoff policy for transient errors (default policy if omitted)
+            circuit_breaker: Breaker to use (the process-wide one for the token if omitted)
+            hedge: Send a second request when the first is slower than usual
+            hedge_after: Fixed hedging delay in seconds (observed p95 latency if None)
+            sinks: MetricsSinks that receive a CallRecord per call (``call_log`` if None)
         """
         self.token = token
         self.client = None
         self.model_name = "ibm-granite/granite-3.2-2b-instruct"
+        self.cache = cache
+        self.endpoint_url = endpoint_url
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.local_backend = local_backend
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(token)
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.metrics = ResilienceMetrics()
+        self.sinks = [call_log] if sinks is None else list(sinks)
+        self._latencies = deque(maxlen=200)
     
     def load_model(self) -> bool:
         """
@@ -25,12 +838,54 @@ class GraniteAIModel:
             bool: True if model loaded successfully, False otherwise
         """
         try:
-            self.client = InferenceClient(token=self.token)
+            if self.local_backend is not None:
+                if self.local_backend.model is None:
+                    self.local_backend.load()
+                self.client = self.local_backend
+            else:
+                self.client = huggingface_hub.InferenceClient(token=self.token)
             return True
         except Exception as e:
             st.error(f"Error loading model: {e}")
             return False
     
+    def prepare_prompt(self, messages: list, user_type: str = "professional") -> BuiltPrompt:
+        """
+        Build the text-generation prompt from the chat history within the token budget.
+        
+        Older turns that do not fit are replaced by a rolling summary. The
+        token count is also recorded for ``last_prompt_tokens``.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            user_type: User type - "student" or "professional"
+        
+        Returns:
+            BuiltPrompt: Prompt ending with an open "Assistant: " turn, and its size
+        """
+        system_prompt = SYSTEM_PROMPTS.get(user_type, SYSTEM_PROMPTS["professional"])
+        built = self.prompt_builder.build(system_prompt, messages)
+        _last_prompt_tokens.set(built.prompt_tokens)
+        return built
+    
+    def build_prompt(self, messages: list, user_type: str = "professional") -> str:
+        """
+        Build the text-generation prompt from the chat history.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            user_type: User type - "student" or "professional"
+        
+        Returns:
+            str: Prompt ending with an open "Assistant: " turn
+        """
+        return self.prepare_prompt(messages, user_type).text
+    
+    @property
+    def last_prompt_tokens(self) -> int:
+        """Token count of the last prompt built by this thread (or asyncio task)."""
+        return _last_prompt_tokens.get()
+    
     def generate_response(
         self,
         messages: list,
@@ -46,7 +901,7 @@ class GraniteAIModel:
             user_type: User type - "student" or "professional"
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature (0-1)
-            
+        
         Returns:
             str: Generated response text
         """
@@ -57,57 +912,685 @@ class GraniteAIModel:
         if not messages:
             return "Error: No messages provided."
         
-        # Customize system prompt based on user type
-        if user_type == "student":
-            system_prompt = """You are a helpful financial advisor assistant for students.
-Provide practical, beginner-friendly financial advice tailored to student circumstances.
-Focus on budgeting, savings, and financial planning for their situation."""
-        else:  # professional
-            system_prompt = """You are a helpful financial advisor assistant for professionals.
-Provide personalized financial advice for career professionals.
-Consider topics like investments, tax optimization, and long-term financial planning."""
-        
-        # Build prompt from message history
-        prompt = f"{system_prompt}\n\n"
-        for msg in messages:
-            role = msg.get('role', 'user').capitalize()
-            content = msg.get('content', '')
-            prompt += f"{role}: {content}\n"
-        prompt += "Assistant: "
+        timer = _CallTimer(self, "generate")
+        built = self.prepare_prompt(messages, user_type)
+        timer.prompt_built(built)
+        prompt = built.text
+        cache_key = self._cache_key(prompt, max_tokens, temperature)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                timer.cache_hit = True
+                timer.finish(cached)
+                return cached
         
         try:
-            response = self.client.text_generation(
+            response = self._call_backend(
+                hedge=self.hedge,
                 prompt=prompt,
-                model=self.model_name,
+                model=self.endpoint_url or self.model_name,
                 max_new_tokens=max_tokens,
                 temperature=temperature,
                 do_sample=True
             )
+            timer.backend_called()
             
             # Handle response object - extract text if needed
             if hasattr(response, 'generated_text'):
-                return response.generated_text
+                text = response.generated_text
             elif isinstance(response, str):
-                return response
+                text = response
             else:
-                return str(response)
-                
+                text = str(response)
+            
+            if cache_key:
+                self.cache.set(cache_key, text)
+            timer.finish(text)
+            return text
+        
+        except Exception as e:
+            if not isinstance(e, CircuitOpenError):
+                timer.backend_called()
+            timer.finish(error=type(e).__name__)
+            return f"Error generating response: {str(e)}"
+    
+    def stream_response(
+        self,
+        messages: list,
+        user_type: str = "professional",
+        max_tokens: int = 512,
+        temperature: float = 0.7,
+        cancel_event: threading.Event = None
+    ) -> Iterator[str]:
+        """
+        Stream a response from the AI model chunk by chunk.
+        
+        Suitable for ``st.write_stream``. Errors are yielded as text in the
+        same form ``generate_response`` returns them, so a stream that fails
+        half-way keeps the partial answer followed by the error message.
+        Closing the generator (or setting ``cancel_event``) stops reading
+        and closes the underlying HTTP stream.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            user_type: User type - "student" or "professional"
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0-1)
+            cancel_event: Optional event that cancels the stream when set
+        
+        Yields:
+            str: Non-empty text chunks in generation order
+        """
+        if not self.client:
+            if not self.load_model():
+                yield "Error: Failed to load model. Please check your API token."
+                return
+        
+        if not messages:
+            yield "Error: No messages provided."
+            return
+        
+        timer = _CallTimer(self, "stream")
+        built = self.prepare_prompt(messages, user_type)
+        timer.prompt_built(built)
+        prompt = built.text
+        cache_key = self._cache_key(prompt, max_tokens, temperature)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                timer.cache_hit = True
+                timer.first_token()
+                timer.finish(cached)
+                yield cached
+                return
+        
+        stream = None
+        chunks = []
+        error = None
+        
+        try:
+            # Retries cover opening the stream; errors after the first chunk are reported
+            stream = self._call_backend(
+                prompt=prompt,
+                model=self.endpoint_url or self.model_name,
+                max_new_tokens=max_tokens,
+                temperature=temperature,
+                do_sample=True,
+                stream=True,
+                details=True
+            )
+            
+            for chunk in stream:
+                if cancel_event is not None and cancel_event.is_set():
+                    error = "Cancelled"
+                    return
+                text = _chunk_text(chunk)
+                if text:
+                    timer.first_token()
+                    chunks.append(text)
+                    yield text
+            
+            if cache_key and chunks:
+                self.cache.set(cache_key, "".join(chunks))
+        
+        except GeneratorExit:
+            error = "Cancelled"
+            raise
+        except Exception as e:
+            error = type(e).__name__
+            yield f"\n\nError generating response: {str(e)}"
+        finally:
+            # Release the HTTP connection when the consumer stops early
+            close = getattr(stream, 'close', None)
+            if close is not None:
+                close()
+            if stream is not None:
+                timer.backend_called()
+            timer.finish("".join(chunks), error)
+    
+    def _call_backend(self, hedge: bool = False, **kwargs):
+        """
+        Call ``client.text_generation`` with retries and the circuit breaker.
+        
+        Args:
+            hedge: Allow a hedged second request for this call
+            **kwargs: Arguments for text_generation
+        
+        Returns:
+            Whatever text_generation returns
+        
+        Raises:
+            CircuitOpenError: If the breaker rejects the call
+            Exception: The last backend error once retries are exhausted
+        """
+        self.metrics.incr('calls')
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow():
+                self.metrics.incr('breaker_rejections')
+                raise CircuitOpenError("service temporarily unavailable, please try again shortly")
+            
+            start = time.monotonic()
+            try:
+                if hedge:
+                    result = self._hedged_call(kwargs)
+                else:
+                    result = self.client.text_generation(**kwargs)
+            except Exception as e:
+                retryable = self.retry_policy.is_retryable(e)
+                if retryable:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.release()
+                if not retryable or attempt >= self.retry_policy.max_retries:
+                    self.metrics.incr('failures')
+                    raise
+                self.metrics.incr('retries')
+                time.sleep(self.retry_policy.delay(attempt, e))
+                attempt += 1
+                continue
+            except BaseException:
+                self.circuit_breaker.release()
+                raise
+            
+            self.circuit_breaker.record_success()
+            if not kwargs.get('stream'):
+                self._latencies.append(time.monotonic() - start)
+            return result
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds before hedging: ``hedge_after`` or the observed p95 latency."""
+        if self.hedge_after is not None:
+            return self.hedge_after
+        if len(self._latencies) < 20:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+    
+    def _hedged_call(self, kwargs: dict):
+        """
+        Send a second identical request if the first is slower than the hedge delay.
+        
+        The first request to succeed wins; the other is left to finish in
+        the background.
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return self.client.text_generation(**kwargs)
+        
+        primary = _hedge_executor.submit(self.client.text_generation, **kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        
+        self.metrics.incr('hedges')
+        backup = _hedge_executor.submit(self.client.text_generation, **kwargs)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        self.metrics.incr('hedge_wins')
+                    return future.result()
+                error = future.exception()
+        raise error
+    
+    def resilience_stats(self) -> dict:
+        """
+        Get retry, breaker and hedging counters for this model.
+        
+        Returns:
+            dict: Counter values plus breaker trips and state
+        """
+        return self.metrics.snapshot(self.circuit_breaker)
+    
+    def _cache_key(self, prompt: str, max_tokens: int, temperature: float) -> Optional[str]:
+        """Return the cache key for a request, or None if it must not be cached."""
+        if self.cache is None or not self.cache.should_cache(temperature):
+            return None
+        return self.cache.make_key(prompt, self.model_name, max_tokens, temperature)
+
+
+def _chunk_text(chunk) -> str:
+    """
+    Extract the text of one streamed generation chunk.
+    
+    Args:
+        chunk: A str or a TextGenerationStreamOutput from InferenceClient
+    
+    Returns:
+        str: Chunk text, empty for special tokens such as end-of-text
+    """
+    if isinstance(chunk, str):
+        return chunk
+    token = getattr(chunk, 'token', None)
+    if token is None:
+        return ""
+    if getattr(token, 'special', False):
+        return ""
+    return token.text or ""
+
+
+class AsyncGraniteAIModel(GraniteAIModel):
+    """
+    Asynchronous Granite model built on AsyncInferenceClient.
+    
+    Network waits yield to the event loop instead of holding a thread.
+    Concurrent requests from one event loop are bounded by a semaphore and
+    every request is subject to a timeout.
+    """
+    
+    def __init__(
+        self,
+        token: str,
+        cache: ResponseCache = None,
+        endpoint_url: str = None,
+        prompt_builder: PromptBuilder = None,
+        max_concurrency: int = 8,
+        timeout: float = 60.0,
+        retry_policy: RetryPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        sinks: list = None
+    ):
+        """
+        Initialize the async Granite AI Model.
+        
+        Args:
+            token: Hugging Face API token
+            cache: Optional response cache shared by all callers
+            endpoint_url: Optional inference endpoint used instead of the hosted model
+            prompt_builder: Token-budgeted prompt builder (default budget if omitted)
+            max_concurrency: Maximum in-flight requests per event loop
+            timeout: Per-request timeout in seconds, retries included
+            retry_policy: Backoff policy for transient errors (default policy if omitted)
+            circuit_breaker: Breaker to use (the process-wide one for the token if omitted)
+            sinks: MetricsSinks that receive a CallRecord per call (``call_log`` if None)
+        """
+        super().__init__(
+            token=token,
+            cache=cache,
+            endpoint_url=endpoint_url,
+            prompt_builder=prompt_builder,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            sinks=sinks
+        )
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphores = {}
+    
+    def load_model(self) -> bool:
+        """
+        Load the async AI model client.
+        
+        Returns:
+            bool: True if model loaded successfully, False otherwise
+        """
+        try:
+            self.client = huggingface_hub.AsyncInferenceClient(token=self.token, timeout=self.timeout)
+            return True
         except Exception as e:
+            st.error(f"Error loading model: {e}")
+            return False
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            # Drop semaphores of loops that have finished (e.g. earlier asyncio.run calls)
+            self._semaphores = {
+                other: sem for other, sem in self._semaphores.items() if not other.is_closed()
+            }
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+    
+    async def _acall_backend(self, deadline: float = None, **kwargs):
+        """
+        Await ``client.text_generation`` with the timeout, retries and the circuit breaker.
+        
+        All attempts and backoff waits share one deadline, so a call never
+        runs longer than ``timeout`` however often it is retried.
+        
+        Args:
+            deadline: Event loop time to give up at (``timeout`` from now by default)
+            **kwargs: Arguments for text_generation
+        
+        Returns:
+            Whatever text_generation returns
+        
+        Raises:
+            CircuitOpenError: If the breaker rejects the call
+            asyncio.TimeoutError: If the deadline passes (not counted as a breaker failure)
+        """
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = loop.time() + self.timeout
+        self.metrics.incr('calls')
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow():
+                self.metrics.incr('breaker_rejections')
+                raise CircuitOpenError("service temporarily unavailable, please try again shortly")
+            
+            try:
+                result = await asyncio.wait_for(
+                    self.client.text_generation(**kwargs), timeout=max(0.0, deadline - loop.time())
+                )
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError) and loop.time() >= deadline:
+                    # Our own deadline cut the attempt short; that says nothing about the backend
+                    self.circuit_breaker.release()
+                    self.metrics.incr('failures')
+                    raise
+                retryable = self.retry_policy.is_retryable(e)
+                if retryable:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.release()
+                delay = self.retry_policy.delay(attempt, e) if retryable else 0.0
+                if not retryable or attempt >= self.retry_policy.max_retries or loop.time() + delay >= deadline:
+                    self.metrics.incr('failures')
+                    raise
+                self.metrics.incr('retries')
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self.circuit_breaker.release()
+                raise
+            
+            self.circuit_breaker.record_success()
+            return result
+    
+    async def generate_response(
+        self,
+        messages: list,
+        user_type: str = "professional",
+        max_tokens: int = 512,
+        temperature: float = 0.7
+    ) -> str:
+        """
+        Generate a response from the AI model without blocking the event loop.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            user_type: User type - "student" or "professional"
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0-1)
+        
+        Returns:
+            str: Generated response text
+        """
+        if not self.client:
+            if not self.load_model():
+                return "Error: Failed to load model. Please check your API token."
+        
+        if not messages:
+            return "Error: No messages provided."
+        
+        timer = _CallTimer(self, "async_generate")
+        built = self.prepare_prompt(messages, user_type)
+        timer.prompt_built(built)
+        prompt = built.text
+        cache_key = self._cache_key(prompt, max_tokens, temperature)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                timer.cache_hit = True
+                timer.finish(cached)
+                return cached
+        
+        try:
+            queued = time.perf_counter()
+            async with self._semaphore():
+                timer.queue_wait = time.perf_counter() - queued
+                response = await self._acall_backend(
+                    prompt=prompt,
+                    model=self.endpoint_url or self.model_name,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                    do_sample=True
+                )
+            
+            if hasattr(response, 'generated_text'):
+                text = response.generated_text
+            elif isinstance(response, str):
+                text = response
+            else:
+                text = str(response)
+            
+            if cache_key:
+                self.cache.set(cache_key, text)
+            timer.finish(text)
+            return text
+        
+        except asyncio.TimeoutError:
+            timer.finish(error="TimeoutError")
+            return f"Error generating response: request timed out after {self.timeout}s"
+        except Exception as e:
+            timer.finish(error=type(e).__name__)
             return f"Error generating response: {str(e)}"
+    
+    async def stream_response(
+        self,
+        messages: list,
+        user_type: str = "professional",
+        max_tokens: int = 512,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the AI model chunk by chunk.
+        
+        The timeout covers the whole stream, not each chunk. Cancelling the
+        consuming task closes the underlying stream.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            user_type: User type - "student" or "professional"
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0-1)
+        
+        Yields:
+            str: Non-empty text chunks in generation order
+        """
+        if not self.client:
+            if not self.load_model():
+                yield "Error: Failed to load model. Please check your API token."
+                return
+        
+        if not messages:
+            yield "Error: No messages provided."
+            return
+        
+        timer = _CallTimer(self, "async_stream")
+        built = self.prepare_prompt(messages, user_type)
+        timer.prompt_built(built)
+        prompt = built.text
+        cache_key = self._cache_key(prompt, max_tokens, temperature)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                timer.cache_hit = True
+                timer.first_token()
+                timer.finish(cached)
+                yield cached
+                return
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        stream = None
+        chunks = []
+        error = None
+        
+        try:
+            queued = time.perf_counter()
+            async with self._semaphore():
+                timer.queue_wait = time.perf_counter() - queued
+                stream = await self._acall_backend(
+                    deadline,
+                    prompt=prompt,
+                    model=self.endpoint_url or self.model_name,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                    do_sample=True,
+                    stream=True,
+                    details=True
+                )
+                
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            stream.__anext__(), timeout=max(0.0, deadline - loop.time())
+                        )
+                    except StopAsyncIteration:
+                        break
+                    text = _chunk_text(chunk)
+                    if text:
+                        timer.first_token()
+                        chunks.append(text)
+                        yield text
+            
+            if cache_key and chunks:
+                self.cache.set(cache_key, "".join(chunks))
+        
+        except asyncio.TimeoutError:
+            error = "TimeoutError"
+            yield f"\n\nError generating response: request timed out after {self.timeout}s"
+        except (GeneratorExit, asyncio.CancelledError):
+            error = "Cancelled"
+            raise
+        except Exception as e:
+            error = type(e).__name__
+            yield f"\n\nError generating response: {str(e)}"
+        finally:
+            aclose = getattr(stream, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+            timer.finish("".join(chunks), error)
+    
+    async def generate_many(
+        self,
+        prompts: list,
+        user_type: str = "professional",
+        max_tokens: int = 512,
+        temperature: float = 0.7
+    ) -> list:
+        """
+        Generate responses for independent prompts concurrently.
+        
+        Requests run in parallel up to ``max_concurrency``; results come
+        back in input order and a failure in one prompt does not affect
+        the others.
+        
+        Args:
+            prompts: List of prompt strings or message lists
+            user_type: User type - "student" or "professional"
+            max_tokens: Maximum tokens in each response
+            temperature: Sampling temperature (0-1)
+        
+        Returns:
+            list: Generated response text for each prompt
+        """
+        conversations = [
+            [{"role": "user", "content": p}] if isinstance(p, str) else p
+            for p in prompts
+        ]
+        return await asyncio.gather(*[
+            self.generate_response(messages, user_type, max_tokens, temperature)
+            for messages in conversations
+        ])
+    
+    def run_many(self, prompts: list, **kwargs) -> list:
+        """
+        Synchronous wrapper around ``generate_many`` for Streamlit scripts.
+        
+        Args:
+            prompts: List of prompt strings or message lists
+            **kwargs: Passed through to ``generate_many``
+        
+        Returns:
+            list: Generated response text for each prompt
+        """
+        return asyncio.run(self.generate_many(prompts, **kwargs))
+
+
+@st.cache_resource
+def load_local_backend(
+    quantize: bool = False,
+    _num_threads: int = None,
+    max_batch_size: int = 8,
+    max_wait_ms: float = 10.0
+) -> Union[LocalGraniteBackend, BatchScheduler]:
+    """
+    Load and cache the in-process Granite model.
+    
+    The weights do not depend on the Hugging Face token, so every session
+    shares one loaded copy per quantization and batching setting. The
+    thread count is left out of the cache key: torch's thread pool is
+    process-wide, so it is sized once by the first load.
+    
+    Args:
+        quantize: Use int8 dynamic quantization
+        _num_threads: torch CPU threads (only the first load in the process applies it)
+        max_batch_size: Maximum requests per batched generate() (1 disables batching)
+        max_wait_ms: Time to collect a batch after the first request
+    
+    Returns:
+        LocalGraniteBackend or BatchScheduler: Loaded backend
+    """
+    backend = LocalGraniteBackend(quantize=quantize, num_threads=_num_threads).load()
+    if max_batch_size > 1:
+        return BatchScheduler(backend, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    return backend
 
 
 @st.cache_resource
-def load_ai_model(token: str) -> GraniteAIModel:
+def load_ai_model(
+    token: str,
+    backend: str = "remote",
+    quantize: bool = False,
+    num_threads: int = None,
+    max_batch_size: int = 8,
+    max_wait_ms: float = 10.0
+) -> GraniteAIModel:
     """
     Load and cache the AI model.
     
+    Cached once per process for each combination of arguments. The local
+    backend comes from ``load_local_backend``, so sessions with different
+    tokens still share one copy of the weights, and its scheduler batches
+    their concurrent requests.
+    
+    Every call is recorded in ``call_log``. Set FINANCEAI_CALL_LOG to a
+    path to also append calls there as JSON lines, and
+    FINANCEAI_METRICS_PORT to serve Prometheus metrics on that port.
+    
     Args:
         token: Hugging Face API token
-        
+        backend: "remote" for the Inference API or "local" for in-process CPU inference
+        quantize: Use int8 dynamic quantization (local backend only)
+        num_threads: torch CPU threads (local backend only)
+        max_batch_size: Maximum requests per batched generate() (local backend only, 1 disables batching)
+        max_wait_ms: Time to collect a batch after the first request (local backend only)
+    
     Returns:
         GraniteAIModel: Initialized model instance
     """
-    model = GraniteAIModel(token=token)
+    local_backend = None
+    if backend == "local":
+        local_backend = load_local_backend(quantize, num_threads, max_batch_size, max_wait_ms)
+    
+    sinks = [call_log]
+    if os.environ.get('FINANCEAI_CALL_LOG'):
+        sinks.append(JSONLSink(os.environ['FINANCEAI_CALL_LOG']))
+    if os.environ.get('FINANCEAI_METRICS_PORT'):
+        prometheus_metrics.serve(int(os.environ['FINANCEAI_METRICS_PORT']))
+        sinks.append(prometheus_metrics)
+    
+    model = GraniteAIModel(token=token, cache=LRUResponseCache(), local_backend=local_backend, sinks=sinks)
     if not model.load_model():
         st.error("Failed to initialize AI model. Check your token.")
     return model
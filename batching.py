@@ -0,0 +1,245 @@
+"""Micro-batching scheduler for the local model backend"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Iterator, Union
+
+from utils.local_model import LocalGraniteBackend, _last_queue_wait
+
+
+class _Request:
+    """A queued generation request and the future its caller waits on."""
+    __slots__ = ('prompt', 'max_new_tokens', 'temperature', 'do_sample', 'future', 'enqueued_at', 'started_at')
+    
+    def __init__(self, prompt: str, max_new_tokens: int, temperature: float, do_sample: bool):
+        self.prompt = prompt
+        self.max_new_tokens = max_new_tokens
+        self.temperature = temperature
+        self.do_sample = do_sample
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.started_at = None
+    
+    @property
+    def queue_wait(self) -> float:
+        """Seconds between queueing and the start of its batch (None until started)."""
+        return None if self.started_at is None else self.started_at - self.enqueued_at
+
+
+class BatchScheduler:
+    """
+    Collect concurrent generation requests into batched generate() calls.
+    
+    A background thread waits for the first request, keeps collecting for
+    up to ``max_wait_ms`` or until ``max_batch_size`` requests are queued,
+    then runs one padded batch per group of requests with the same sampling
+    settings and resolves each caller's future with its own completion.
+    
+    The scheduler is a drop-in replacement for LocalGraniteBackend: it has
+    the same ``text_generation``, ``load`` and ``model`` members. Streamed
+    requests bypass batching and go straight to the backend.
+    """
+    
+    def __init__(self, backend: LocalGraniteBackend, max_batch_size: int = 8, max_wait_ms: float = 10.0):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            backend: Local model backend that runs the batches
+            max_batch_size: Maximum requests per generate() call
+            max_wait_ms: How long to keep collecting after the first request arrives
+        """
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.batched_requests = 0
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+    
+    @property
+    def model(self):
+        """The backend's loaded model, or None before ``load``."""
+        return self.backend.model
+    
+    def load(self) -> "BatchScheduler":
+        """
+        Load the backend model and start the scheduler thread.
+        
+        Returns:
+            BatchScheduler: self, for chaining
+        """
+        if self.backend.model is None:
+            self.backend.load()
+        self.start()
+        return self
+    
+    def start(self):
+        """Start the background batching thread if it is not running."""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="granite-batcher", daemon=True)
+                self._worker.start()
+    
+    def stop(self):
+        """Stop the batching thread after the requests already queued."""
+        with self._lock:
+            worker = self._worker
+            self._worker = None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
+    
+    def submit(
+        self,
+        prompt: str,
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+        do_sample: bool = True
+    ) -> Future:
+        """
+        Queue a prompt for the next batch.
+        
+        Args:
+            prompt: Full generation prompt
+            max_new_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            do_sample: Whether to sample
+        
+        Returns:
+            Future: Resolves to the completion text
+        """
+        return self._enqueue(prompt, max_new_tokens, temperature, do_sample).future
+    
+    def _enqueue(self, prompt: str, max_new_tokens: int, temperature: float, do_sample: bool) -> _Request:
+        """Queue a request, starting the scheduler thread if needed."""
+        self.start()
+        request = _Request(prompt, max_new_tokens, temperature, do_sample)
+        self._queue.put(request)
+        return request
+    
+    def text_generation(
+        self,
+        prompt: str,
+        model: str = None,
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+        do_sample: bool = True,
+        stream: bool = False,
+        details: bool = False
+    ) -> Union[str, Iterator[str]]:
+        """
+        Generate a completion, batching it with concurrent callers.
+        
+        Args:
+            prompt: Full generation prompt
+            model: Ignored; accepted for InferenceClient compatibility
+            max_new_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            do_sample: Whether to sample
+            stream: Stream directly from the backend without batching
+            details: Ignored; chunks are always plain strings
+        
+        Returns:
+            str or Iterator[str]: Completion text, or its chunks when streaming
+        """
+        if stream:
+            return self.backend.text_generation(
+                prompt,
+                max_new_tokens=max_new_tokens,
+                temperature=temperature,
+                do_sample=do_sample,
+                stream=True
+            )
+        request = self._enqueue(prompt, max_new_tokens, temperature, do_sample)
+        try:
+            return request.future.result()
+        finally:
+            _last_queue_wait.set(request.queue_wait)
+    
+    def _collect(self, first: _Request) -> list:
+        """Gather requests that arrive within the wait window after ``first``."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # Stop sentinel: finish this batch, then let _run exit
+                self._queue.put(None)
+                break
+            batch.append(request)
+        return batch
+    
+    def _run(self):
+        """Scheduler loop: collect a batch, run it, resolve the futures."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            
+            # One generate() per sampling configuration
+            groups = {}
+            for request in batch:
+                sampled = request.do_sample and request.temperature > 0
+                key = (sampled, request.temperature if sampled else 0.0)
+                groups.setdefault(key, []).append(request)
+            
+            for (sampled, temperature), requests in groups.items():
+                self._run_group(requests, temperature, sampled)
+    
+    def _run_group(self, requests: list, temperature: float, do_sample: bool):
+        """Run one batched generate() and route each result to its caller."""
+        requests = [r for r in requests if r.future.set_running_or_notify_cancel()]
+        if not requests:
+            return
+        started_at = time.monotonic()
+        for request in requests:
+            request.started_at = started_at
+        try:
+            outputs = self.backend.generate_batch(
+                [r.prompt for r in requests],
+                [r.max_new_tokens for r in requests],
+                temperature=temperature,
+                do_sample=do_sample
+            )
+        except Exception as e:
+            for request in requests:
+                request.future.set_exception(e)
+            return
+        
+        self.batches += 1
+        self.batched_requests += len(requests)
+        for request, text in zip(requests, outputs):
+            request.future.set_result(text)
+    
+    @staticmethod
+    def last_queue_wait() -> float:
+        """
+        Get the queue wait of the last request made by this thread (or asyncio task).
+        
+        Returns:
+            float: Seconds, or None if there was none or it never started
+        """
+        return _last_queue_wait.get()
+    
+    def stats(self) -> dict:
+        """
+        Get batching counters.
+        
+        Returns:
+            dict: batches run, requests served and mean batch size
+        """
+        return {
+            'batches': self.batches,
+            'requests': self.batched_requests,
+            'mean_batch_size': self.batched_requests / self.batches if self.batches else 0.0
+        }
@@ -0,0 +1,5 @@
+"""Benchmarks for the FinanceAI utils package.
+
+Run from the directory that contains ``utils``, e.g.
+``python -m utils.benchmarks.bench_batching --help``.
+"""
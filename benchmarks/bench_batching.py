@@ -0,0 +1,120 @@
+"""Throughput of the local backend with and without micro-batching"""
+import argparse
+import json
+import threading
+import time
+
+from utils.batching import BatchScheduler
+from utils.local_model import LocalGraniteBackend
+
+
+PROMPT = (
+    "You are a helpful financial advisor assistant.\n\n"
+    "User: How much should I save for an emergency fund? (request {i})\n"
+    "Assistant: "
+)
+
+
+class SyntheticBackend:
+    """
+    Stand-in for LocalGraniteBackend with a batch cost model.
+    
+    A generate() call costs a fixed overhead plus a small per-row cost,
+    which is roughly how a memory-bound CPU decoder behaves. Useful for
+    checking the scheduler without downloading the model.
+    """
+    
+    def __init__(self, overhead_ms: float = 200.0, per_row_ms: float = 20.0):
+        self.overhead_ms = overhead_ms
+        self.per_row_ms = per_row_ms
+        self.model = object()
+        self._lock = threading.Lock()
+    
+    def load(self):
+        return self
+    
+    def text_generation(self, prompt, max_new_tokens=512, **kwargs):
+        return self.generate_batch([prompt], [max_new_tokens])[0]
+    
+    def generate_batch(self, prompts, max_new_tokens, temperature=0.7, do_sample=True):
+        with self._lock:
+            time.sleep((self.overhead_ms + self.per_row_ms * len(prompts)) / 1000.0)
+        return ["ok"] * len(prompts)
+
+
+def run(client, concurrency: int, requests_per_worker: int, max_new_tokens: int) -> dict:
+    """
+    Drive ``client.text_generation`` from concurrent threads.
+    
+    Args:
+        client: Backend or scheduler under test
+        concurrency: Number of concurrent callers
+        requests_per_worker: Requests issued by each caller
+        max_new_tokens: Tokens generated per request
+    
+    Returns:
+        dict: Request count, wall time, throughput and mean latency
+    """
+    latencies = []
+    lock = threading.Lock()
+    
+    def worker(worker_id: int):
+        for n in range(requests_per_worker):
+            start = time.perf_counter()
+            client.text_generation(
+                PROMPT.format(i=worker_id * requests_per_worker + n),
+                max_new_tokens=max_new_tokens,
+                temperature=0.0
+            )
+            with lock:
+                latencies.append(time.perf_counter() - start)
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 3),
+        'mean_latency_seconds': round(sum(latencies) / len(latencies), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=4, help="requests per concurrent caller")
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU threads")
+    parser.add_argument("--quantize", action="store_true")
+    parser.add_argument("--synthetic", action="store_true", help="use a cost model instead of the real model")
+    args = parser.parse_args()
+    
+    if args.synthetic:
+        backend = SyntheticBackend()
+    else:
+        backend = LocalGraniteBackend(quantize=args.quantize, num_threads=args.threads).load()
+    scheduler = BatchScheduler(backend, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    
+    results = []
+    for concurrency in args.concurrency:
+        for mode, client in (("unbatched", backend), ("batched", scheduler)):
+            result = run(client, concurrency, args.requests, args.max_new_tokens)
+            result['mode'] = mode
+            results.append(result)
+            print(json.dumps(result))
+    scheduler.stop()
+    
+    print(json.dumps({'results': results, 'scheduler': scheduler.stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
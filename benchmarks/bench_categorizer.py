@@ -0,0 +1,96 @@
+"""Categorizer throughput with thousands of rules, with and without the memo"""
+import argparse
+import json
+import random
+import re
+import time
+
+from utils.categorizer import DEFAULT_RULES, Categorizer
+
+CATEGORIES = [category for category, _ in DEFAULT_RULES]
+SYLLABLES = "ka lo mi ne ru sa ti vo ze ba co di fu ga ho ja ke li mo nu pe qu ra se tu".split()
+
+
+def synthetic_rules(keyword_count: int, regex_count: int, rng: random.Random) -> tuple:
+    """Generate made-up merchant keywords and regex rules."""
+    keywords = set()
+    while len(keywords) < keyword_count:
+        keywords.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    keywords = sorted(keywords)
+    rules = [(category, keywords[i::len(CATEGORIES)]) for i, category in enumerate(CATEGORIES)]
+    regex_rules = [
+        (rng.choice(CATEGORIES), rf"\b{rng.choice(SYLLABLES)}{rng.choice(SYLLABLES)}\s*\*\s*\d{{3,}}\b")
+        for _ in range(regex_count)
+    ]
+    return rules, regex_rules, keywords
+
+
+def synthetic_descriptions(count: int, merchants: int, keywords: list, rng: random.Random) -> list:
+    """Generate bank-style descriptions drawn from a fixed set of merchants."""
+    pool = []
+    for i in range(merchants):
+        name = rng.choice(keywords) if rng.random() < 0.8 else "".join(rng.choice(SYLLABLES) for _ in range(5))
+        pool.append(f"POS PURCHASE {name.upper()} #{rng.randint(100, 9999)} SAN FRANCISCO CA")
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def naive_categorizer(rules: list, regex_rules: list):
+    """Reference: one precompiled regex per rule, tried in turn."""
+    compiled = [(category, re.compile(pattern, re.IGNORECASE)) for category, pattern in regex_rules]
+    compiled += [
+        (category, re.compile(rf"(?<!\w){re.escape(keyword)}(?!\w)", re.IGNORECASE))
+        for category, keywords in rules
+        for keyword in keywords
+    ]
+    
+    def categorize(description: str) -> str:
+        for category, pattern in compiled:
+            if pattern.search(description):
+                return category
+        return 'Other'
+    
+    return categorize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keywords", type=int, default=5000)
+    parser.add_argument("--regex-rules", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--merchants", type=int, default=20_000, help="distinct descriptions")
+    parser.add_argument("--naive-rows", type=int, default=200, help="rows for the rule-by-rule baseline")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    rules, regex_rules, keywords = synthetic_rules(args.keywords, args.regex_rules, rng)
+    descriptions = synthetic_descriptions(args.rows, args.merchants, keywords, rng)
+    
+    start = time.perf_counter()
+    Categorizer(rules, regex_rules)
+    compile_seconds = time.perf_counter() - start
+    
+    results = {'rules': args.keywords + args.regex_rules, 'compile_seconds': round(compile_seconds, 3)}
+    for label, memo_size in (("memo", 65536), ("no_memo", 0)):
+        categorizer = Categorizer(rules, regex_rules, memo_size=memo_size)
+        start = time.perf_counter()
+        categorized = categorizer.categorize_many(descriptions)
+        elapsed = time.perf_counter() - start
+        results[f"{label}_rows_per_second"] = round(len(descriptions) / elapsed)
+    
+    naive = naive_categorizer(rules, regex_rules)
+    sample = descriptions[:args.naive_rows]
+    start = time.perf_counter()
+    expected = [naive(d) for d in sample]
+    elapsed = time.perf_counter() - start
+    results['naive_rows_per_second'] = round(len(sample) / elapsed)
+    results['agrees_with_naive'] = expected == categorized[:len(sample)]
+    
+    stats = categorizer.stats(top=5)
+    results['matched_share'] = round(stats['matched'] / stats['calls'], 3)
+    results['top_rules'] = stats['top_rules']
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Chat path throughput and latency against a fake inference server, no token needed
+
+Each virtual user plays a scripted multi-turn conversation through
+GraniteAIModel (generate or stream) or AsyncGraniteAIModel, at each
+concurrency level. The JSON report includes the commit, so runs can be
+saved with --output and compared across commits.
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from utils.ai_model import AsyncGraniteAIModel, CircuitBreaker, GraniteAIModel, RetryPolicy, RingBufferSink
+from utils.benchmarks.fake_inference_server import add_server_arguments, server_from_arguments
+
+SCRIPT = (
+    "I earn $4,800 a month after tax. Help me create a monthly budget.",
+    "Rent is $1,500 and I spend about $600 on food. Is that too much?",
+    "I have $7,000 of credit card debt at 22%. Should I pay it off or invest first?",
+    "How big should my emergency fund be?",
+    "What are good low-cost investment options for a beginner?",
+    "Can you summarize the plan we discussed in a few steps?"
+)
+MODES = ("generate", "stream", "async_generate", "async_stream")
+
+
+def run_sync(mode: str, url: str, concurrency: int, repeat: int, args) -> tuple:
+    """Play the script from ``concurrency`` threads; return (model, sink, prompt tokens per turn)."""
+    sink = RingBufferSink(max_records=1_000_000)
+    model = GraniteAIModel(
+        "hf_fake",
+        endpoint_url=url,
+        retry_policy=RetryPolicy(max_retries=args.max_retries),
+        circuit_breaker=CircuitBreaker(),
+        sinks=[sink]
+    )
+    model.load_model()
+    
+    def user(_) -> list:
+        tokens = []
+        for _ in range(repeat):
+            messages = []
+            for turn in SCRIPT:
+                messages.append({"role": "user", "content": turn})
+                if mode == "stream":
+                    reply = "".join(model.stream_response(messages, max_tokens=args.max_tokens))
+                else:
+                    reply = model.generate_response(messages, max_tokens=args.max_tokens)
+                tokens.append(model.last_prompt_tokens)
+                messages.append({"role": "assistant", "content": reply})
+        return tokens
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        per_user = list(pool.map(user, range(concurrency)))
+    return model, sink, per_user
+
+
+def run_async(mode: str, url: str, concurrency: int, repeat: int, args) -> tuple:
+    """Play the script from ``concurrency`` tasks on one event loop."""
+    sink = RingBufferSink(max_records=1_000_000)
+    model = AsyncGraniteAIModel("hf_fake", endpoint_url=url, max_concurrency=concurrency, timeout=args.timeout)
+    model.retry_policy = RetryPolicy(max_retries=args.max_retries)
+    model.circuit_breaker = CircuitBreaker()
+    model.sinks = [sink]
+    
+    async def user() -> list:
+        tokens = []
+        for _ in range(repeat):
+            messages = []
+            for turn in SCRIPT:
+                messages.append({"role": "user", "content": turn})
+                if mode == "async_stream":
+                    reply = "".join([chunk async for chunk in model.stream_response(messages, max_tokens=args.max_tokens)])
+                else:
+                    reply = await model.generate_response(messages, max_tokens=args.max_tokens)
+                tokens.append(model.last_prompt_tokens)
+                messages.append({"role": "assistant", "content": reply})
+        return tokens
+    
+    async def main() -> list:
+        # The async client is bound to the loop it is created on
+        model.load_model()
+        return await asyncio.gather(*[user() for _ in range(concurrency)])
+    
+    return model, sink, asyncio.run(main())
+
+
+def git_commit() -> str:
+    """Current commit of the package checkout, or None."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).resolve().parent, timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def milliseconds(timing: dict) -> dict:
+    """Convert a percentile dict from seconds to rounded milliseconds."""
+    return {q: round(seconds * 1000, 1) for q, seconds in timing.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=1, help="conversations per user")
+    parser.add_argument("--max-tokens", type=int, default=128)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0, help="async request timeout")
+    parser.add_argument("--endpoint", help="use this server instead of starting a fake one")
+    parser.add_argument("--output", help="also write the JSON report here")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    
+    server = None
+    url = args.endpoint
+    if url is None:
+        server = server_from_arguments(args).start()
+        url = server.url
+    
+    results = []
+    try:
+        for mode in args.modes:
+            for concurrency in args.concurrency:
+                start = time.perf_counter()
+                runner = run_async if mode.startswith("async") else run_sync
+                model, sink, per_user = runner(mode, url, concurrency, args.repeat, args)
+                elapsed = time.perf_counter() - start
+                
+                summary = sink.summary()
+                calls = sink.records()
+                completion_tokens = sum(call.completion_tokens for call in calls)
+                by_turn = [round(sum(tokens[i] for tokens in per_user) / len(per_user)) for i in range(len(SCRIPT))]
+                row = {
+                    'mode': mode,
+                    'concurrency': concurrency,
+                    'calls': summary['calls'],
+                    'errors': summary['errors'],
+                    'seconds': round(elapsed, 3),
+                    'calls_per_second': round(summary['calls'] / elapsed, 2),
+                    'completion_tokens_per_second': round(completion_tokens / elapsed, 1),
+                    'latency_ms': milliseconds(summary['timings']['latency']),
+                    'ttft_ms': milliseconds(summary['timings']['ttft']),
+                    'queue_wait_ms': milliseconds(summary['timings']['queue_wait']),
+                    'prompt_build_ms': milliseconds(summary['timings']['prompt_build']),
+                    'prompt_tokens_by_turn': by_turn,
+                    'resilience': model.resilience_stats()
+                }
+                results.append(row)
+                print(json.dumps({key: row[key] for key in ('mode', 'concurrency', 'calls_per_second', 'latency_ms')}))
+    finally:
+        if server is not None:
+            server.stop()
+    
+    report = {
+        'commit': git_commit(),
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'script_turns': len(SCRIPT),
+        'results': results,
+        'server': server.stats() if server is not None else None
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
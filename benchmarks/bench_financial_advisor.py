@@ -0,0 +1,89 @@
+"""FinancialAdvisor batch API versus the scalar methods called row by row"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.financial_advisor import FinancialAdvisor
+
+
+def synthetic_budgets(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate monthly budgets, including some zero and negative incomes.
+    
+    Args:
+        rows: Number of budgets
+        seed: RNG seed
+    
+    Returns:
+        pd.DataFrame: income, expenses and debt columns
+    """
+    rng = np.random.default_rng(seed)
+    income = rng.lognormal(mean=8.3, sigma=0.5, size=rows).round(2)
+    income[rng.random(rows) < 0.01] = 0.0
+    income[rng.random(rows) < 0.005] *= -1
+    return pd.DataFrame({
+        'income': income,
+        'expenses': (np.abs(income) * rng.uniform(0.5, 1.1, rows)).round(2),
+        'debt': (np.abs(income) * rng.uniform(0.0, 0.4, rows)).round(2)
+    })
+
+
+def scalar_scores(budgets: pd.DataFrame) -> pd.DataFrame:
+    """Score budgets one row at a time with the scalar methods."""
+    rows = []
+    for income, expenses, debt in zip(budgets['income'], budgets['expenses'], budgets['debt']):
+        rows.append((
+            FinancialAdvisor.calculate_savings_rate(income, expenses),
+            FinancialAdvisor.calculate_monthly_savings(income, expenses),
+            FinancialAdvisor.calculate_debt_ratio(debt, income),
+            FinancialAdvisor.get_budget_advice(income, expenses)
+        ))
+    return pd.DataFrame(rows, columns=['savings_rate', 'monthly_savings', 'debt_ratio', 'advice'], index=budgets.index)
+
+
+def best_of(fn, repeat: int) -> tuple:
+    """Run ``fn`` ``repeat`` times; return (fastest seconds, last result)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000, 500_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    results = []
+    for rows in args.rows:
+        budgets = synthetic_budgets(rows)
+        scalar_seconds, expected = best_of(lambda: scalar_scores(budgets), args.repeat)
+        batch_seconds, actual = best_of(lambda: FinancialAdvisor.score_budgets(budgets), args.repeat)
+        
+        # Same numbers and the same advice as the scalar loop
+        for column in ('savings_rate', 'monthly_savings', 'debt_ratio'):
+            np.testing.assert_allclose(actual[column], expected[column])
+        assert (actual['advice'].astype(str) == expected['advice']).all()
+        
+        result = {
+            'rows': rows,
+            'scalar_seconds': round(scalar_seconds, 4),
+            'batch_seconds': round(batch_seconds, 4),
+            'speedup': round(scalar_seconds / batch_seconds, 1),
+            'batch_rows_per_second': round(rows / batch_seconds)
+        }
+        results.append(result)
+        print(json.dumps(result))
+    
+    print(json.dumps({'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
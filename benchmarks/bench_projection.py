@@ -0,0 +1,58 @@
+"""Monte Carlo projection throughput, in-process and with a process pool"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from utils.projection import project
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--years", type=int, default=40)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    results = []
+    reference = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = project(
+            income=5000,
+            expenses=3500,
+            savings=10000,
+            debt=8000,
+            debt_payment=300,
+            years=args.years,
+            paths=args.paths,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+            workers=workers
+        )
+        elapsed = time.perf_counter() - start
+        
+        # Same seed and chunk size give the same paths whatever the worker count
+        if reference is None:
+            reference = result.balances
+        assert np.array_equal(reference, result.balances)
+        
+        row = {
+            'workers': workers,
+            'paths': args.paths,
+            'months': args.years * 12,
+            'seconds': round(elapsed, 3),
+            'path_months_per_second': round(args.paths * args.years * 12 / elapsed),
+            'median_final_savings': round(float(result.percentiles((50,))['p50'].iloc[-1]), 2)
+        }
+        results.append(row)
+        print(json.dumps(row))
+    
+    print(json.dumps({'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Cold import time of each page's modules, measured with -X importtime"""
+import argparse
+import json
+import statistics
+
+from utils.bootstrap import profile_imports
+
+# Top-level imports of each page, as Streamlit runs them on a cold start
+PAGE_IMPORTS = {
+    'app': ["streamlit", "utils.bootstrap"],
+    'chat': ["streamlit", "utils.ai_model", "utils.bootstrap"],
+    'analytics': [
+        "streamlit", "utils.ai_model", "utils.bootstrap", "utils.charts", "utils.financial_advisor",
+        "utils.insights", "utils.ledger", "utils.projection"
+    ],
+    'research_hub': ["streamlit", "utils.bootstrap", "utils.database", "utils.topic_transfer"]
+}
+# Modules the pages used to import eagerly and now defer
+DEFERRED = ["plotly.express", "plotly.graph_objects", "huggingface_hub"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per page; the median is reported")
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+    
+    results = {}
+    for page, modules in PAGE_IMPORTS.items():
+        statement = "; ".join(f"import {module}" for module in modules)
+        totals = []
+        for _ in range(args.runs):
+            timings = profile_imports(statement)
+            totals.append(sum(timing.cumulative_us for timing in timings if timing.depth == 0) / 1000)
+        slowest = sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[:args.top]
+        results[page] = {
+            'median_ms': round(statistics.median(totals), 1),
+            'modules': len(timings),
+            'slowest': [(timing.module, round(timing.cumulative_us / 1000, 1)) for timing in slowest]
+        }
+        print(json.dumps({page: results[page]['median_ms']}))
+    
+    deferred = {}
+    for module in DEFERRED:
+        try:
+            timings = profile_imports(f"import {module}")
+        except RuntimeError:
+            continue  # not installed
+        deferred[module] = round(sum(timing.cumulative_us for timing in timings if timing.depth == 0) / 1000, 1)
+    results['deferred_import_ms'] = deferred
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
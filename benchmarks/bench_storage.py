@@ -0,0 +1,197 @@
+"""ResearchDatabase operations and FinancialAdvisor scoring at 10k to 1M records"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from utils.benchmarks.bench_financial_advisor import scalar_scores, synthetic_budgets
+from utils.database import (
+    ResearchDatabase, SessionStateStorage, SharedMemoryStorage, SharedStoreRegistry, SQLiteStorage, TopicStore
+)
+from utils.financial_advisor import FinancialAdvisor
+
+FINANCE_WORDS = (
+    "budget savings emergency fund index etf bond stock dividend tax deduction retirement mortgage "
+    "interest rate credit score debt avalanche snowball allocation inflation roth 401k brokerage"
+).split()
+SYLLABLES = "ka lo mi ne ru sa ti vo ze ba co di fu ga ho ja ke li mo nu pe ra se tu".split()
+
+
+class MemoryStorage(SessionStateStorage):
+    """The session-state backend's TopicStore, held outside Streamlit."""
+    
+    def __init__(self):
+        self.store = TopicStore()
+    
+    def initialize(self):
+        pass
+    
+    def _store(self) -> TopicStore:
+        return self.store
+
+
+def vocabulary(size: int, seed: int = 0) -> list:
+    """Finance words followed by made-up ones, most frequent first."""
+    rng = random.Random(seed)
+    words = list(FINANCE_WORDS)
+    seen = set(words)
+    while len(words) < size:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def synthetic_topics(count: int, words: list, content_words: int = 40, seed: int = 0):
+    """
+    Generate topic records lazily with Zipf-distributed words, like real notes.
+    
+    Args:
+        count: Number of records
+        words: Vocabulary, most frequent first
+        content_words: Words of content per topic
+        seed: RNG seed
+    
+    Yields:
+        dict: Record with a title, content and two tags
+    """
+    rng = np.random.default_rng(seed)
+    n = len(words)
+    for start in range(0, count, 10_000):
+        rows = min(10_000, count - start)
+        picks = (rng.zipf(1.3, size=(rows, content_words + 4)) - 1) % n
+        for i, row in enumerate(picks.tolist()):
+            yield {
+                'title': f"{words[row[0]].title()} {words[row[1]]} note {start + i}",
+                'content': " ".join(words[k] for k in row[4:]),
+                'tags': [FINANCE_WORDS[row[2] % len(FINANCE_WORDS)], FINANCE_WORDS[row[3] % len(FINANCE_WORDS)]]
+            }
+
+
+class Recorder:
+    """Time steps and, when tracing, their peak and retained traced memory."""
+    
+    def __init__(self, trace_memory: bool, **labels):
+        self.trace_memory = trace_memory
+        self.labels = labels
+        self.results = []
+    
+    def run(self, step: str, ops: int, fn) -> dict:
+        """Run ``fn`` (which performs ``ops`` operations) and record the step."""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        result = {
+            **self.labels,
+            'step': step,
+            'ops': ops,
+            'seconds': round(elapsed, 4),
+            'ops_per_second': round(ops / elapsed, 1) if elapsed else None,
+            'mean_us': round(elapsed * 1e6 / ops, 3)
+        }
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            result['peak_mib'] = round((peak - before) / 2 ** 20, 2)
+            result['retained_mib'] = round((current - before) / 2 ** 20, 2)
+        self.results.append(result)
+        print(json.dumps(result))
+        return result
+
+
+def bench_topics(backend_name: str, size: int, args, words: list, tmp: str) -> list:
+    """Load ``size`` topics into a fresh backend, then time each operation."""
+    if backend_name == "sqlite":
+        backend = SQLiteStorage(os.path.join(tmp, f"topics-{size}.sqlite3"))
+    elif backend_name == "shared":
+        backend = SharedMemoryStorage(SharedStoreRegistry(), namespace="bench")
+    else:
+        backend = MemoryStorage()
+    ResearchDatabase.configure(backend)
+    recorder = Recorder(args.trace_memory, backend=backend_name, size=size)
+    rng = random.Random(args.seed)
+    ops = args.ops
+    
+    recorder.run("load", size, lambda: ResearchDatabase.bulk_import(synthetic_topics(size, words, seed=args.seed), args.batch_size))
+    # Build the search index outside the timed search step (SQLite builds it lazily)
+    recorder.run("index", 1, lambda: backend.search_index())
+    ids = [topic['id'] for topic in ResearchDatabase.iter_topics()]
+    
+    new_topics = list(synthetic_topics(ops, words, seed=args.seed + 1))
+    recorder.run("add", ops, lambda: [ResearchDatabase.add_topic(t['title'], t['content'], t['tags']) for t in new_topics])
+    
+    # Common words match a large share of topics, so ranking them dominates search cost
+    common = [rng.choice(words[:50]) for _ in range(args.search_ops)]
+    rare = [f"{rng.choice(words[50:])} {rng.choice(words[:200])}" for _ in range(ops)]
+    recorder.run("search_common", len(common), lambda: [ResearchDatabase.search_topics(q, limit=20) for q in common])
+    recorder.run("search_rare", ops, lambda: [ResearchDatabase.search_topics(q, limit=20) for q in rare])
+    
+    cursors = [rng.choice(ids) for _ in range(ops)]
+    recorder.run("list_page", ops, lambda: [ResearchDatabase.list_topics(after_id=c, limit=20) for c in cursors])
+    recorder.run("count", ops, lambda: [ResearchDatabase.count_topics() for _ in range(ops)])
+    
+    targets = rng.sample(ids, min(ops, len(ids)))
+    recorder.run("update", len(targets), lambda: [
+        ResearchDatabase.update_topic(topic_id, content=new_topics[i % len(new_topics)]['content'])
+        for i, topic_id in enumerate(targets)
+    ])
+    recorder.run("delete", len(targets), lambda: [ResearchDatabase.delete_topic(topic_id) for topic_id in targets])
+    return recorder.results
+
+
+def bench_advisor(size: int, args) -> list:
+    """Score ``size`` budgets with the scalar methods and with score_budgets."""
+    budgets = synthetic_budgets(size, args.seed)
+    recorder = Recorder(args.trace_memory, backend="advisor", size=size)
+    if size <= args.scalar_max_rows:
+        recorder.run("advisor_scalar", size, lambda: scalar_scores(budgets))
+    recorder.run("advisor_batch", size, lambda: FinancialAdvisor.score_budgets(budgets))
+    return recorder.results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--backends", nargs="+", choices=["memory", "shared", "sqlite"], default=["memory", "sqlite"])
+    parser.add_argument("--ops", type=int, default=500, help="operations per step after loading")
+    parser.add_argument("--search-ops", type=int, default=50, help="queries for the common-word search step")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--scalar-max-rows", type=int, default=100_000, help="skip the row-by-row advisor above this")
+    parser.add_argument("--skip-advisor", action="store_true")
+    parser.add_argument("--trace-memory", action="store_true", help="report peak and retained memory (slower)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+    
+    words = vocabulary(args.vocabulary, args.seed)
+    if args.trace_memory:
+        tracemalloc.start()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            for backend_name in args.backends:
+                results += bench_topics(backend_name, size, args, words, tmp)
+                ResearchDatabase.configure(None)
+            if not args.skip_advisor:
+                results += bench_advisor(size, args)
+    if args.trace_memory:
+        tracemalloc.stop()
+    
+    text = json.dumps({'config': vars(args), 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Throughput of research topic bulk import and JSONL/Parquet export"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from utils.database import ResearchDatabase, SQLiteStorage
+from utils.topic_transfer import read_topics
+
+WORDS = (
+    "budget savings emergency fund index etf bond stock dividend tax deduction retirement "
+    "mortgage interest rate credit score debt avalanche snowball allocation inflation"
+).split()
+
+
+def synthetic_topics(count: int):
+    """
+    Generate topic records lazily.
+    
+    Args:
+        count: Number of records
+    
+    Yields:
+        dict: Record with a title, ~40 words of content and two tags
+    """
+    n = len(WORDS)
+    for i in range(count):
+        yield {
+            'title': f"{WORDS[i % n].title()} note {i}",
+            'content': " ".join(WORDS[(i * 7 + k) % n] for k in range(40)),
+            'tags': [WORDS[i % 13], WORDS[(i // 13) % n]]
+        }
+
+
+def timed(label: str, count_fn, trace_memory: bool) -> dict:
+    """Run ``count_fn`` and report throughput (and peak traced memory if enabled)."""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    count = count_fn()
+    elapsed = time.perf_counter() - start
+    result = {
+        'step': label,
+        'topics': count,
+        'seconds': round(elapsed, 3),
+        'topics_per_second': round(count / elapsed, 1)
+    }
+    if trace_memory:
+        result['peak_mib'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        tracemalloc.stop()
+    print(json.dumps(result))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--trace-memory", action="store_true", help="report peak memory (slower)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        source_db = os.path.join(tmp, "source.sqlite3")
+        target_db = os.path.join(tmp, "target.sqlite3")
+        export_path = os.path.join(tmp, f"topics.{args.format}")
+        binary = args.format == "parquet"
+        
+        ResearchDatabase.configure(SQLiteStorage(source_db))
+        results = [timed(
+            "bulk_import",
+            lambda: ResearchDatabase.bulk_import(synthetic_topics(args.count), args.batch_size),
+            args.trace_memory
+        )]
+        
+        def export():
+            with open(export_path, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+                return ResearchDatabase.export(f, args.format, args.batch_size)
+        
+        results.append(timed(f"export_{args.format}", export, args.trace_memory))
+        size_mib = os.path.getsize(export_path) / 2 ** 20
+        
+        ResearchDatabase.configure(SQLiteStorage(target_db))
+        
+        def reimport():
+            with open(export_path, "rb" if binary else "r", encoding=None if binary else "utf-8") as f:
+                return ResearchDatabase.bulk_import(read_topics(f, args.format, args.batch_size), args.batch_size)
+        
+        results.append(timed(f"import_{args.format}", reimport, args.trace_memory))
+    
+    print(json.dumps({'count': args.count, 'export_mib': round(size_mib, 1), 'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Local stand-in for the Hugging Face text-generation API, for offline benchmarks
+
+Speaks the text-generation-inference protocol that ``InferenceClient``
+uses when ``GraniteAIModel`` is given an ``endpoint_url``: a JSON POST
+with ``inputs`` and ``parameters``, answered with ``[{"generated_text"}]``
+or, when ``stream`` is set, server-sent events with one token each.
+Latency, token rate and failures are configurable, so runs are
+repeatable without a token or network access.
+
+Run standalone with ``python -m utils.benchmarks.fake_inference_server --port 8080``.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "budget savings emergency fund index invest retirement expenses income debt interest rate credit score "
+    "compound diversify monthly goal track spending reduce automate allocate portfolio tax account plan"
+).split()
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+class FakeInferenceServer:
+    """
+    Threaded HTTP server that imitates a text-generation endpoint.
+    
+    Each request waits a base latency drawn from the configured
+    distribution plus a prefill time proportional to the prompt, then
+    emits ``completion_tokens`` tokens (capped by max_new_tokens) at
+    ``tokens_per_second``. A fraction ``error_rate`` of requests fail
+    with ``error_status`` instead.
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 200.0,
+        latency_distribution: str = "lognormal",
+        latency_sigma: float = 0.5,
+        prefill_ms_per_1k_tokens: float = 20.0,
+        tokens_per_second: float = 50.0,
+        completion_tokens: int = 64,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0
+    ):
+        """
+        Initialize the server (not yet listening).
+        
+        Args:
+            host: Interface to bind
+            port: TCP port (0 picks a free one)
+            latency_ms: Median base latency before the first token
+            latency_distribution: "fixed", "uniform" (0 to 2x) or "lognormal"
+            latency_sigma: Shape of the lognormal distribution
+            prefill_ms_per_1k_tokens: Extra latency per 1000 prompt tokens (~4 characters each)
+            tokens_per_second: Generation speed after the first token
+            completion_tokens: Tokens per completion, capped by max_new_tokens
+            error_rate: Fraction of requests that fail
+            error_status: HTTP status of injected failures (503 and 429 send Retry-After)
+            seed: Random seed for latencies and failures
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution {latency_distribution!r}")
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self.prefill_ms_per_1k_tokens = prefill_ms_per_1k_tokens
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.streamed = 0
+        self.errors = 0
+        self.prompt_chars = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL to pass as GraniteAIModel's endpoint_url."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "FakeInferenceServer":
+        """Serve from a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="fake-inference", daemon=True)
+            self._thread.start()
+        return self
+    
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+    
+    def stop(self):
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread = None
+    
+    def __enter__(self) -> "FakeInferenceServer":
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def stats(self) -> dict:
+        """
+        Get request counters.
+        
+        Returns:
+            dict: requests, streamed requests, injected errors and prompt characters received
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'streamed': self.streamed,
+                'errors': self.errors,
+                'prompt_chars': self.prompt_chars
+            }
+    
+    def _plan(self, prompt: str, stream: bool) -> tuple:
+        """Count the request and draw its (failure, base latency in seconds)."""
+        with self._lock:
+            self.requests += 1
+            self.streamed += stream
+            self.prompt_chars += len(prompt)
+            failed = self._rng.random() < self.error_rate
+            self.errors += failed
+            if self.latency_distribution == "fixed":
+                latency = self.latency_ms
+            elif self.latency_distribution == "uniform":
+                latency = self._rng.uniform(0, 2 * self.latency_ms)
+            else:
+                latency = self.latency_ms * math.exp(self._rng.gauss(0, self.latency_sigma))
+        prefill = self.prefill_ms_per_1k_tokens * len(prompt) / 4000
+        return failed, (latency + prefill) / 1000
+    
+    def _handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                prompt = body.get("inputs", "")
+                parameters = body.get("parameters") or {}
+                stream = bool(body.get("stream"))
+                failed, wait = server._plan(prompt, stream)
+                time.sleep(wait)
+                if failed:
+                    self._send_error()
+                    return
+                
+                count = min(server.completion_tokens, parameters.get("max_new_tokens") or server.completion_tokens)
+                words = [WORDS[(len(prompt) + i) % len(WORDS)] for i in range(count)]
+                if stream:
+                    self._stream(words)
+                else:
+                    time.sleep(count / server.tokens_per_second)
+                    result = {"generated_text": " ".join(words)}
+                    if parameters.get("details"):
+                        result["details"] = {"finish_reason": "length", "generated_tokens": count, "seed": None, "prefill": [], "tokens": []}
+                    self._send_json(200, [result])
+            
+            def _stream(self, words: list):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                delay = 1 / server.tokens_per_second
+                for i, word in enumerate(words):
+                    last = i == len(words) - 1
+                    event = {
+                        "index": i + 1,
+                        "token": {"id": i, "text": word if i == 0 else " " + word, "logprob": -0.1, "special": False},
+                        "generated_text": " ".join(words) if last else None,
+                        "details": {"finish_reason": "length", "generated_tokens": len(words), "seed": None} if last else None
+                    }
+                    try:
+                        self.wfile.write(f"data:{json.dumps(event)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                    except (BrokenPipeError, ConnectionResetError):
+                        return  # client closed the stream early
+                    if not last:
+                        time.sleep(delay)
+                self.close_connection = True
+            
+            def _send_error(self):
+                headers = {"Retry-After": "1"} if server.error_status in (429, 503) else {}
+                self._send_json(server.error_status, {"error": "injected failure", "error_type": "overloaded"}, headers)
+            
+            def _send_json(self, status: int, payload, headers: dict = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Add the FakeInferenceServer options to an argument parser."""
+    group = parser.add_argument_group("fake server")
+    group.add_argument("--latency-ms", type=float, default=200.0, help="median latency before the first token")
+    group.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    group.add_argument("--latency-sigma", type=float, default=0.5)
+    group.add_argument("--prefill-ms-per-1k", type=float, default=20.0, help="extra latency per 1000 prompt tokens")
+    group.add_argument("--tokens-per-second", type=float, default=50.0)
+    group.add_argument("--completion-tokens", type=int, default=64)
+    group.add_argument("--error-rate", type=float, default=0.0)
+    group.add_argument("--error-status", type=int, default=503)
+    group.add_argument("--seed", type=int, default=0)
+
+
+def server_from_arguments(args: argparse.Namespace, host: str = "127.0.0.1", port: int = 0) -> FakeInferenceServer:
+    """Create a FakeInferenceServer from parsed ``add_server_arguments`` options."""
+    return FakeInferenceServer(
+        host=host,
+        port=port,
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        latency_sigma=args.latency_sigma,
+        prefill_ms_per_1k_tokens=args.prefill_ms_per_1k,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake text-generation endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    
+    server = server_from_arguments(args, args.host, args.port)
+    print(f"Serving on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.stats()))
+
+
+if __name__ == "__main__":
+    main()
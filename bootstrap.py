@@ -0,0 +1,216 @@
+"""Shared page setup: deferred imports, cached stylesheets and import-time profiling"""
+import hashlib
+import importlib
+import importlib.util
+import re
+import sys
+import threading
+import types
+from pathlib import Path
+from typing import NamedTuple
+
+import streamlit as st
+
+STYLES_DIR = Path(__file__).parent / "styles"
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+_css_cache = {}
+_css_lock = threading.Lock()
+
+
+class _LazyModule(types.ModuleType):
+    """Stand-in that imports the real module on first attribute access."""
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+        return self._module
+    
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+    
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str):
+    """
+    Import a module on first attribute access instead of now.
+    
+    Heavy optional modules (plotly, huggingface_hub, transformers) can be
+    bound at module level without paying for their import until a code
+    path actually uses them. Parent packages are still imported eagerly,
+    and a missing module fails here, not on first use.
+    
+    Streamlit runs each session in its own thread, and
+    ``importlib.util.LazyLoader`` is not safe when two threads touch a
+    module first at once. The proxy instead loads through
+    ``importlib.import_module`` under a lock, and the real module only
+    enters ``sys.modules`` once it is fully initialized.
+    
+    Args:
+        name: Dotted module name
+    
+    Returns:
+        module: The module, or a lazy proxy that loads it when touched
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
+
+
+def load_css(name: str) -> tuple:
+    """
+    Read a stylesheet from the styles directory, once per process.
+    
+    The file is re-read only when its modification time changes, so
+    reruns reuse the cached text and its hash.
+    
+    Args:
+        name: Stylesheet name without the .css extension
+    
+    Returns:
+        tuple: (css text, short content hash)
+    """
+    path = STYLES_DIR / f"{name}.css"
+    mtime = path.stat().st_mtime_ns
+    with _css_lock:
+        cached = _css_cache.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+    css = path.read_text(encoding="utf-8")
+    digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+    with _css_lock:
+        _css_cache[name] = (mtime, css, digest)
+    return css, digest
+
+
+def inject_css(*names: str):
+    """
+    Add stylesheets to the current page.
+    
+    Each <style> tag carries the content hash, so the emitted markdown is
+    identical across reruns until the file changes and the frontend can
+    keep the element it already has.
+    
+    Args:
+        names: Stylesheet names without the .css extension
+    """
+    blocks = []
+    for name in names:
+        css, digest = load_css(name)
+        blocks.append(f'<style data-css="{name}-{digest}">\n{css}</style>')
+    if blocks:
+        st.markdown("\n".join(blocks), unsafe_allow_html=True)
+
+
+def setup_page(page_title: str, page_icon: str, styles: tuple = (), **config):
+    """
+    Configure a page and add its stylesheets.
+    
+    Args:
+        page_title: Browser tab title
+        page_icon: Browser tab icon
+        styles: Stylesheet names from the styles directory
+        **config: Extra st.set_page_config arguments (layout defaults to "wide")
+    """
+    config.setdefault("layout", "wide")
+    st.set_page_config(page_title=page_title, page_icon=page_icon, **config)
+    inject_css(*styles)
+
+
+class ImportTiming(NamedTuple):
+    """One line of ``python -X importtime`` output; times in microseconds."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(text: str) -> list:
+    """
+    Parse ``python -X importtime`` stderr output.
+    
+    Args:
+        text: Captured stderr; lines that are not import timings are ignored
+    
+    Returns:
+        list: ImportTiming per imported module, in the order they finished
+    """
+    timings = []
+    for line in text.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return timings
+
+
+def profile_imports(statement: str, python: str = sys.executable, cwd: str = None) -> list:
+    """
+    Run a statement in a fresh interpreter under ``-X importtime``.
+    
+    Args:
+        statement: Python source, e.g. "import utils.ai_model"
+        python: Interpreter to run
+        cwd: Working directory (the current one if None)
+    
+    Returns:
+        list: ImportTiming per imported module
+    
+    Raises:
+        RuntimeError: If the statement fails
+    """
+    import subprocess  # profiling only; pages don't need it
+    
+    result = subprocess.run([python, "-X", "importtime", "-c", statement], capture_output=True, text=True, cwd=cwd)
+    if result.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed: {result.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def import_report(timings: list, top: int = 15) -> str:
+    """
+    Summarize an import profile.
+    
+    Args:
+        timings: parse_importtime() output
+        top: Number of modules to list
+    
+    Returns:
+        str: Total time of the top-level imports and the slowest modules by cumulative time
+    """
+    total_us = sum(timing.cumulative_us for timing in timings if timing.depth == 0)
+    lines = [f"total: {total_us / 1000:.1f} ms over {len(timings)} modules"]
+    for timing in sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[:top]:
+        lines.append(f"{timing.cumulative_us / 1000:9.1f} ms {timing.self_us / 1000:9.1f} ms self  {timing.module}")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Profile the cold import time of modules in a fresh interpreter")
+    parser.add_argument("modules", nargs="+", help="modules to import, e.g. utils.ai_model")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    args = parser.parse_args()
+    
+    try:
+        timings = profile_imports("; ".join(f"import {module}" for module in args.modules))
+    except RuntimeError as e:
+        sys.exit(f"error: {e}")
+    print(import_report(timings, args.top))
+
+
+if __name__ == "__main__":
+    main()
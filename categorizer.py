@@ -0,0 +1,277 @@
+"""Rule-based merchant categorization with compiled multi-pattern matching"""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable
+
+
+# Merchant keyword rules: (category, keywords). Matching is case-insensitive on whole words.
+DEFAULT_RULES = (
+    ('Housing', ('rent', 'mortgage', 'hoa', 'property management', 'apartments', 'landlord')),
+    ('Food', (
+        'grocery', 'groceries', 'supermarket', 'safeway', 'kroger', 'whole foods', 'trader joe', 'aldi', 'costco',
+        'restaurant', 'cafe', 'coffee', 'starbucks', 'mcdonald', 'chipotle', 'pizza', 'doordash', 'uber eats',
+        'grubhub', 'bakery'
+    )),
+    ('Transportation', (
+        'uber', 'lyft', 'taxi', 'shell', 'chevron', 'exxon', 'bp', 'gas station', 'fuel', 'parking', 'toll',
+        'transit', 'metro', 'amtrak', 'airline', 'car wash', 'auto repair'
+    )),
+    ('Entertainment', (
+        'netflix', 'spotify', 'hulu', 'disney', 'hbo', 'cinema', 'movie', 'theater', 'theatre', 'amc',
+        'steam', 'playstation', 'xbox', 'ticketmaster', 'concert'
+    )),
+    ('Healthcare', (
+        'pharmacy', 'cvs', 'walgreens', 'rite aid', 'clinic', 'hospital', 'dental', 'dentist', 'doctor',
+        'medical', 'optometry', 'health insurance'
+    )),
+    ('Utilities', (
+        'electric', 'electricity', 'water', 'gas company', 'power', 'energy', 'internet', 'comcast', 'xfinity',
+        'verizon', 'at&t', 't-mobile', 'utility', 'utilities', 'sewer', 'trash'
+    )),
+    ('Shopping', (
+        'amazon', 'target', 'walmart', 'best buy', 'ebay', 'etsy', 'ikea', 'home depot', 'macy', 'nike',
+        'apple store', 'clothing'
+    ))
+)
+
+# Regex rules: (category, pattern), for merchants keywords can't pin down
+DEFAULT_REGEX_RULES = (
+    ('Shopping', r"\bamzn\s+mktp\b|\bamazon\.\w+"),
+    ('Entertainment', r"\bapple\.com/bill\b"),
+    ('Transportation', r"\buber\s*\*?\s*trip\b")
+)
+
+
+def _trie_regex(keywords: Iterable[str]) -> str:
+    """
+    Build a regex equivalent to an alternation of keywords, factored as a trie.
+    
+    A plain ``a|b|c`` alternation makes the regex engine retry every
+    keyword at each position; the trie form shares prefixes, so a failed
+    match costs one branch per character and thousands of keywords stay
+    fast. Optional suffixes are greedy, so the longest keyword wins.
+    
+    Args:
+        keywords: Lowercase keywords
+    
+    Returns:
+        str: Regex source (without word boundaries)
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if '' in node:
+            pattern = f"(?:{pattern})?"
+        return pattern
+    
+    return build(trie)
+
+
+def _required_literal(pattern: str) -> str:
+    """
+    Find a literal every match of a regex must contain, for prefiltering.
+    
+    Conservative: patterns with alternation or groups give None, a
+    character followed by ``?``, ``*`` or any ``{m,n}`` quantifier is
+    dropped, and only plain letters, digits and spaces count.
+    
+    Args:
+        pattern: Regex source
+    
+    Returns:
+        str: Longest required lowercase literal of 3+ characters, or None
+    """
+    if "|" in pattern or "(" in pattern:
+        return None
+    runs = [""]
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            runs.append("")
+            i += 2
+        elif char == "[":
+            runs.append("")
+            i = pattern.find("]", i) + 1 or len(pattern)
+        elif char == "{":
+            # Any {m,n} quantifier may allow zero repeats, like ?
+            runs[-1] = runs[-1][:-1]
+            runs.append("")
+            i = pattern.find("}", i) + 1 or len(pattern)
+        elif char in "?*":
+            runs[-1] = runs[-1][:-1]
+            runs.append("")
+            i += 1
+        elif char.isalnum() or char == " ":
+            runs[-1] += char.lower()
+            i += 1
+        else:
+            runs.append("")
+            i += 1
+    longest = max(runs, key=len)
+    return longest if len(longest) >= 3 else None
+
+
+class Categorizer:
+    """
+    Map transaction descriptions to spending categories.
+    
+    Keyword rules are compiled into one trie-shaped regex, so a description
+    is scanned once however many keywords there are. Regex rules are
+    prefiltered the same way: a trie regex over the literal each rule
+    requires finds the rules that could match, and only those run (rules
+    without such a literal always run). Regex rules take precedence over
+    keywords; among regex rules the first listed wins, and among keywords
+    the first (then longest) one in the text.
+    
+    Results are memoized in an LRU cache keyed by the description, since
+    bank exports repeat the same merchant strings, and every call updates
+    per-rule hit counts.
+    """
+    
+    def __init__(
+        self,
+        rules: Iterable = DEFAULT_RULES,
+        regex_rules: Iterable = DEFAULT_REGEX_RULES,
+        default: str = 'Other',
+        memo_size: int = 65536
+    ):
+        """
+        Compile the rules.
+        
+        Args:
+            rules: (category, keywords) pairs; earlier rules win on duplicate keywords
+            regex_rules: (category, pattern) pairs, matched case-insensitively
+            default: Category for descriptions no rule matches
+            memo_size: LRU memo entries (0 disables the memo)
+        """
+        self.default = default
+        self.keywords = {}
+        for category, keywords in rules:
+            for keyword in keywords:
+                self.keywords.setdefault(keyword.lower(), category)
+        self.regex_rules = list(regex_rules)
+        
+        self._keyword_pattern = None
+        if self.keywords:
+            self._keyword_pattern = re.compile(rf"(?<!\w){_trie_regex(self.keywords)}(?!\w)", re.IGNORECASE)
+        self._regexes = [re.compile(pattern, re.IGNORECASE) for _, pattern in self.regex_rules]
+        self._literal_rules = {}
+        self._unfiltered_rules = []
+        for i, (_, pattern) in enumerate(self.regex_rules):
+            literal = _required_literal(pattern)
+            if literal:
+                self._literal_rules.setdefault(literal, []).append(i)
+            else:
+                self._unfiltered_rules.append(i)
+        self._literal_pattern = None
+        if self._literal_rules:
+            # Lookahead so overlapping literals are all found
+            self._literal_pattern = re.compile(f"(?=({_trie_regex(self._literal_rules)}))")
+        
+        self._match = lru_cache(maxsize=memo_size)(self._match_uncached) if memo_size else self._match_uncached
+        self.reset_stats()
+    
+    def __len__(self) -> int:
+        return len(self.keywords) + len(self.regex_rules)
+    
+    def _match_uncached(self, description: str) -> tuple:
+        """Return (category, rule) for a description; rule is None when nothing matches."""
+        if self._regexes:
+            candidates = set(self._unfiltered_rules)
+            if self._literal_pattern is not None:
+                for found in self._literal_pattern.finditer(description.lower()):
+                    literal = found.group(1)
+                    # The trie finds the longest literal at each position; shorter ones may be its prefixes
+                    for end in range(3, len(literal) + 1):
+                        candidates.update(self._literal_rules.get(literal[:end], ()))
+            for i in sorted(candidates):
+                if self._regexes[i].search(description):
+                    return self.regex_rules[i]
+        if self._keyword_pattern is not None:
+            match = self._keyword_pattern.search(description)
+            if match:
+                keyword = match.group(0).lower()
+                return self.keywords[keyword], keyword
+        return self.default, None
+    
+    def match(self, description: str) -> tuple:
+        """
+        Categorize a description and report which rule decided it.
+        
+        Args:
+            description: Merchant or payee text
+        
+        Returns:
+            tuple: (category, rule keyword or pattern, or None for the default)
+        """
+        category, rule = self._match(description)
+        self.calls += 1
+        self.rule_hits[rule] += 1
+        self.category_hits[category] += 1
+        return category, rule
+    
+    def categorize(self, description: str) -> str:
+        """
+        Get the category of a transaction description.
+        
+        Args:
+            description: Merchant or payee text
+        
+        Returns:
+            str: Category of the deciding rule, or the default
+        """
+        return self.match(description)[0]
+    
+    def categorize_many(self, descriptions: Iterable[str]) -> list:
+        """
+        Categorize many descriptions.
+        
+        Args:
+            descriptions: Merchant or payee texts
+        
+        Returns:
+            list: Category per description, in order
+        """
+        return [self.match(description)[0] for description in descriptions]
+    
+    def reset_stats(self):
+        """Zero the call and rule hit counters (the memo is kept)."""
+        self.calls = 0
+        self.rule_hits = Counter()
+        self.category_hits = Counter()
+    
+    def stats(self, top: int = 20) -> dict:
+        """
+        Get matching statistics.
+        
+        Args:
+            top: Number of most-hit rules to list
+        
+        Returns:
+            dict: calls, matched/unmatched counts, results per category, the
+                most-hit rules and memo hit/miss counts
+        """
+        unmatched = self.rule_hits.get(None, 0)
+        stats = {
+            'rules': len(self),
+            'calls': self.calls,
+            'matched': self.calls - unmatched,
+            'unmatched': unmatched,
+            'by_category': dict(self.category_hits.most_common()),
+            'top_rules': [(rule, hits) for rule, hits in self.rule_hits.most_common() if rule is not None][:top]
+        }
+        if hasattr(self._match, 'cache_info'):
+            info = self._match.cache_info()
+            stats.update(memo_hits=info.hits, memo_misses=info.misses, memo_size=info.currsize)
+        return stats
@@ -0,0 +1,254 @@
+"""Plotly figure builders for the Analytics page, memoized on a hash of their input"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from utils.bootstrap import lazy_import
+from utils.projection import RISK_PROFILES, project
+
+# Deferred: only needed when a figure misses the cache
+go = lazy_import("plotly.graph_objects")
+
+SPENDING_COLORS = ['#10B981', '#3B82F6', '#F59E0B', '#EF4444', '#14B8A6', '#EC4899', '#6B7280', '#8B5CF6']
+OVERVIEW_COLORS = ['#10B981', '#3B82F6', '#8B5CF6', '#EF4444']
+
+
+def data_hash(data) -> str:
+    """
+    Hash JSON-serializable data independently of dict ordering.
+    
+    Args:
+        data: Dict, list or scalar
+    
+    Returns:
+        str: Hex digest
+    """
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class FigureCache:
+    """
+    Process-wide LRU cache of built figures keyed by (builder name, input hash).
+    
+    Building a figure validates every property, which costs far more than
+    a hash of the input, and Streamlit reruns the whole page on every
+    click. Cached figures are shared between sessions, so callers must
+    not modify them. Each entry remembers how long it took to build, so
+    hits can report the time they saved.
+    """
+    
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.build_seconds = 0.0
+        self.saved_seconds = 0.0
+    
+    def get(self, name: str, data, build: Callable):
+        """
+        Get a cached value, building it on a miss.
+        
+        Args:
+            name: Builder name; part of the key
+            data: JSON-serializable input passed to ``build``
+            build: Function of ``data`` returning the value
+        
+        Returns:
+            Whatever ``build`` returns
+        """
+        key = (name, data_hash(data))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += entry[1]
+                return entry[0]
+        
+        start = time.perf_counter()
+        value = build(data)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.misses += 1
+            self.build_seconds += elapsed
+            self._entries[key] = (value, elapsed)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+    
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+        
+        Returns:
+            dict: hits, misses, entries, seconds spent building and seconds saved by hits
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'build_seconds': self.build_seconds,
+                'saved_seconds': self.saved_seconds
+            }
+    
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+figure_cache = FigureCache()
+
+
+def _spending_donut(data: dict) -> "go.Figure":
+    fig = go.Figure(data=[go.Pie(
+        labels=list(data['spending'].keys()),
+        values=list(data['spending'].values()),
+        hole=.4,
+        marker=dict(colors=SPENDING_COLORS),
+        textinfo='label+percent',
+        textposition='outside'
+    )])
+    
+    fig.update_layout(
+        showlegend=True,
+        height=400,
+        margin=dict(t=0, b=0, l=0, r=0)
+    )
+    return fig
+
+
+def _overview_bar(data: dict) -> "go.Figure":
+    values = [
+        data['monthly_income'],
+        data['monthly_expenses'],
+        data['monthly_savings'],
+        data['total_debt']
+    ]
+    fig = go.Figure(data=[go.Bar(
+        x=['Income', 'Expenses', 'Savings', 'Debt'],
+        y=values,
+        marker=dict(color=OVERVIEW_COLORS),
+        text=values,
+        texttemplate='$%{text:,}',
+        textposition='outside'
+    )])
+    
+    fig.update_layout(
+        height=400,
+        margin=dict(t=20, b=0, l=0, r=0),
+        yaxis_title="Amount ($)",
+        showlegend=False
+    )
+    return fig
+
+
+def _projection(params: dict) -> tuple:
+    data = params['financial_data']
+    # Fixed seed so the chart doesn't jitter between reruns
+    result = project(
+        income=data['monthly_income'],
+        expenses=data['monthly_expenses'],
+        savings=params['savings'],
+        debt=data['total_debt'],
+        debt_payment=params['debt_payment'],
+        years=params['years'],
+        paths=5000,
+        assumptions=RISK_PROFILES[params['risk_profile']],
+        seed=42
+    )
+    bands = result.percentiles()
+    x_years = bands.index / 12
+    
+    fig = go.Figure()
+    for low, high, color in (("p5", "p95", "rgba(139, 92, 246, 0.15)"), ("p25", "p75", "rgba(139, 92, 246, 0.3)")):
+        fig.add_trace(go.Scatter(x=x_years, y=bands[high], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(
+            x=x_years,
+            y=bands[low],
+            mode='lines',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor=color,
+            name=f"{low[1:]}th–{high[1:]}th percentile"
+        ))
+    fig.add_trace(go.Scatter(x=x_years, y=bands['p50'], mode='lines+markers', line=dict(color='#8B5CF6', width=3), name="Median"))
+    
+    fig.update_layout(
+        height=400,
+        margin=dict(t=20, b=0, l=0, r=0),
+        xaxis_title="Years from now",
+        yaxis_title="Savings ($)",
+        hovermode='x unified'
+    )
+    summary = {
+        'median': float(bands['p50'].iloc[-1]),
+        'p5': float(bands['p5'].iloc[-1]),
+        'debt_free_month': result.debt_free_month()
+    }
+    return fig, summary
+
+
+def spending_donut(financial_data: dict) -> "go.Figure":
+    """
+    Get the spending breakdown donut chart.
+    
+    Args:
+        financial_data: Analytics page data
+    
+    Returns:
+        go.Figure: Cached figure; do not modify
+    """
+    return figure_cache.get("spending_donut", {'spending': financial_data['spending']}, _spending_donut)
+
+
+def overview_bar(financial_data: dict) -> "go.Figure":
+    """
+    Get the income/expenses/savings/debt bar chart.
+    
+    Args:
+        financial_data: Analytics page data
+    
+    Returns:
+        go.Figure: Cached figure; do not modify
+    """
+    return figure_cache.get("overview_bar", financial_data, _overview_bar)
+
+
+def projection_fan(financial_data: dict, years: int, savings: float, debt_payment: float, risk_profile: str) -> tuple:
+    """
+    Get the Monte Carlo projection fan chart and its headline numbers.
+    
+    The simulation runs only when the data or the inputs change.
+    
+    Args:
+        financial_data: Analytics page data
+        years: Projection horizon
+        savings: Current savings balance
+        debt_payment: Monthly debt payment
+        risk_profile: Key of RISK_PROFILES
+    
+    Returns:
+        tuple: (cached figure, {'median', 'p5', 'debt_free_month'})
+    """
+    params = {
+        'financial_data': financial_data,
+        'years': years,
+        'savings': savings,
+        'debt_payment': debt_payment,
+        'risk_profile': risk_profile
+    }
+    return figure_cache.get("projection_fan", params, _projection)
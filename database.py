@@ -1,16 +1,1163 @@
-"""Research topic storage using session state"""
+"""Research topic storage backends (session state or SQLite)"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
 import streamlit as st
+from collections.abc import Mapping
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+
+from utils.search_index import InvertedIndex
+from utils.topic_transfer import write_topics
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# In-memory topic content at least this long is kept zlib-compressed
+CONTENT_COMPRESS_MIN = 1024
+
+
+def _now() -> str:
+    """Current local time in the format stored on topics."""
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+
+@lru_cache(maxsize=4096)
+def _format_timestamp(stamp) -> str:
+    """Format an epoch timestamp as local time; strings pass through unchanged."""
+    if isinstance(stamp, str):
+        return stamp
+    return datetime.fromtimestamp(stamp).strftime(TIMESTAMP_FORMAT)
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value: str):
+    """
+    Convert a stored timestamp string to epoch seconds.
+    
+    Imported timestamps share a few values, hence the cache. Strings in
+    another format, or that would not format back identically (e.g. a
+    time skipped by a DST change), are kept as they are.
+    
+    Args:
+        value: Timestamp in ``TIMESTAMP_FORMAT``
+    
+    Returns:
+        int or str: Epoch seconds, or ``value`` if it can't round-trip
+    """
+    try:
+        stamp = int(datetime.strptime(value, TIMESTAMP_FORMAT).timestamp())
+    except (TypeError, ValueError):
+        return value
+    return stamp if _format_timestamp(stamp) == value else value
+
+
+def _pack_content(content: str, compress_over: int = None):
+    """Compress ``content`` when it is long enough and compression actually saves space."""
+    if compress_over is None or len(content) < compress_over:
+        return content
+    packed = zlib.compress(content.encode("utf-8"))
+    return packed if len(packed) < len(content) else content
+
+
+def normalize_tag(tag: str) -> str:
+    """
+    Normalize a tag for matching: case-folded, whitespace collapsed.
+    
+    Args:
+        tag: Tag as entered
+    
+    Returns:
+        str: Normalized tag key ("  Emergency   Fund" -> "emergency fund")
+    """
+    return " ".join(tag.split()).casefold()
+
+
+class StorageBackend:
+    """Interface implemented by research topic stores."""
+    
+    def initialize(self):
+        """Prepare the store for use. Safe to call on every rerun."""
+    
+    def add_topic(self, title: str, content: str, tags: list) -> dict:
+        """Store a new topic and return it."""
+        raise NotImplementedError
+    
+    def get_all_topics(self) -> list:
+        """Return all topics, oldest first."""
+        raise NotImplementedError
+    
+    def get_topic_by_id(self, topic_id: int) -> dict:
+        """Return the topic with this ID, or None."""
+        raise NotImplementedError
+    
+    def update_topic(self, topic_id: int, title: str = None, content: str = None, tags: list = None) -> bool:
+        """Apply the given changes; return True if the topic exists."""
+        raise NotImplementedError
+    
+    def delete_topic(self, topic_id: int) -> bool:
+        """Delete a topic; return True if it existed."""
+        raise NotImplementedError
+    
+    def search_index(self) -> InvertedIndex:
+        """Return the full-text index kept in step with this store."""
+        raise NotImplementedError
+    
+    def list_topics(self, after_id: int = None, limit: int = 20, order: str = "desc") -> list:
+        """Return up to ``limit`` topics past ``after_id`` in ID order ("asc" or "desc")."""
+        raise NotImplementedError
+    
+    def import_topics(self, records: list) -> int:
+        """Add a batch of normalized records in one write; return the number added."""
+        raise NotImplementedError
+    
+    def count_topics(self) -> int:
+        """Return the number of topics."""
+        raise NotImplementedError
+    
+    def topic_ids_by_tags(self, tags: list, match_all: bool = True) -> set:
+        """Return IDs of topics having all (or any) of the tags."""
+        raise NotImplementedError
+    
+    def tag_counts(self) -> dict:
+        """Return {tag label: number of topics}, most used first."""
+        raise NotImplementedError
+    
+    def search_ids(self, query: str, limit: int = None) -> list:
+        """Return IDs of topics matching a full-text query, best match first."""
+        return [doc_id for doc_id, _ in self.search_index().search(query, limit)]
+    
+    def search_topics(self, query: str, limit: int = None) -> list:
+        """Return topics matching a full-text query, best match first."""
+        return [
+            topic for topic in (self.get_topic_by_id(doc_id) for doc_id in self.search_ids(query, limit))
+            if topic is not None
+        ]
+
+
+class TopicRecord(Mapping):
+    """
+    Compact in-memory research topic.
+    
+    Fields live in ``__slots__`` instead of a per-topic dict. Timestamps
+    are epoch seconds, formatted only when read; tags are an interned
+    tuple, so repeated tags share one string; long content may be held
+    zlib-compressed. Reading it as a mapping gives the same keys and
+    values as the dicts the SQLite backend returns, so callers can keep
+    using ``topic['title']`` or ``topic.get('tags')``.
+    
+    Records are not changed once created; an update stores a new record
+    from ``replace``, so a topic someone already holds never changes.
+    """
+    
+    __slots__ = ('id', 'title', '_content', 'tags', 'created', 'updated')
+    
+    KEYS = ('id', 'title', 'content', 'tags', 'created_at', 'updated_at')
+    
+    def __init__(self, id: int, title: str, content: str, tags, created, updated, compress_over: int = None):
+        """
+        Initialize the record.
+        
+        Args:
+            id: Topic ID
+            title: Topic title
+            content: Topic content
+            tags: Iterable of tag strings
+            created: Creation time as epoch seconds (or a timestamp string)
+            updated: Last update time as epoch seconds (or a timestamp string)
+            compress_over: Compress content at least this long (None never compresses)
+        """
+        self.id = id
+        self.title = title
+        self._content = _pack_content(content, compress_over)
+        self.tags = tuple(sys.intern(str(tag)) for tag in tags)
+        self.created = created
+        self.updated = updated
+    
+    @classmethod
+    def from_dict(cls, topic: dict, compress_over: int = None) -> "TopicRecord":
+        """Build a record from a topic dict with string timestamps."""
+        return cls(
+            topic['id'],
+            topic['title'],
+            topic['content'],
+            topic['tags'],
+            _parse_timestamp(topic['created_at']),
+            _parse_timestamp(topic['updated_at']),
+            compress_over
+        )
+    
+    @property
+    def content(self) -> str:
+        if isinstance(self._content, bytes):
+            return zlib.decompress(self._content).decode("utf-8")
+        return self._content
+    
+    def replace(self, updated, title: str = None, content: str = None, tags: list = None,
+                compress_over: int = None) -> "TopicRecord":
+        """
+        Get a copy of this record with some fields changed.
+        
+        Args:
+            updated: New update time as epoch seconds
+            title: New title (None keeps the current one)
+            content: New content (None keeps the current one)
+            tags: New tags (None keeps the current ones)
+            compress_over: Compress new content at least this long (None never compresses)
+        
+        Returns:
+            TopicRecord: The changed copy
+        """
+        record = TopicRecord(
+            self.id,
+            title if title is not None else self.title,
+            "" if content is None else content,
+            self.tags if tags is None else tags,
+            self.created,
+            updated,
+            compress_over
+        )
+        if content is None:
+            record._content = self._content
+        return record
+    
+    @property
+    def created_at(self) -> str:
+        return _format_timestamp(self.created)
+    
+    @property
+    def updated_at(self) -> str:
+        return _format_timestamp(self.updated)
+    
+    def __getitem__(self, key: str):
+        if key == 'tags':
+            return list(self.tags)
+        if key in self.KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self.KEYS)
+    
+    def __len__(self) -> int:
+        return len(self.KEYS)
+    
+    def __repr__(self) -> str:
+        return f"TopicRecord(id={self.id!r}, title={self.title!r})"
+
+
+def _bisect(topics, topic_id: int) -> int:
+    """First position in ID-ordered ``topics`` whose live topic has an ID >= ``topic_id``."""
+    lo, hi = 0, len(topics)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        probe = mid
+        while probe < hi and topics[probe] is None:
+            probe += 1
+        if probe == hi:
+            hi = mid  # only tombstones in [mid, hi)
+        elif topics[probe].id < topic_id:
+            lo = probe + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _page(topics, after_id: int, limit: int, order: str) -> list:
+    """Keyset page over ID-ordered ``topics``, skipping ``None`` tombstones."""
+    if order not in ("asc", "desc"):
+        raise ValueError(f"order must be 'asc' or 'desc', not {order!r}")
+    page = []
+    if order == "asc":
+        position = _bisect(topics, after_id + 1) if after_id is not None else 0
+        step = 1
+    else:
+        position = _bisect(topics, after_id) - 1 if after_id is not None else len(topics) - 1
+        step = -1
+    while 0 <= position < len(topics) and len(page) < limit:
+        topic = topics[position]
+        if topic is not None:
+            page.append(topic)
+        position += step
+    return page
+
+
+class TopicStore:
+    """
+    In-memory topic store with O(1) lookup by ID.
+    
+    Topics are kept in an append-only list in ID order, so iteration is
+    oldest-first (reverse it for newest-first). A dict maps each ID to its
+    list position. Deleting leaves a ``None`` tombstone instead of shifting
+    the list; once tombstones outnumber live topics the list is compacted,
+    which keeps deletion O(1) amortized. IDs come from a monotonic counter
+    and are never reused.
+    
+    A tag index maps each normalized tag to the IDs carrying it, so tag
+    filters and facet counts never scan the topics.
+    
+    Topics are stored as ``TopicRecord`` objects, which read like dicts.
+    """
+    
+    # Compact only past this many tombstones, so small stores don't churn
+    MIN_COMPACT_TOMBSTONES = 64
+    
+    def __init__(self, topics: list = None, compress_over: int = CONTENT_COMPRESS_MIN):
+        """
+        Initialize the store.
+        
+        Args:
+            topics: Existing topic dicts or records to load, in ID order
+            compress_over: Compress content at least this long (None never compresses)
+        """
+        self.compress_over = compress_over
+        self.topics = []
+        self.positions = {}
+        self.tombstones = 0
+        self.next_id = 1
+        self.search_index = InvertedIndex()
+        self.tag_index = {}
+        self.tag_labels = {}
+        for topic in topics or []:
+            self._append(topic)
+    
+    def __len__(self) -> int:
+        return len(self.positions)
+    
+    def _append(self, topic):
+        if not isinstance(topic, TopicRecord):
+            topic = TopicRecord.from_dict(topic, self.compress_over)
+        self.positions[topic.id] = len(self.topics)
+        self.topics.append(topic)
+        self.next_id = max(self.next_id, topic.id + 1)
+        self.search_index.add(topic.id, topic.title, topic.content, topic.tags)
+        self._index_tags(topic.id, topic.tags)
+    
+    def _index_tags(self, topic_id: int, tags: list):
+        for tag in tags:
+            key = normalize_tag(tag)
+            if not key:
+                continue
+            if key not in self.tag_index:
+                self.tag_index[key] = set()
+                self.tag_labels[key] = " ".join(tag.split())
+            self.tag_index[key].add(topic_id)
+    
+    def _unindex_tags(self, topic_id: int, tags: list):
+        for tag in tags:
+            key = normalize_tag(tag)
+            ids = self.tag_index.get(key)
+            if ids is None:
+                continue
+            ids.discard(topic_id)
+            if not ids:
+                del self.tag_index[key]
+                del self.tag_labels[key]
+    
+    def add(self, title: str, content: str, tags: list) -> TopicRecord:
+        """Create a topic with the next ID and return it."""
+        now = int(time.time())
+        topic = TopicRecord(self.next_id, title, content, tags, now, now, self.compress_over)
+        self.positions[topic.id] = len(self.topics)
+        self.topics.append(topic)
+        self.next_id += 1
+        self.search_index.add(topic.id, title, content, topic.tags)
+        self._index_tags(topic.id, topic.tags)
+        return topic
+    
+    def get(self, topic_id: int) -> TopicRecord:
+        """Return the topic with this ID, or None."""
+        position = self.positions.get(topic_id)
+        return None if position is None else self.topics[position]
+    
+    def add_many(self, records: list) -> list:
+        """
+        Add a batch of topics, full-text indexing them once the batch is stored.
+        
+        Args:
+            records: Dicts with title, content, tags, created_at and updated_at
+        
+        Returns:
+            list: The new topics
+        """
+        added = []
+        for record in records:
+            topic = TopicRecord(
+                self.next_id,
+                record['title'],
+                record['content'],
+                record['tags'],
+                _parse_timestamp(record['created_at']),
+                _parse_timestamp(record['updated_at']),
+                self.compress_over
+            )
+            self.positions[topic.id] = len(self.topics)
+            self.topics.append(topic)
+            self.next_id += 1
+            self._index_tags(topic.id, topic.tags)
+            added.append(topic)
+        for topic, record in zip(added, records):
+            self.search_index.add(topic.id, topic.title, record['content'], topic.tags)
+        return added
+    
+    def update(self, topic_id: int, title: str = None, content: str = None, tags: list = None) -> bool:
+        """Apply the given changes; return True if the topic exists."""
+        position = self.positions.get(topic_id)
+        if position is None:
+            return False
+        old = self.topics[position]
+        topic = old.replace(int(time.time()), title or None, content or None, tags, self.compress_over)
+        self.topics[position] = topic
+        if tags is not None:
+            self._unindex_tags(topic_id, old.tags)
+            self._index_tags(topic_id, topic.tags)
+        self.search_index.add(topic_id, topic.title, content or topic.content, topic.tags)
+        return True
+    
+    def delete(self, topic_id: int) -> bool:
+        """Tombstone a topic; return True if it existed."""
+        position = self.positions.pop(topic_id, None)
+        if position is None:
+            return False
+        self._unindex_tags(topic_id, self.topics[position].tags)
+        self.topics[position] = None
+        self.tombstones += 1
+        self.search_index.remove(topic_id)
+        if self.tombstones > self.MIN_COMPACT_TOMBSTONES and self.tombstones > len(self.positions):
+            self.compact()
+        return True
+    
+    def compact(self):
+        """Drop tombstones and renumber list positions."""
+        self.topics = [t for t in self.topics if t is not None]
+        self.positions = {t.id: i for i, t in enumerate(self.topics)}
+        self.tombstones = 0
+    
+    def all(self) -> list:
+        """Return live topics, oldest first."""
+        if not self.tombstones:
+            return list(self.topics)
+        return [t for t in self.topics if t is not None]
+    
+    def page(self, after_id: int = None, limit: int = 20, order: str = "desc") -> list:
+        """
+        Get one page of topics by keyset: the topics just past ``after_id``.
+        
+        The start position is found by binary search over the ID-ordered
+        list, so any page costs O(log n + limit) however deep it is.
+        
+        Args:
+            after_id: ID of the last topic on the previous page (None for the first page)
+            limit: Maximum topics to return
+            order: "desc" for newest first, "asc" for oldest first
+        
+        Returns:
+            list: Topics in the requested order
+        """
+        return _page(self.topics, after_id, limit, order)
+    
+    def ids_by_tags(self, tags: list, match_all: bool = True) -> set:
+        """
+        Get IDs of topics carrying the given tags.
+        
+        Args:
+            tags: Tags to match (normalized before lookup)
+            match_all: Require every tag (intersection) instead of any (union)
+        
+        Returns:
+            set: Matching topic IDs
+        """
+        id_sets = [self.tag_index.get(normalize_tag(tag), set()) for tag in tags]
+        if not id_sets:
+            return set()
+        if match_all:
+            # Intersect starting from the rarest tag
+            id_sets.sort(key=len)
+            return set(id_sets[0]).intersection(*id_sets[1:])
+        return set().union(*id_sets)
+    
+    def tag_counts(self) -> dict:
+        """Return {tag label: number of topics}, most used first."""
+        ordered = sorted(self.tag_index.items(), key=lambda item: (-len(item[1]), item[0]))
+        return {self.tag_labels[key]: len(ids) for key, ids in ordered}
+    
+    def iter_newest_first(self):
+        """Yield live topics from newest to oldest without copying the list."""
+        for topic in reversed(self.topics):
+            if topic is not None:
+                yield topic
+
+
+class SessionStateStorage(StorageBackend):
+    """Topics kept in Streamlit session state; private to one browser session."""
+    
+    def initialize(self):
+        """Initialize the research topic store in session state if it doesn't exist."""
+        if 'research_store' not in st.session_state:
+            # Carry over topics saved by earlier versions as a plain list
+            legacy = st.session_state.get('research_topics', [])
+            st.session_state.research_store = TopicStore(sorted(legacy, key=lambda t: t['id']))
+    
+    def _store(self) -> TopicStore:
+        self.initialize()
+        return st.session_state.research_store
+    
+    def search_index(self) -> InvertedIndex:
+        return self._store().search_index
+    
+    def add_topic(self, title: str, content: str, tags: list) -> dict:
+        return self._store().add(title, content, tags)
+    
+    def get_all_topics(self) -> list:
+        return self._store().all()
+    
+    def get_topic_by_id(self, topic_id: int) -> dict:
+        return self._store().get(topic_id)
+    
+    def update_topic(self, topic_id: int, title: str = None, content: str = None, tags: list = None) -> bool:
+        return self._store().update(topic_id, title=title, content=content, tags=tags)
+    
+    def delete_topic(self, topic_id: int) -> bool:
+        return self._store().delete(topic_id)
+    
+    def list_topics(self, after_id: int = None, limit: int = 20, order: str = "desc") -> list:
+        return self._store().page(after_id, limit, order)
+    
+    def import_topics(self, records: list) -> int:
+        return len(self._store().add_many(records))
+    
+    def count_topics(self) -> int:
+        return len(self._store())
+    
+    def topic_ids_by_tags(self, tags: list, match_all: bool = True) -> set:
+        return self._store().ids_by_tags(tags, match_all)
+    
+    def tag_counts(self) -> dict:
+        return self._store().tag_counts()
+
+
+class ReadWriteLock:
+    """
+    Lock admitting many readers or one writer.
+    
+    Waiting writers hold back new readers, so a steady stream of reads
+    cannot starve a write. Not reentrant: don't take it while holding it.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+    
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+# Topics per chunk of a TopicSnapshot
+SNAPSHOT_CHUNK = 1024
+
+
+class _ChunkedTopics:
+    """Read-only sequence over a tuple of equal-size tuple chunks."""
+    
+    __slots__ = ('chunks', 'length')
+    
+    def __init__(self, chunks: tuple, length: int):
+        self.chunks = chunks
+        self.length = length
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def __getitem__(self, position: int):
+        if not 0 <= position < self.length:
+            raise IndexError(position)
+        return self.chunks[position // SNAPSHOT_CHUNK][position % SNAPSHOT_CHUNK]
+
+
+class TopicSnapshot:
+    """
+    Immutable view of a TopicStore's topics at one moment.
+    
+    The store's ID-ordered list (tombstones included) is held as a tuple
+    of ``SNAPSHOT_CHUNK``-sized tuples. The snapshot after a write shares
+    every chunk the write left alone and copies only the ones it touched,
+    so publishing costs O(n / SNAPSHOT_CHUNK + SNAPSHOT_CHUNK) instead of
+    copying the whole list. Records are never changed in place, so the
+    view stays consistent however the store changes afterwards.
+    """
+    
+    def __init__(self, topics: _ChunkedTopics = None, count: int = 0):
+        self.topics = topics or _ChunkedTopics((), 0)
+        self.count = count
+    
+    @staticmethod
+    def of(store: TopicStore) -> "TopicSnapshot":
+        """Snapshot a whole store, copying every chunk."""
+        topics = store.topics
+        chunks = tuple(tuple(topics[i:i + SNAPSHOT_CHUNK]) for i in range(0, len(topics), SNAPSHOT_CHUNK))
+        return TopicSnapshot(_ChunkedTopics(chunks, len(topics)), len(store))
+    
+    def advance(self, store: TopicStore, position: int = None) -> "TopicSnapshot":
+        """
+        Snapshot the store after a write, copying only the chunks it changed.
+        
+        Args:
+            store: The store this snapshot was taken from, after the write
+            position: List position the write replaced or tombstoned, if any;
+                topics appended past this snapshot are always picked up
+        
+        Returns:
+            TopicSnapshot: Snapshot of the store as it is now
+        """
+        topics = store.topics
+        if len(topics) < len(self.topics):
+            # Only compaction shrinks the list, and it moves every position
+            return TopicSnapshot.of(store)
+        chunks = list(self.topics.chunks)
+        dirty = set(range(len(self.topics) // SNAPSHOT_CHUNK, -(-len(topics) // SNAPSHOT_CHUNK)))
+        if position is not None:
+            dirty.add(position // SNAPSHOT_CHUNK)
+        for index in sorted(dirty):
+            chunk = tuple(topics[index * SNAPSHOT_CHUNK:(index + 1) * SNAPSHOT_CHUNK])
+            if index < len(chunks):
+                chunks[index] = chunk
+            else:
+                chunks.append(chunk)
+        return TopicSnapshot(_ChunkedTopics(tuple(chunks), len(topics)), len(store))
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def get(self, topic_id: int) -> TopicRecord:
+        """Return the topic with this ID, or None."""
+        topics = self.topics
+        position = _bisect(topics, topic_id)
+        while position < len(topics) and topics[position] is None:
+            position += 1
+        if position < len(topics) and topics[position].id == topic_id:
+            return topics[position]
+        return None
+    
+    def all(self) -> list:
+        """Return live topics, oldest first."""
+        return [t for chunk in self.topics.chunks for t in chunk if t is not None]
+    
+    def page(self, after_id: int = None, limit: int = 20, order: str = "desc") -> list:
+        """Get one keyset page of topics, as ``TopicStore.page``."""
+        return _page(self.topics, after_id, limit, order)
+
+
+class SharedTopicStore:
+    """
+    A TopicStore shared between sessions, with copy-on-write snapshots.
+    
+    Writers take the write lock, change the store and publish a new
+    ``snapshot`` before releasing it. Listing, paging and lookups read the
+    latest snapshot without locking, so a rerun never waits for a write.
+    Search and tag queries need the live indexes and hold the read lock,
+    which only waits while a write is being applied.
+    """
+    
+    def __init__(self):
+        self.lock = ReadWriteLock()
+        self.store = TopicStore()
+        self.snapshot = TopicSnapshot.of(self.store)
+    
+    @contextmanager
+    def writing(self, topic_id: int = None):
+        """
+        Hold the write lock around changes to the yielded store, then publish a snapshot.
+        
+        Args:
+            topic_id: Existing topic the write replaces or deletes, if any
+                (appended topics need no hint)
+        """
+        with self.lock.write():
+            position = self.store.positions.get(topic_id) if topic_id is not None else None
+            try:
+                yield self.store
+            finally:
+                self.snapshot = self.snapshot.advance(self.store, position)
+    
+    @contextmanager
+    def reading(self):
+        """Hold the read lock around queries on the yielded store's indexes."""
+        with self.lock.read():
+            yield self.store
+
+
+class SharedStoreRegistry:
+    """Shared topic stores by namespace, created on first use."""
+    
+    def __init__(self):
+        self._stores = {}
+        self._lock = threading.Lock()
+    
+    def get(self, namespace: str) -> SharedTopicStore:
+        """Return the store for a namespace, creating it if needed."""
+        store = self._stores.get(namespace)
+        if store is None:
+            with self._lock:
+                store = self._stores.get(namespace)
+                if store is None:
+                    store = self._stores[namespace] = SharedTopicStore()
+        return store
+    
+    def namespaces(self) -> list:
+        """Return the names of existing namespaces, sorted."""
+        return sorted(self._stores)
+
+
+@st.cache_resource
+def shared_stores() -> SharedStoreRegistry:
+    """Get the namespace registry shared by every session in this server process."""
+    return SharedStoreRegistry()
+
+
+class SharedMemoryStorage(StorageBackend):
+    """
+    Topics kept in server memory and shared by every session.
+    
+    Each session works in a namespace, ``team`` unless it sets
+    ``st.session_state.research_namespace``, so a team shares one copy of
+    its research instead of each session holding its own. Namespaces
+    separate work; they are not access control.
+    """
+    
+    DEFAULT_NAMESPACE = "team"
+    
+    def __init__(self, registry: SharedStoreRegistry = None, namespace: str = None):
+        """
+        Initialize the backend.
+        
+        Args:
+            registry: Stores by namespace (the process-wide registry by default)
+            namespace: Use this namespace for every session instead of session state
+        """
+        self.registry = registry
+        self.namespace = namespace
+    
+    def initialize(self):
+        """Initialize the session's namespace if it doesn't exist."""
+        if self.namespace is None and 'research_namespace' not in st.session_state:
+            st.session_state.research_namespace = self.DEFAULT_NAMESPACE
+    
+    def _shared(self) -> SharedTopicStore:
+        namespace = self.namespace
+        if namespace is None:
+            self.initialize()
+            namespace = st.session_state.research_namespace or self.DEFAULT_NAMESPACE
+        return (self.registry or shared_stores()).get(namespace)
+    
+    def search_index(self) -> InvertedIndex:
+        # Callers must hold the namespace's read lock while searching it
+        return self._shared().store.search_index
+    
+    def search_ids(self, query: str, limit: int = None) -> list:
+        with self._shared().reading() as store:
+            return [doc_id for doc_id, _ in store.search_index.search(query, limit)]
+    
+    def search_topics(self, query: str, limit: int = None) -> list:
+        with self._shared().reading() as store:
+            return [
+                topic for topic in (store.get(doc_id) for doc_id, _ in store.search_index.search(query, limit))
+                if topic is not None
+            ]
+    
+    def add_topic(self, title: str, content: str, tags: list) -> dict:
+        with self._shared().writing() as store:
+            return store.add(title, content, tags)
+    
+    def get_all_topics(self) -> list:
+        return self._shared().snapshot.all()
+    
+    def get_topic_by_id(self, topic_id: int) -> dict:
+        return self._shared().snapshot.get(topic_id)
+    
+    def update_topic(self, topic_id: int, title: str = None, content: str = None, tags: list = None) -> bool:
+        with self._shared().writing(topic_id) as store:
+            return store.update(topic_id, title=title, content=content, tags=tags)
+    
+    def delete_topic(self, topic_id: int) -> bool:
+        with self._shared().writing(topic_id) as store:
+            return store.delete(topic_id)
+    
+    def list_topics(self, after_id: int = None, limit: int = 20, order: str = "desc") -> list:
+        return self._shared().snapshot.page(after_id, limit, order)
+    
+    def import_topics(self, records: list) -> int:
+        with self._shared().writing() as store:
+            return len(store.add_many(records))
+    
+    def count_topics(self) -> int:
+        return len(self._shared().snapshot)
+    
+    def topic_ids_by_tags(self, tags: list, match_all: bool = True) -> set:
+        with self._shared().reading() as store:
+            return store.ids_by_tags(tags, match_all)
+    
+    def tag_counts(self) -> dict:
+        with self._shared().reading() as store:
+            return store.tag_counts()
+
+
+class _ConnectionPool:
+    """
+    Per-thread SQLite connections to one database file.
+    
+    Streamlit runs each session in its own thread; giving every thread its
+    own connection avoids sharing a connection across threads while WAL
+    mode lets readers proceed alongside the single writer.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+    
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # cached_statements keeps the compiled form of each SQL string below
+            conn = sqlite3.connect(self.path, timeout=30, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _get_pool(path: str) -> _ConnectionPool:
+    """Return the process-wide connection pool for a database file."""
+    path = os.path.abspath(path) if path != ":memory:" else path
+    with _pools_lock:
+        if path not in _pools:
+            _pools[path] = _ConnectionPool(path)
+        return _pools[path]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS topic_tags (
+    topic_id INTEGER NOT NULL REFERENCES topics(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    tag_key TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (topic_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_topics_created_at ON topics (created_at);
+CREATE INDEX IF NOT EXISTS idx_topic_tags_tag ON topic_tags (tag);
+"""
+
+# Databases created before tag_key existed get the column added and filled in
+_MIGRATE_TAG_KEY = "ALTER TABLE topic_tags ADD COLUMN tag_key TEXT NOT NULL DEFAULT ''"
+_INDEX_TAG_KEY = "CREATE INDEX IF NOT EXISTS idx_topic_tags_tag_key ON topic_tags (tag_key, topic_id)"
+
+_INSERT_TOPIC = "INSERT INTO topics (title, content, created_at, updated_at) VALUES (?, ?, ?, ?)"
+_INSERT_TAG = "INSERT INTO topic_tags (topic_id, position, tag, tag_key) VALUES (?, ?, ?, ?)"
+_SELECT_TOPIC = "SELECT id, title, content, created_at, updated_at FROM topics WHERE id = ?"
+_SELECT_TOPICS = "SELECT id, title, content, created_at, updated_at FROM topics ORDER BY id"
+_SELECT_TAGS = "SELECT tag FROM topic_tags WHERE topic_id = ? ORDER BY position"
+_SELECT_ALL_TAGS = "SELECT topic_id, tag FROM topic_tags ORDER BY topic_id, position"
+_PAGE_TOPICS = {
+    ("asc", False): "SELECT id, title, content, created_at, updated_at FROM topics ORDER BY id LIMIT ?",
+    ("asc", True): "SELECT id, title, content, created_at, updated_at FROM topics WHERE id > ? ORDER BY id LIMIT ?",
+    ("desc", False): "SELECT id, title, content, created_at, updated_at FROM topics ORDER BY id DESC LIMIT ?",
+    ("desc", True): "SELECT id, title, content, created_at, updated_at FROM topics WHERE id < ? ORDER BY id DESC LIMIT ?"
+}
+_COUNT_TOPICS = "SELECT COUNT(*) FROM topics"
+_UPDATE_TOPIC = (
+    "UPDATE topics SET title = COALESCE(?, title), content = COALESCE(?, content), "
+    "updated_at = ? WHERE id = ?"
+)
+_DELETE_TAGS = "DELETE FROM topic_tags WHERE topic_id = ?"
+_DELETE_TOPIC = "DELETE FROM topics WHERE id = ?"
+_TAG_COUNTS = (
+    "SELECT tag_key, MIN(tag), COUNT(DISTINCT topic_id) FROM topic_tags WHERE tag_key != '' "
+    "GROUP BY tag_key ORDER BY 3 DESC, 1"
+)
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Topics persisted in a SQLite database (WAL mode).
+    
+    Survives restarts and is shared by every session of the process.
+    Connections come from one pool per database file per process.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the storage.
+        
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._pool = _get_pool(path)
+        self._schema_ready = False
+        self._index_key = os.path.abspath(path)
+    
+    def _conn(self) -> sqlite3.Connection:
+        conn = self._pool.connection()
+        if not self._schema_ready:
+            conn.executescript(_SCHEMA)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(topic_tags)")]
+            if 'tag_key' not in columns:
+                with conn:
+                    conn.execute(_MIGRATE_TAG_KEY)
+                    rows = conn.execute("SELECT rowid, tag FROM topic_tags").fetchall()
+                    conn.executemany(
+                        "UPDATE topic_tags SET tag_key = ? WHERE rowid = ?",
+                        [(normalize_tag(tag), rowid) for rowid, tag in rows]
+                    )
+            conn.execute(_INDEX_TAG_KEY)
+            self._schema_ready = True
+        return conn
+    
+    @staticmethod
+    def _tag_rows(topic_id: int, tags: list) -> list:
+        return [(topic_id, i, tag, normalize_tag(tag)) for i, tag in enumerate(tags)]
+    
+    @staticmethod
+    def _to_topic(row: tuple, tags: list) -> dict:
+        return {
+            'id': row[0],
+            'title': row[1],
+            'content': row[2],
+            'tags': tags,
+            'created_at': row[3],
+            'updated_at': row[4]
+        }
+    
+    def initialize(self):
+        self._conn()
+    
+    def search_index(self) -> InvertedIndex:
+        """
+        Return the process-wide index for this database, building it on first use.
+        
+        The index follows writes made through this process; topics written
+        by another process appear after a restart.
+        """
+        with _indexes_lock:
+            index = _indexes.get(self._index_key)
+            if index is None:
+                index = InvertedIndex()
+                for topic in self.get_all_topics():
+                    index.add(topic['id'], topic['title'], topic['content'], topic['tags'])
+                _indexes[self._index_key] = index
+            return index
+    
+    def _reindex(self, topic_id: int):
+        """Refresh one topic in the search index if the index has been built."""
+        with _indexes_lock:
+            index = _indexes.get(self._index_key)
+            if index is None:
+                return
+            topic = self.get_topic_by_id(topic_id)
+            if topic is None:
+                index.remove(topic_id)
+            else:
+                index.add(topic_id, topic['title'], topic['content'], topic['tags'])
+    
+    def search_topics(self, query: str, limit: int = None) -> list:
+        index = self.search_index()
+        with _indexes_lock:
+            ranked = index.search(query, limit)
+        return [t for t in (self.get_topic_by_id(doc_id) for doc_id, _ in ranked) if t is not None]
+    
+    def add_topic(self, title: str, content: str, tags: list) -> dict:
+        conn = self._conn()
+        now = _now()
+        with conn:
+            cursor = conn.execute(_INSERT_TOPIC, (title, content, now, now))
+            topic_id = cursor.lastrowid
+            conn.executemany(_INSERT_TAG, self._tag_rows(topic_id, tags))
+        self._reindex(topic_id)
+        return self._to_topic((topic_id, title, content, now, now), list(tags))
+    
+    def get_all_topics(self) -> list:
+        conn = self._conn()
+        tags = {}
+        for topic_id, tag in conn.execute(_SELECT_ALL_TAGS):
+            tags.setdefault(topic_id, []).append(tag)
+        return [self._to_topic(row, tags.get(row[0], [])) for row in conn.execute(_SELECT_TOPICS)]
+    
+    def list_topics(self, after_id: int = None, limit: int = 20, order: str = "desc") -> list:
+        if order not in ("asc", "desc"):
+            raise ValueError(f"order must be 'asc' or 'desc', not {order!r}")
+        conn = self._conn()
+        params = (limit,) if after_id is None else (after_id, limit)
+        rows = conn.execute(_PAGE_TOPICS[(order, after_id is not None)], params).fetchall()
+        if not rows:
+            return []
+        ids = [row[0] for row in rows]
+        tags = {}
+        sql = (
+            f"SELECT topic_id, tag FROM topic_tags WHERE topic_id IN ({', '.join('?' * len(ids))}) "
+            "ORDER BY topic_id, position"
+        )
+        for topic_id, tag in conn.execute(sql, ids):
+            tags.setdefault(topic_id, []).append(tag)
+        return [self._to_topic(row, tags.get(row[0], [])) for row in rows]
+    
+    def count_topics(self) -> int:
+        return self._conn().execute(_COUNT_TOPICS).fetchone()[0]
+    
+    def import_topics(self, records: list) -> int:
+        """Insert a batch in one transaction, then update the search index once."""
+        conn = self._conn()
+        topics = []
+        tag_rows = []
+        with conn:
+            for record in records:
+                cursor = conn.execute(
+                    _INSERT_TOPIC,
+                    (record['title'], record['content'], record['created_at'], record['updated_at'])
+                )
+                topic_id = cursor.lastrowid
+                tag_rows.extend(self._tag_rows(topic_id, record['tags']))
+                topics.append((topic_id, record))
+            conn.executemany(_INSERT_TAG, tag_rows)
+        with _indexes_lock:
+            index = _indexes.get(self._index_key)
+            if index is not None:
+                for topic_id, record in topics:
+                    index.add(topic_id, record['title'], record['content'], record['tags'])
+        return len(topics)
+    
+    def get_topic_by_id(self, topic_id: int) -> dict:
+        conn = self._conn()
+        row = conn.execute(_SELECT_TOPIC, (topic_id,)).fetchone()
+        if row is None:
+            return None
+        return self._to_topic(row, [r[0] for r in conn.execute(_SELECT_TAGS, (topic_id,))])
+    
+    def update_topic(self, topic_id: int, title: str = None, content: str = None, tags: list = None) -> bool:
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute(_UPDATE_TOPIC, (title or None, content or None, _now(), topic_id))
+            if cursor.rowcount == 0:
+                return False
+            if tags is not None:
+                conn.execute(_DELETE_TAGS, (topic_id,))
+                conn.executemany(_INSERT_TAG, self._tag_rows(topic_id, tags))
+        self._reindex(topic_id)
+        return True
+    
+    def delete_topic(self, topic_id: int) -> bool:
+        conn = self._conn()
+        with conn:
+            conn.execute(_DELETE_TAGS, (topic_id,))
+            cursor = conn.execute(_DELETE_TOPIC, (topic_id,))
+        self._reindex(topic_id)
+        return cursor.rowcount > 0
+    
+    def topic_ids_by_tags(self, tags: list, match_all: bool = True) -> set:
+        keys = sorted({normalize_tag(tag) for tag in tags} - {''})
+        if not keys:
+            return set()
+        placeholders = ", ".join("?" * len(keys))
+        sql = f"SELECT topic_id FROM topic_tags WHERE tag_key IN ({placeholders}) GROUP BY topic_id"
+        if match_all:
+            sql += " HAVING COUNT(DISTINCT tag_key) = ?"
+            keys.append(len(keys))
+        return {row[0] for row in self._conn().execute(sql, keys)}
+    
+    def tag_counts(self) -> dict:
+        return {" ".join(label.split()): count for _, label, count in self._conn().execute(_TAG_COUNTS)}
 
 
 class ResearchDatabase:
-    """Manage research topics stored in Streamlit session state."""
+    """
+    Manage research topics.
+    
+    Topics live in Streamlit session state by default. Set the
+    RESEARCH_DB_PATH environment variable, or call ``configure``, to use
+    the persistent SQLite store instead, or set RESEARCH_STORE=shared to
+    share one in-memory store between all sessions of the server.
+    """
+    
+    _backend = None
+    
+    @staticmethod
+    def configure(backend: StorageBackend):
+        """
+        Select the storage backend used by every ResearchDatabase call.
+        
+        Args:
+            backend: Storage backend instance
+        """
+        ResearchDatabase._backend = backend
+    
+    @staticmethod
+    def get_backend() -> StorageBackend:
+        """
+        Get the active storage backend, choosing the default on first use.
+        
+        Returns:
+            StorageBackend: SQLite if RESEARCH_DB_PATH is set, the shared store if
+                RESEARCH_STORE is "shared", session state otherwise
+        """
+        if ResearchDatabase._backend is None:
+            path = os.environ.get('RESEARCH_DB_PATH')
+            if path:
+                ResearchDatabase._backend = SQLiteStorage(path)
+            elif os.environ.get('RESEARCH_STORE') == "shared":
+                ResearchDatabase._backend = SharedMemoryStorage()
+            else:
+                ResearchDatabase._backend = SessionStateStorage()
+        return ResearchDatabase._backend
     
     @staticmethod
     def initialize():
-        """Initialize research topics list in session state if it doesn't exist."""
-        if 'research_topics' not in st.session_state:
-            st.session_state.research_topics = []
+        """Initialize the research topic store if it doesn't exist."""
+        ResearchDatabase.get_backend().initialize()
     
     @staticmethod
     def add_topic(title: str, content: str, tags: list = None) -> bool:
@@ -21,7 +1168,7 @@ class ResearchDatabase:
             title: Topic title
             content: Topic content/notes
             tags: List of tags (optional)
-            
+        
         Returns:
             bool: True if topic was added successfully
         """
@@ -30,15 +1177,7 @@ class ResearchDatabase:
         if not title or not content:
             return False
         
-        topic = {
-            'id': len(st.session_state.research_topics) + 1,
-            'title': title.strip(),
-            'content': content.strip(),
-            'tags': tags or [],
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        st.session_state.research_topics.append(topic)
+        ResearchDatabase.get_backend().add_topic(title.strip(), content.strip(), tags or [])
         return True
     
     @staticmethod
@@ -47,10 +1186,150 @@ class ResearchDatabase:
         Get all research topics.
         
         Returns:
-            list: All research topics stored in session state
+            list: All research topics, oldest first
+        """
+        ResearchDatabase.initialize()
+        return ResearchDatabase.get_backend().get_all_topics()
+    
+    @staticmethod
+    def list_topics(
+        after_id: int = None,
+        limit: int = 20,
+        order: str = "desc",
+        tags: list = None,
+        match_all: bool = True
+    ) -> list:
+        """
+        Get one page of topics using keyset pagination.
+        
+        Pass the ID of the last topic on the current page as ``after_id``
+        to get the next one. Unlike offsets, the cursor stays correct when
+        topics are added or deleted between page loads, and deep pages cost
+        no more than the first.
+        
+        Args:
+            after_id: ID of the last topic already shown (None for the first page)
+            limit: Maximum topics to return
+            order: "desc" for newest first, "asc" for oldest first
+            tags: Only include topics with these tags (optional)
+            match_all: With ``tags``, require every tag (True) or any (False)
+        
+        Returns:
+            list: Up to ``limit`` topics in the requested order
+        """
+        ResearchDatabase.initialize()
+        backend = ResearchDatabase.get_backend()
+        if not tags:
+            return backend.list_topics(after_id, limit, order)
+        
+        if order not in ("asc", "desc"):
+            raise ValueError(f"order must be 'asc' or 'desc', not {order!r}")
+        ids = sorted(backend.topic_ids_by_tags(tags, match_all), reverse=order == "desc")
+        if after_id is not None:
+            ids = [i for i in ids if (i > after_id if order == "asc" else i < after_id)]
+        page = []
+        for topic_id in ids:
+            topic = backend.get_topic_by_id(topic_id)
+            if topic is not None:
+                page.append(topic)
+                if len(page) == limit:
+                    break
+        return page
+    
+    @staticmethod
+    def _import_record(record: dict, now: str) -> dict:
+        """Normalize an imported record, or return None if it lacks a title or content."""
+        title = (record.get('title') or "").strip()
+        content = (record.get('content') or "").strip()
+        if not title or not content:
+            return None
+        tags = record.get('tags') or []
+        if isinstance(tags, str):
+            tags = [tag.strip() for tag in tags.split(",") if tag.strip()]
+        created_at = record.get('created_at') or now
+        return {
+            'title': title,
+            'content': content,
+            'tags': [str(tag) for tag in tags],
+            'created_at': str(created_at),
+            'updated_at': str(record.get('updated_at') or created_at)
+        }
+    
+    @staticmethod
+    def bulk_import(records, batch_size: int = 1000) -> int:
+        """
+        Add many topics from any iterable of dicts, e.g. a streamed file.
+        
+        Records are consumed ``batch_size`` at a time, so memory stays flat
+        however long the input is. Each batch is written in one transaction
+        and the search index is updated once per batch. Topics get new IDs;
+        timestamps are kept when present. Records without a title or
+        content are skipped, as in ``add_topic``.
+        
+        Args:
+            records: Iterable of dicts with title, content and optional tags,
+                created_at and updated_at (tags may be a list or comma-separated)
+            batch_size: Topics per transaction
+        
+        Returns:
+            int: Number of topics imported
         """
         ResearchDatabase.initialize()
-        return st.session_state.research_topics
+        backend = ResearchDatabase.get_backend()
+        now = _now()
+        normalized = (ResearchDatabase._import_record(r, now) for r in records)
+        valid = (r for r in normalized if r is not None)
+        imported = 0
+        while True:
+            batch = list(islice(valid, batch_size))
+            if not batch:
+                return imported
+            imported += backend.import_topics(batch)
+    
+    @staticmethod
+    def iter_topics(batch_size: int = 1000):
+        """
+        Yield every topic oldest first, fetching one keyset page at a time.
+        
+        Args:
+            batch_size: Topics fetched per page
+        
+        Yields:
+            dict: Topics in ID order
+        """
+        after_id = None
+        while True:
+            page = ResearchDatabase.list_topics(after_id, batch_size, order="asc")
+            if not page:
+                return
+            yield from page
+            after_id = page[-1]['id']
+    
+    @staticmethod
+    def export(stream, format: str = "jsonl", batch_size: int = 1000) -> int:
+        """
+        Write every topic to a stream without loading them all at once.
+        
+        Args:
+            stream: Text file object for JSONL; binary file object or path for Parquet
+            format: "jsonl" or "parquet" (Parquet needs pyarrow)
+            batch_size: Topics fetched per page and per Parquet row group
+        
+        Returns:
+            int: Number of topics written
+        """
+        return write_topics(stream, ResearchDatabase.iter_topics(batch_size), format, batch_size)
+    
+    @staticmethod
+    def count_topics() -> int:
+        """
+        Count research topics without loading them.
+        
+        Returns:
+            int: Number of topics
+        """
+        ResearchDatabase.initialize()
+        return ResearchDatabase.get_backend().count_topics()
     
     @staticmethod
     def delete_topic(topic_id: int) -> bool:
@@ -59,18 +1338,12 @@ class ResearchDatabase:
         
         Args:
             topic_id: ID of the topic to delete
-            
+        
         Returns:
             bool: True if topic was found and deleted
         """
         ResearchDatabase.initialize()
-        
-        original_length = len(st.session_state.research_topics)
-        st.session_state.research_topics = [
-            t for t in st.session_state.research_topics if t['id'] != topic_id
-        ]
-        
-        return len(st.session_state.research_topics) < original_length
+        return ResearchDatabase.get_backend().delete_topic(topic_id)
     
     @staticmethod
     def update_topic(topic_id: int, title: str = None, content: str = None, tags: list = None) -> bool:
@@ -82,43 +1355,99 @@ class ResearchDatabase:
             title: New title (optional)
             content: New content (optional)
             tags: New tags (optional)
-            
+        
         Returns:
             bool: True if topic was found and updated
         """
         ResearchDatabase.initialize()
+        return ResearchDatabase.get_backend().update_topic(
+            topic_id,
+            title=title.strip() if title else None,
+            content=content.strip() if content else None,
+            tags=tags
+        )
+    
+    @staticmethod
+    def search_topics(keyword: str, limit: int = None) -> list:
+        """
+        Search topics by keywords in title, content and tags.
+        
+        Uses the full-text index: words are stemmed and ANDed, ``OR``
+        separates alternatives, ``word*`` matches a prefix and the last
+        word always matches as a prefix. Results are ranked with BM25.
         
-        for topic in st.session_state.research_topics:
-            if topic['id'] == topic_id:
-                if title:
-                    topic['title'] = title.strip()
-                if content:
-                    topic['content'] = content.strip()
-                if tags is not None:
-                    topic['tags'] = tags
-                topic['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                return True
+        Args:
+            keyword: Search query
+            limit: Maximum number of results (all if None)
         
-        return False
+        Returns:
+            list: Topics matching the search query, best match first
+        """
+        ResearchDatabase.initialize()
+        return ResearchDatabase.get_backend().search_topics(keyword, limit)
     
     @staticmethod
-    def search_topics(keyword: str) -> list:
+    def search_page(
+        keyword: str,
+        offset: int = 0,
+        limit: int = 20,
+        tags: list = None,
+        match_all: bool = True
+    ) -> list:
         """
-        Search topics by keyword in title or content.
+        Get one page of search results.
+        
+        Ranks matching IDs only, filters them by tag, and loads just the
+        topics on the page, so a page costs the same however many topics
+        match. Ranked results have no ID order, so pages are addressed by
+        offset.
         
         Args:
-            keyword: Search keyword
-            
+            keyword: Search query, as in ``search_topics``
+            offset: Ranked results to skip
+            limit: Maximum topics to return
+            tags: Only include topics with these tags (optional)
+            match_all: With ``tags``, require every tag (True) or any (False)
+        
         Returns:
-            list: Topics matching the search keyword
+            list: Up to ``limit`` topics, best match first
         """
         ResearchDatabase.initialize()
-        keyword_lower = keyword.lower()
+        backend = ResearchDatabase.get_backend()
+        ids = backend.search_ids(keyword)
+        if tags:
+            tagged = backend.topic_ids_by_tags(tags, match_all)
+            ids = [topic_id for topic_id in ids if topic_id in tagged]
+        page = (backend.get_topic_by_id(topic_id) for topic_id in ids[offset:offset + limit])
+        return [topic for topic in page if topic is not None]
+    
+    @staticmethod
+    def get_topics_by_tags(tags: list, match_all: bool = True) -> list:
+        """
+        Get topics by tag, ignoring case and extra whitespace.
         
-        return [
-            t for t in st.session_state.research_topics
-            if keyword_lower in t['title'].lower() or keyword_lower in t['content'].lower()
-        ]
+        Args:
+            tags: Tags to filter by
+            match_all: Require every tag (True) or any of them (False)
+        
+        Returns:
+            list: Matching topics, oldest first
+        """
+        ResearchDatabase.initialize()
+        backend = ResearchDatabase.get_backend()
+        ids = sorted(backend.topic_ids_by_tags(tags, match_all))
+        return [t for t in (backend.get_topic_by_id(i) for i in ids) if t is not None]
+    
+    @staticmethod
+    def get_tag_counts() -> dict:
+        """
+        Get every tag in use with its number of topics.
+        
+        Returns:
+            dict: {tag label: topic count}, most used first
+        """
+        ResearchDatabase.initialize()
+        return ResearchDatabase.get_backend().tag_counts()
     
     @staticmethod
     def get_topic_by_id(topic_id: int) -> dict:
@@ -127,14 +1456,9 @@ class ResearchDatabase:
         
         Args:
             topic_id: ID of the topic
-            
+        
         Returns:
             dict: Topic if found, None otherwise
         """
         ResearchDatabase.initialize()
-        
-        for topic in st.session_state.research_topics:
-            if topic['id'] == topic_id:
-                return topic
-        
-        return None
+        return ResearchDatabase.get_backend().get_topic_by_id(topic_id)
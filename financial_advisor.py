@@ -1,4 +1,16 @@
 """Financial calculations and advice"""
+import numpy as np
+import pandas as pd
+
+# Budget advice from lowest to highest savings rate; the batch API uses this order for its categories
+BUDGET_ADVICE = (
+    "Consider reducing expenses to save at least 10% of income.",
+    "Good job! Try to increase savings to 20% if possible.",
+    "Excellent! You're saving above the recommended 20%."
+)
+# Savings rates (%) at which the advice moves up a level
+ADVICE_THRESHOLDS = (10, 20)
+
 
 class FinancialAdvisor:
     @staticmethod
@@ -25,9 +37,116 @@ class FinancialAdvisor:
         """Provide personalized budget advice based on savings rate."""
         savings_rate = FinancialAdvisor.calculate_savings_rate(income, expenses)
         
-        if savings_rate >= 20:
-            return "Excellent! You're saving above the recommended 20%."
-        elif savings_rate >= 10:
-            return "Good job! Try to increase savings to 20% if possible."
+        if savings_rate >= ADVICE_THRESHOLDS[1]:
+            return BUDGET_ADVICE[2]
+        elif savings_rate >= ADVICE_THRESHOLDS[0]:
+            return BUDGET_ADVICE[1]
         else:
-            return "Consider reducing expenses to save at least 10% of income."
+            return BUDGET_ADVICE[0]
+    
+    @staticmethod
+    def _ratio_percent(numerator, income) -> np.ndarray:
+        """numerator / income * 100, and 0 wherever income <= 0 (like the scalar methods)."""
+        numerator = np.asarray(numerator, dtype=np.float64)
+        income = np.asarray(income, dtype=np.float64)
+        result = np.zeros(np.broadcast(numerator, income).shape)
+        # ~(income <= 0) rather than income > 0 so NaN income gives NaN, as the scalar version does
+        np.divide(numerator, income, out=result, where=~(income <= 0))
+        result *= 100
+        return result
+    
+    @staticmethod
+    def calculate_savings_rate_batch(income, expenses) -> np.ndarray:
+        """
+        Calculate savings rates for many budgets at once.
+        
+        Args:
+            income: Array-like of monthly incomes
+            expenses: Array-like of monthly expenses
+        
+        Returns:
+            np.ndarray: Savings rate percentages; 0 where income <= 0
+        """
+        income = np.asarray(income, dtype=np.float64)
+        return FinancialAdvisor._ratio_percent(income - np.asarray(expenses, dtype=np.float64), income)
+    
+    @staticmethod
+    def calculate_debt_ratio_batch(debt, income) -> np.ndarray:
+        """
+        Calculate debt-to-income ratios for many budgets at once.
+        
+        Args:
+            debt: Array-like of monthly debt payments
+            income: Array-like of monthly incomes
+        
+        Returns:
+            np.ndarray: Debt ratio percentages; 0 where income <= 0
+        """
+        return FinancialAdvisor._ratio_percent(debt, income)
+    
+    @staticmethod
+    def calculate_monthly_savings_batch(income, expenses) -> np.ndarray:
+        """
+        Calculate monthly savings for many budgets at once.
+        
+        Args:
+            income: Array-like of monthly incomes
+            expenses: Array-like of monthly expenses
+        
+        Returns:
+            np.ndarray: Savings amounts, never below 0
+        """
+        difference = np.asarray(income, dtype=np.float64) - np.asarray(expenses, dtype=np.float64)
+        # fmax, not maximum: max(0, nan) is 0 in the scalar version
+        return np.fmax(difference, 0.0)
+    
+    @staticmethod
+    def get_budget_advice_batch(income, expenses) -> pd.Categorical:
+        """
+        Provide budget advice for many budgets at once.
+        
+        Args:
+            income: Array-like of monthly incomes
+            expenses: Array-like of monthly expenses
+        
+        Returns:
+            pd.Categorical: Advice per budget, categories ordered as BUDGET_ADVICE
+        """
+        savings_rate = FinancialAdvisor.calculate_savings_rate_batch(income, expenses)
+        codes = (savings_rate >= ADVICE_THRESHOLDS[0]).astype(np.int8)
+        codes += savings_rate >= ADVICE_THRESHOLDS[1]
+        return pd.Categorical.from_codes(codes, categories=list(BUDGET_ADVICE), ordered=True)
+    
+    @staticmethod
+    def score_budgets(
+        budgets: pd.DataFrame,
+        income_column: str = "income",
+        expenses_column: str = "expenses",
+        debt_column: str = "debt"
+    ) -> pd.DataFrame:
+        """
+        Compute every metric for a table of budgets.
+        
+        Args:
+            budgets: One row per budget
+            income_column: Column with monthly income
+            expenses_column: Column with monthly expenses
+            debt_column: Column with monthly debt payments (skipped if absent)
+        
+        Returns:
+            pd.DataFrame: savings_rate, monthly_savings, debt_ratio (if debt is
+                present) and a categorical advice column, on the input's index
+        """
+        income = budgets[income_column].to_numpy(dtype=np.float64)
+        expenses = budgets[expenses_column].to_numpy(dtype=np.float64)
+        scores = {
+            'savings_rate': FinancialAdvisor.calculate_savings_rate_batch(income, expenses),
+            'monthly_savings': FinancialAdvisor.calculate_monthly_savings_batch(income, expenses)
+        }
+        if debt_column in budgets:
+            scores['debt_ratio'] = FinancialAdvisor.calculate_debt_ratio_batch(
+                budgets[debt_column].to_numpy(dtype=np.float64),
+                income
+            )
+        scores['advice'] = FinancialAdvisor.get_budget_advice_batch(income, expenses)
+        return pd.DataFrame(scores, index=budgets.index)
@@ -0,0 +1,204 @@
+"""Data-driven spending insights for the Analytics page"""
+import json
+
+from utils.charts import FigureCache
+from utils.financial_advisor import FinancialAdvisor
+
+
+# Typical share of take-home income per category: (mean, standard deviation)
+BENCHMARK_SHARES = {
+    'Housing': (0.30, 0.08),
+    'Food': (0.12, 0.04),
+    'Transportation': (0.10, 0.04),
+    'Entertainment': (0.05, 0.03),
+    'Healthcare': (0.07, 0.03),
+    'Utilities': (0.06, 0.02),
+    'Shopping': (0.06, 0.03),
+    'Other': (0.05, 0.03)
+}
+
+Z_THRESHOLD = 1.0           # categories further than this from the benchmark are findings
+MOM_MIN_CHANGE = 0.25       # month-over-month change worth mentioning...
+MOM_MIN_AMOUNT = 50         # ...if it is also at least this many dollars
+MAX_FINDINGS = 5
+# 20/10 rule: consumer debt balances should stay under 20% of annual take-home pay
+DEBT_TO_ANNUAL_INCOME_LIMIT = 20
+
+NARRATIVE_PROMPT = """Here is a summary of my monthly budget as JSON. Shares are fractions of income, z is the distance from a typical budget in standard deviations, and mom is the change since last month.
+
+{summary}
+
+debt_to_annual_income is total debt as a percentage of a year's income.
+
+In 3-4 sentences, explain what stands out and give the single most useful change I could make."""
+
+insight_cache = FigureCache(max_entries=256)
+
+
+def monthly_history(pivot, months: int = 2) -> dict:
+    """
+    Take the most recent months of a ledger pivot for month-over-month deltas.
+    
+    Args:
+        pivot: LedgerSummary.pivot() table
+        months: Number of trailing months to keep
+    
+    Returns:
+        dict: {month: {category: amount}}, oldest first
+    """
+    tail = pivot.tail(months)
+    return {month: {category: float(amount) for category, amount in row.items()} for month, row in tail.iterrows()}
+
+
+def compute_insights(financial_data: dict, history: dict = None) -> dict:
+    """
+    Compare a budget with benchmark shares and the previous month.
+    
+    Args:
+        financial_data: Analytics page data
+        history: {month: {category: amount}} from ``monthly_history``, or None
+    
+    Returns:
+        dict: Compact summary with ratios, per-category shares and z-scores,
+            month-over-month deltas, and findings ordered by importance
+    """
+    income = financial_data['monthly_income']
+    expenses = financial_data['monthly_expenses']
+    # total_debt is a balance, so compare it with a year of income rather than a month
+    ratios = {
+        'savings_rate': round(FinancialAdvisor.calculate_savings_rate(income, expenses), 1),
+        'debt_to_annual_income': round(FinancialAdvisor.calculate_debt_ratio(financial_data['total_debt'], income * 12), 1),
+        'expense_ratio': round(expenses / income * 100, 1) if income > 0 else 0.0
+    }
+    
+    findings = []
+    categories = {}
+    for category, amount in financial_data['spending'].items():
+        mean, std = BENCHMARK_SHARES.get(category, BENCHMARK_SHARES['Other'])
+        share = amount / income if income > 0 else 0.0
+        z = (share - mean) / std
+        categories[category] = {'amount': amount, 'share': round(share, 3), 'z': round(z, 2)}
+        if income > 0 and abs(z) >= Z_THRESHOLD:
+            findings.append({
+                'kind': 'above_benchmark' if z > 0 else 'below_benchmark',
+                'category': category,
+                'share': round(share, 3),
+                'benchmark': mean,
+                'weight': abs(z)
+            })
+    
+    if history and len(history) >= 2:
+        previous, latest = (history[month] for month in sorted(history)[-2:])
+        for category, amount in latest.items():
+            before = previous.get(category, 0.0)
+            change = amount - before
+            if before > 0:
+                categories.setdefault(category, {})['mom'] = round(change / before, 3)
+            if abs(change) >= MOM_MIN_AMOUNT and (before == 0 or abs(change) / before >= MOM_MIN_CHANGE):
+                findings.append({
+                    'kind': 'increase' if change > 0 else 'decrease',
+                    'category': category,
+                    'change': round(change, 2),
+                    'previous': round(before, 2),
+                    'weight': abs(change) / before if before > 0 else MOM_MIN_CHANGE * 4
+                })
+    
+    if income > 0 and ratios['savings_rate'] < 10:
+        findings.append({'kind': 'low_savings', 'savings_rate': ratios['savings_rate'], 'weight': (10 - ratios['savings_rate']) / 5})
+    debt_share = ratios['debt_to_annual_income']
+    if debt_share > DEBT_TO_ANNUAL_INCOME_LIMIT:
+        findings.append({'kind': 'high_debt', 'debt_to_annual_income': debt_share, 'weight': debt_share / DEBT_TO_ANNUAL_INCOME_LIMIT})
+    
+    findings.sort(key=lambda finding: finding['weight'], reverse=True)
+    for finding in findings:
+        finding['weight'] = round(finding['weight'], 2)
+    return {'ratios': ratios, 'categories': categories, 'findings': findings[:MAX_FINDINGS]}
+
+
+def describe(finding: dict) -> str:
+    """
+    Write one finding as a sentence.
+    
+    Args:
+        finding: Entry of compute_insights()['findings']
+    
+    Returns:
+        str: Markdown sentence
+    """
+    kind = finding['kind']
+    if kind == 'above_benchmark':
+        return (
+            f"**{finding['category']}** takes {finding['share']:.0%} of income, above the typical "
+            f"{finding['benchmark']:.0%}. Trimming it is the quickest way to free up money."
+        )
+    if kind == 'below_benchmark':
+        return f"**{finding['category']}** is only {finding['share']:.0%} of income, well under the typical {finding['benchmark']:.0%}."
+    if kind in ('increase', 'decrease'):
+        direction = "up" if kind == 'increase' else "down"
+        return f"**{finding['category']}** is {direction} ${abs(finding['change']):,.0f} from last month (was ${finding['previous']:,.0f})."
+    if kind == 'low_savings':
+        return f"You save {finding['savings_rate']:.1f}% of income. Aim for at least 10-20%."
+    if kind == 'high_debt':
+        return (
+            f"Debt is {finding['debt_to_annual_income']:.0f}% of a year's income, above the "
+            f"{DEBT_TO_ANNUAL_INCOME_LIMIT}% guideline. Prioritize paying down high-interest balances."
+        )
+    return ""
+
+
+class _NarrativeFailed(Exception):
+    """The model returned an error instead of a narrative; never cached."""
+
+
+def _build(params: dict) -> dict:
+    summary = compute_insights(params['financial_data'], params['history'])
+    highlights = [describe(finding) for finding in summary['findings']]
+    if not highlights:
+        highlights = ["Your spending is in line with typical budgets. Keep it up!"]
+    return {'summary': summary, 'highlights': highlights}
+
+
+def _narrate(params: dict, summary: dict, model) -> str:
+    # One call for the whole summary; error strings from the model are not shown as insights
+    prompt = NARRATIVE_PROMPT.format(summary=json.dumps(summary, separators=(",", ":")))
+    response = model.generate_response(
+        [{"role": "user", "content": prompt}],
+        user_type=params['user_type'],
+        max_tokens=256,
+        temperature=0.3
+    )
+    if not response or response.startswith("Error"):
+        raise _NarrativeFailed(response)
+    return response.strip()
+
+
+def get_insights(financial_data: dict, history: dict = None, model=None, user_type: str = "professional") -> dict:
+    """
+    Get insights for a budget, computing them only when the data changes.
+    
+    A narrative is cached only once the model has written one, so a
+    failed call is retried next time instead of being remembered.
+    
+    Args:
+        financial_data: Analytics page data
+        history: {month: {category: amount}} from ``monthly_history``, or None
+        model: GraniteAIModel for a written narrative; None for computed insights only
+        user_type: "student" or "professional", for the narrative's tone
+    
+    Returns:
+        dict: summary (compute_insights output), highlights (sentences) and
+            narrative (model text, or None)
+    """
+    params = {
+        'financial_data': financial_data,
+        'history': history,
+        'user_type': user_type
+    }
+    insights = insight_cache.get("insights", params, _build)
+    narrative = None
+    if model is not None:
+        try:
+            narrative = insight_cache.get("narrative", params, lambda p: _narrate(p, insights['summary'], model))
+        except _NarrativeFailed:
+            pass
+    return {**insights, 'narrative': narrative}
@@ -0,0 +1,323 @@
+"""Streaming bank transaction ingestion and monthly category aggregation"""
+import csv
+import re
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, Iterator, NamedTuple
+
+import pandas as pd
+
+from utils.categorizer import Categorizer
+
+
+# Spending categories used by the Analytics page, in display order
+CATEGORIES = ('Housing', 'Food', 'Transportation', 'Entertainment', 'Healthcare', 'Utilities', 'Shopping', 'Other')
+
+_DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%d.%m.%Y', '%Y/%m/%d', '%d %b %Y', '%b %d, %Y')
+_DATE_COLUMNS = ('date', 'transaction date', 'posted date', 'posting date', 'booking date')
+_DESCRIPTION_COLUMNS = ('description', 'merchant', 'payee', 'name', 'details', 'memo')
+_OFX_FIELD_RE = re.compile(r"<(/?\w+)>([^<\r\n]*)")
+
+
+class Transaction(NamedTuple):
+    """One bank transaction; negative amounts are money out."""
+    date: str
+    description: str
+    amount: float
+
+
+def parse_amount(text: str) -> float:
+    """
+    Parse a bank amount such as "-1,234.56", "$12.00" or "(45.10)".
+    
+    Args:
+        text: Amount text
+    
+    Returns:
+        float: Amount (0.0 if blank)
+    """
+    text = text.strip().replace(",", "").replace("$", "").replace(" ", "")
+    if not text:
+        return 0.0
+    if text.startswith("(") and text.endswith(")"):
+        return -float(text[1:-1])
+    return float(text)
+
+
+@lru_cache(maxsize=4096)
+def parse_month(text: str) -> str:
+    """
+    Get the "YYYY-MM" month of a bank date.
+    
+    Cached, since an export repeats the same few hundred dates.
+    
+    Args:
+        text: Date in a common bank format, or an OFX timestamp (YYYYMMDD...)
+    
+    Returns:
+        str: Month key
+    """
+    text = text.strip()
+    if len(text) >= 8 and text[:8].isdigit():
+        return f"{text[:4]}-{text[4:6]}"
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).strftime('%Y-%m')
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {text!r}")
+
+
+def _find_column(fieldnames: list, candidates: tuple) -> str:
+    """Return the first header matching one of the candidate names (case-insensitive)."""
+    by_name = {name.strip().lower(): name for name in fieldnames}
+    for candidate in candidates:
+        if candidate in by_name:
+            return by_name[candidate]
+    return None
+
+
+def read_csv_transactions(stream, expenses_positive: bool = False) -> Iterator[Transaction]:
+    """
+    Stream transactions from a bank CSV export one row at a time.
+    
+    Recognizes a date column, a description column, and either one signed
+    Amount column or separate Debit/Credit columns.
+    
+    Args:
+        stream: Text file object
+        expenses_positive: The Amount column shows money out as positive numbers
+    
+    Yields:
+        Transaction: One per data row
+    """
+    reader = csv.DictReader(stream)
+    fieldnames = reader.fieldnames or []
+    date_column = _find_column(fieldnames, _DATE_COLUMNS)
+    description_column = _find_column(fieldnames, _DESCRIPTION_COLUMNS)
+    amount_column = _find_column(fieldnames, ('amount', 'transaction amount'))
+    debit_column = _find_column(fieldnames, ('debit', 'withdrawal', 'money out'))
+    credit_column = _find_column(fieldnames, ('credit', 'deposit', 'money in'))
+    if date_column is None or description_column is None or (amount_column is None and debit_column is None):
+        raise ValueError(f"Unrecognized CSV columns: {', '.join(fieldnames)}")
+    
+    sign = -1.0 if expenses_positive else 1.0
+    for row in reader:
+        if not (row.get(date_column) or "").strip():
+            continue
+        try:
+            if amount_column is not None:
+                amount = sign * parse_amount(row[amount_column] or "")
+            else:
+                amount = parse_amount(row.get(credit_column) or "") - abs(parse_amount(row[debit_column] or ""))
+        except ValueError:
+            amount = float("nan")  # counted as skipped by LedgerSummary
+        yield Transaction(row[date_column], (row[description_column] or "").strip(), amount)
+
+
+def read_ofx_transactions(stream) -> Iterator[Transaction]:
+    """
+    Stream transactions from an OFX/QFX file (SGML or XML flavour) line by line.
+    
+    Args:
+        stream: Text file object
+    
+    Yields:
+        Transaction: One per <STMTTRN> block
+    """
+    fields = None
+    for line in stream:
+        for tag, value in _OFX_FIELD_RE.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                fields = {}
+            elif tag == "/STMTTRN" and fields is not None:
+                if fields.get("DTPOSTED") and fields.get("TRNAMT"):
+                    description = fields.get("NAME") or fields.get("PAYEE") or fields.get("MEMO") or ""
+                    try:
+                        amount = parse_amount(fields["TRNAMT"])
+                    except ValueError:
+                        amount = float("nan")
+                    yield Transaction(fields["DTPOSTED"], description.strip(), amount)
+                fields = None
+            elif fields is not None and not tag.startswith("/"):
+                fields[tag] = value.strip()
+
+
+class LedgerSummary:
+    """
+    Monthly per-category totals built from a transaction stream.
+    
+    Only the running totals are kept while ingesting, so memory depends on
+    the number of months, not the number of transactions. ``spending`` is
+    a long-format DataFrame (month, category, amount, transactions) that
+    can be saved as Parquet.
+    """
+    
+    def __init__(
+        self,
+        spending: pd.DataFrame,
+        income: pd.Series,
+        rows: int = 0,
+        skipped: int = 0,
+        categorizer_stats: dict = None
+    ):
+        """
+        Initialize the summary.
+        
+        Args:
+            spending: Columns month, category, amount, transactions
+            income: Money in per month, indexed by month
+            rows: Transactions ingested
+            skipped: Rows dropped because their date or amount could not be parsed
+            categorizer_stats: Categorizer.stats() for the spending rows
+        """
+        self.spending = spending
+        self.income = income
+        self.rows = rows
+        self.skipped = skipped
+        self.categorizer_stats = categorizer_stats or {}
+    
+    @property
+    def months(self) -> list:
+        """Months with any transactions, oldest first."""
+        return sorted(set(self.spending['month']) | set(self.income.index))
+    
+    @staticmethod
+    def from_transactions(transactions: Iterable[Transaction], categorizer: Categorizer = None) -> "LedgerSummary":
+        """
+        Aggregate a transaction stream.
+        
+        Money out is categorized and summed per month and category; money in
+        is summed per month as income.
+        
+        Args:
+            transactions: Transactions, e.g. from read_csv_transactions
+            categorizer: Categorizer (the default rules if None)
+        
+        Returns:
+            LedgerSummary: Aggregated totals
+        """
+        categorizer = categorizer or Categorizer()
+        categorizer.reset_stats()
+        totals = defaultdict(float)
+        counts = defaultdict(int)
+        income = defaultdict(float)
+        rows = skipped = 0
+        for transaction in transactions:
+            try:
+                month = parse_month(transaction.date)
+            except ValueError:
+                skipped += 1
+                continue
+            if transaction.amount != transaction.amount:  # NaN: unparseable amount
+                skipped += 1
+                continue
+            rows += 1
+            if transaction.amount >= 0:
+                income[month] += transaction.amount
+                continue
+            key = (month, categorizer.categorize(transaction.description))
+            totals[key] -= transaction.amount
+            counts[key] += 1
+        
+        spending = pd.DataFrame(
+            [(month, category, round(total, 2), counts[(month, category)]) for (month, category), total in totals.items()],
+            columns=['month', 'category', 'amount', 'transactions']
+        )
+        spending['category'] = pd.Categorical(spending['category'], categories=CATEGORIES)
+        spending = spending.sort_values(['month', 'category'], ignore_index=True)
+        income_series = pd.Series(income, dtype=float, name='income').sort_index().round(2)
+        income_series.index.name = 'month'
+        return LedgerSummary(spending, income_series, rows, skipped, categorizer.stats())
+    
+    @staticmethod
+    def ingest(stream, format: str = "csv", categorizer: Categorizer = None, expenses_positive: bool = False) -> "LedgerSummary":
+        """
+        Parse and aggregate a bank export without loading it into memory.
+        
+        Args:
+            stream: Text file object
+            format: "csv" or "ofx"
+            categorizer: Categorizer (the default rules if None)
+            expenses_positive: CSV Amount column shows money out as positive numbers
+        
+        Returns:
+            LedgerSummary: Aggregated totals
+        """
+        if format == "csv":
+            transactions = read_csv_transactions(stream, expenses_positive)
+        elif format == "ofx":
+            transactions = read_ofx_transactions(stream)
+        else:
+            raise ValueError(f"Unsupported format {format!r}; expected csv or ofx")
+        return LedgerSummary.from_transactions(transactions, categorizer)
+    
+    def pivot(self) -> pd.DataFrame:
+        """
+        Get spending as a month x category table.
+        
+        Returns:
+            pd.DataFrame: One row per month, one column per category (0 where none)
+        """
+        table = self.spending.pivot_table(
+            index='month', columns='category', values='amount', aggfunc='sum', fill_value=0.0, observed=False
+        )
+        return table.reindex(index=self.months, columns=list(CATEGORIES), fill_value=0.0)
+    
+    def financial_data(self, month: str = None, total_debt: float = 0, monthly_savings: float = None) -> dict:
+        """
+        Build the Analytics page's financial_data dict from real transactions.
+        
+        Args:
+            month: "YYYY-MM" to use one month; average over all months if None
+            total_debt: Debt figure to carry over (not derivable from transactions)
+            monthly_savings: Savings figure to use; income minus expenses if None
+        
+        Returns:
+            dict: monthly_income, monthly_expenses, monthly_savings, total_debt and spending
+        """
+        table = self.pivot()
+        if month is None:
+            spending = table.mean() if len(table) else pd.Series(0.0, index=list(CATEGORIES))
+            income = self.income.reindex(self.months, fill_value=0.0).mean() if self.months else 0.0
+        else:
+            spending = table.loc[month] if month in table.index else pd.Series(0.0, index=list(CATEGORIES))
+            income = self.income.get(month, 0.0)
+        spending = {category: int(round(spending[category])) for category in CATEGORIES}
+        income = int(round(income))
+        expenses = sum(spending.values())
+        return {
+            'monthly_income': income,
+            'monthly_expenses': expenses,
+            'monthly_savings': max(0, income - expenses) if monthly_savings is None else monthly_savings,
+            'total_debt': total_debt,
+            'spending': spending
+        }
+    
+    def to_parquet(self, path: str):
+        """
+        Save the aggregates as Parquet (needs pyarrow).
+        
+        Args:
+            path: Output path; income is written next to it with an ``.income`` suffix
+        """
+        self.spending.to_parquet(path, index=False)
+        self.income.to_frame().to_parquet(f"{path}.income", index=True)
+    
+    @staticmethod
+    def from_parquet(path: str) -> "LedgerSummary":
+        """
+        Load aggregates saved by ``to_parquet``.
+        
+        Args:
+            path: Path given to ``to_parquet``
+        
+        Returns:
+            LedgerSummary: Loaded totals
+        """
+        spending = pd.read_parquet(path)
+        spending['category'] = pd.Categorical(spending['category'], categories=CATEGORIES)
+        income = pd.read_parquet(f"{path}.income")['income']
+        return LedgerSummary(spending, income)
@@ -0,0 +1,260 @@
+"""Local in-process Granite inference with transformers"""
+import contextvars
+import threading
+import time
+from typing import Iterator, Union
+
+# Seconds the most recent request of the current thread or task waited for the model
+_last_queue_wait = contextvars.ContextVar('last_queue_wait', default=None)
+
+# torch's intra-op thread pool is process-wide, so only the first setting applies
+_threads_lock = threading.Lock()
+_threads_set = False
+
+
+def _set_num_threads_once(num_threads: int) -> bool:
+    """
+    Size torch's CPU thread pool unless it was already sized in this process.
+    
+    Args:
+        num_threads: Threads for intra-op parallelism
+    
+    Returns:
+        bool: True if this call set the thread count
+    """
+    global _threads_set
+    import torch
+    
+    with _threads_lock:
+        if _threads_set:
+            return False
+        torch.set_num_threads(num_threads)
+        _threads_set = True
+        return True
+
+
+class LocalGraniteBackend:
+    """
+    Run the Granite model in-process on CPU.
+    
+    Exposes ``text_generation`` with the same arguments and return types as
+    ``huggingface_hub.InferenceClient.text_generation``, so GraniteAIModel
+    can use it as a drop-in client for both plain and streamed responses.
+    ``torch`` and ``transformers`` are imported only when the model loads.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = "ibm-granite/granite-3.2-2b-instruct",
+        quantize: bool = False,
+        num_threads: int = None,
+        warmup: bool = True
+    ):
+        """
+        Initialize the backend.
+        
+        Args:
+            model_name: Hugging Face model to load
+            quantize: Apply int8 dynamic quantization to Linear layers
+            num_threads: Threads used by torch for CPU inference (torch default if None);
+                torch's pool is process-wide, so only the first loaded backend sets it
+            warmup: Run a short generation after loading
+        """
+        self.model_name = model_name
+        self.quantize = quantize
+        self.num_threads = num_threads
+        self.warmup = warmup
+        self.model = None
+        self.tokenizer = None
+        # One generate() at a time; concurrent calls would only oversubscribe the CPU
+        self._lock = threading.Lock()
+    
+    def load(self) -> "LocalGraniteBackend":
+        """
+        Load tokenizer and model weights, then warm up.
+        
+        Returns:
+            LocalGraniteBackend: self, for chaining
+        """
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+        
+        if self.num_threads:
+            _set_num_threads_once(self.num_threads)
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        model = AutoModelForCausalLM.from_pretrained(self.model_name, torch_dtype=torch.float32)
+        model.eval()
+        
+        if self.quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        
+        self.model = model
+        
+        if self.warmup:
+            # First generate() pays for kernel selection and allocator growth
+            self.text_generation("Hello", max_new_tokens=4, do_sample=False)
+        return self
+    
+    @staticmethod
+    def last_queue_wait() -> float:
+        """
+        Get how long the last request of this thread (or asyncio task) waited for the model.
+        
+        Returns:
+            float: Seconds, or None if there was none or it never started
+        """
+        return _last_queue_wait.get()
+    
+    def _generation_kwargs(self, max_new_tokens: int, temperature: float, do_sample: bool) -> dict:
+        """Build generate() arguments; greedy decoding when temperature is zero."""
+        kwargs = {
+            'max_new_tokens': max_new_tokens,
+            'pad_token_id': self.tokenizer.pad_token_id
+        }
+        if do_sample and temperature and temperature > 0:
+            kwargs.update(do_sample=True, temperature=temperature)
+        else:
+            kwargs['do_sample'] = False
+        return kwargs
+    
+    def text_generation(
+        self,
+        prompt: str,
+        model: str = None,
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+        do_sample: bool = True,
+        stream: bool = False,
+        details: bool = False
+    ) -> Union[str, Iterator[str]]:
+        """
+        Generate a completion for a prompt.
+        
+        Args:
+            prompt: Full generation prompt
+            model: Ignored; accepted for InferenceClient compatibility
+            max_new_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0 for greedy decoding)
+            do_sample: Whether to sample
+            stream: Return an iterator of text chunks instead of a string
+            details: Ignored; chunks are always plain strings
+        
+        Returns:
+            str or Iterator[str]: Completion text, or its chunks when streaming
+        """
+        if self.model is None:
+            self.load()
+        
+        _last_queue_wait.set(None)
+        kwargs = self._generation_kwargs(max_new_tokens, temperature, do_sample)
+        if stream:
+            return self._stream(prompt, kwargs)
+        
+        import torch
+        
+        inputs = self.tokenizer(prompt, return_tensors="pt")
+        queued = time.monotonic()
+        with self._lock, torch.inference_mode():
+            _last_queue_wait.set(time.monotonic() - queued)
+            output = self.model.generate(**inputs, **kwargs)
+        new_tokens = output[0][inputs['input_ids'].shape[1]:]
+        return self.tokenizer.decode(new_tokens, skip_special_tokens=True)
+    
+    def generate_batch(
+        self,
+        prompts: list,
+        max_new_tokens: list,
+        temperature: float = 0.7,
+        do_sample: bool = True
+    ) -> list:
+        """
+        Generate completions for several prompts in one padded forward pass.
+        
+        Prompts are left-padded so every row continues from the same
+        position. The batch runs to the largest ``max_new_tokens``; each
+        completion is cut back to its own limit.
+        
+        Args:
+            prompts: Generation prompts
+            max_new_tokens: Maximum new tokens for each prompt
+            temperature: Sampling temperature shared by the batch
+            do_sample: Whether to sample
+        
+        Returns:
+            list: Completion text for each prompt, in order
+        """
+        if self.model is None:
+            self.load()
+        
+        import torch
+        
+        kwargs = self._generation_kwargs(max(max_new_tokens), temperature, do_sample)
+        self.tokenizer.padding_side = "left"
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True)
+        with self._lock, torch.inference_mode():
+            output = self.model.generate(**inputs, **kwargs)
+        
+        prompt_length = inputs['input_ids'].shape[1]
+        return [
+            self.tokenizer.decode(row[prompt_length:prompt_length + limit], skip_special_tokens=True)
+            for row, limit in zip(output, max_new_tokens)
+        ]
+    
+    def _stream(self, prompt: str, kwargs: dict) -> Iterator[str]:
+        """
+        Stream a completion from a background generate() thread.
+        
+        Closing the iterator stops generation at the next token.
+        
+        Args:
+            prompt: Full generation prompt
+            kwargs: generate() arguments
+        
+        Yields:
+            str: Decoded text chunks
+        """
+        import torch
+        from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+        
+        cancelled = threading.Event()
+        
+        class _Cancelled(StoppingCriteria):
+            def __call__(self, input_ids, scores, **kw):
+                return cancelled.is_set()
+        
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        inputs = self.tokenizer(prompt, return_tensors="pt")
+        
+        errors = []
+        queued = time.monotonic()
+        started = []
+        
+        def run():
+            try:
+                with self._lock, torch.inference_mode():
+                    started.append(time.monotonic())
+                    self.model.generate(
+                        **inputs,
+                        **kwargs,
+                        streamer=streamer,
+                        stopping_criteria=StoppingCriteriaList([_Cancelled()])
+                    )
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+        
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        try:
+            for text in streamer:
+                if text:
+                    yield text
+            if errors:
+                raise errors[0]
+        finally:
+            cancelled.set()
+            # Set here, in the consumer's context; a stream closed before it started waited until now
+            _last_queue_wait.set((started[0] if started else time.monotonic()) - queued)
@@ -0,0 +1,219 @@
+"""Token-budgeted prompt construction for long chats"""
+import hashlib
+import math
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, NamedTuple
+
+
+SUMMARY_PREFIX = "Summary of earlier conversation: "
+
+
+class BuiltPrompt(NamedTuple):
+    """A generation prompt together with its size."""
+    text: str
+    prompt_tokens: int
+    summarized_turns: int
+
+
+class TokenCounter:
+    """
+    Count prompt tokens.
+    
+    Uses the Granite tokenizer when ``use_tokenizer`` is set and
+    ``transformers`` can load it; otherwise falls back to the usual
+    ~4 characters per token approximation, which needs no model download.
+    """
+    
+    def __init__(self, model_name: str = "ibm-granite/granite-3.2-2b-instruct", use_tokenizer: bool = False):
+        """
+        Initialize the counter.
+        
+        Args:
+            model_name: Hugging Face model whose tokenizer to use
+            use_tokenizer: Load the real tokenizer instead of approximating
+        """
+        self.model_name = model_name
+        self.use_tokenizer = use_tokenizer
+        self._tokenizer = None
+        self._lock = threading.Lock()
+        # Chat lines are re-counted on every turn; memoize per instance
+        self.count = lru_cache(maxsize=4096)(self._count)
+    
+    def _load_tokenizer(self):
+        """Load the tokenizer once, disabling it if unavailable."""
+        with self._lock:
+            if self._tokenizer is None and self.use_tokenizer:
+                try:
+                    from transformers import AutoTokenizer
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                except Exception:
+                    self.use_tokenizer = False
+        return self._tokenizer
+    
+    def _count(self, text: str) -> int:
+        if not text:
+            return 0
+        tokenizer = self._load_tokenizer() if self.use_tokenizer else None
+        if tokenizer is not None:
+            return len(tokenizer.encode(text, add_special_tokens=False))
+        return math.ceil(len(text) / 4)
+
+
+def extractive_summary(previous: str, messages: list, max_words: int = 24) -> str:
+    """
+    Fold messages into a running summary without calling a model.
+    
+    Keeps the first sentence of each message, shortened to ``max_words``.
+    
+    Args:
+        previous: Summary of the turns before ``messages`` (may be empty)
+        messages: Message dictionaries to add to the summary
+        max_words: Maximum words kept per message
+    
+    Returns:
+        str: Updated summary
+    """
+    points = [previous] if previous else []
+    for msg in messages:
+        content = " ".join(msg.get('content', '').split())
+        if not content:
+            continue
+        sentence = re.split(r'(?<=[.!?])\s', content, maxsplit=1)[0]
+        words = sentence.split()
+        if len(words) > max_words:
+            sentence = " ".join(words[:max_words]) + "..."
+        role = msg.get('role', 'user').capitalize()
+        points.append(f"{role}: {sentence}")
+    return " | ".join(points)
+
+
+class PromptBuilder:
+    """
+    Build prompts that fit a token budget.
+    
+    The system prompt and the most recent turns are always kept verbatim.
+    Older turns that no longer fit are replaced by a rolling summary;
+    summaries are cached by conversation prefix, so each turn only folds
+    the newly dropped messages into the previous summary.
+    """
+    
+    def __init__(
+        self,
+        max_prompt_tokens: int = 2048,
+        summary_max_tokens: int = 256,
+        counter: TokenCounter = None,
+        summarizer: Callable[[str, list], str] = None,
+        max_cached_summaries: int = 512
+    ):
+        """
+        Initialize the builder.
+        
+        Args:
+            max_prompt_tokens: Token budget for the whole prompt
+            summary_max_tokens: Token budget for the summary of older turns
+            counter: Token counter (approximate counter by default)
+            summarizer: Function (previous_summary, messages) -> summary
+            max_cached_summaries: Number of summaries kept in the cache
+        """
+        self.max_prompt_tokens = max_prompt_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.counter = counter or TokenCounter()
+        self.summarizer = summarizer or extractive_summary
+        self.max_cached_summaries = max_cached_summaries
+        self._summaries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def build(self, system_prompt: str, messages: list) -> BuiltPrompt:
+        """
+        Build a prompt from the system prompt and chat history.
+        
+        Args:
+            system_prompt: Instructions placed at the top of the prompt
+            messages: List of message dictionaries with 'role' and 'content'
+        
+        Returns:
+            BuiltPrompt: Prompt text, its token count and how many turns were summarized
+        """
+        header = f"{system_prompt}\n\n"
+        footer = "Assistant: "
+        lines = [
+            f"{msg.get('role', 'user').capitalize()}: {msg.get('content', '')}\n"
+            for msg in messages
+        ]
+        counts = [self.counter.count(line) for line in lines]
+        fixed = self.counter.count(header) + self.counter.count(footer)
+        
+        if fixed + sum(counts) <= self.max_prompt_tokens:
+            return BuiltPrompt(header + "".join(lines) + footer, fixed + sum(counts), 0)
+        
+        # Keep the newest turns that fit next to a summary; the latest turn is always kept
+        budget = self.max_prompt_tokens - fixed - self.summary_max_tokens
+        start = len(lines)
+        used = 0
+        while start > 0 and (start == len(lines) or used + counts[start - 1] <= budget):
+            start -= 1
+            used += counts[start]
+        
+        summary = self._summary(messages, start)
+        parts = [header]
+        if summary:
+            parts.append(f"{SUMMARY_PREFIX}{summary}\n")
+        parts.extend(lines[start:])
+        parts.append(footer)
+        text = "".join(parts)
+        return BuiltPrompt(text, self.counter.count(text), start)
+    
+    def _summary(self, messages: list, end: int) -> str:
+        """
+        Get the rolling summary of ``messages[:end]``.
+        
+        Args:
+            messages: Full chat history
+            end: Number of leading messages to summarize
+        
+        Returns:
+            str: Summary trimmed to ``summary_max_tokens``
+        """
+        if end <= 0:
+            return ""
+        
+        # prefix_keys[i] identifies messages[:i + 1]
+        prefix_keys = []
+        digest = hashlib.sha256()
+        for msg in messages[:end]:
+            digest.update(f"{msg.get('role', '')}\x00{msg.get('content', '')}\x00".encode("utf-8"))
+            prefix_keys.append(digest.copy().hexdigest())
+        
+        with self._lock:
+            cached = self._summaries.get(prefix_keys[-1])
+            if cached is not None:
+                self._summaries.move_to_end(prefix_keys[-1])
+                return cached
+            
+            # Extend the longest summarized prefix instead of starting over
+            previous, done = "", 0
+            for i in range(end - 1, -1, -1):
+                if prefix_keys[i] in self._summaries:
+                    previous, done = self._summaries[prefix_keys[i]], i + 1
+                    break
+        
+        summary = self._trim(self.summarizer(previous, messages[done:end]))
+        
+        with self._lock:
+            self._summaries[prefix_keys[-1]] = summary
+            while len(self._summaries) > self.max_cached_summaries:
+                self._summaries.popitem(last=False)
+        return summary
+    
+    def _trim(self, summary: str) -> str:
+        """Drop the oldest summary points until it fits the summary budget."""
+        points = summary.split(" | ")
+        while len(points) > 1 and self.counter.count(" | ".join(points)) > self.summary_max_tokens:
+            points.pop(0)
+        summary = " | ".join(points)
+        if self.counter.count(summary) > self.summary_max_tokens:
+            summary = summary[-self.summary_max_tokens * 4:]
+        return summary
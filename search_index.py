@@ -0,0 +1,285 @@
+"""Inverted full-text index with BM25 ranking for research topics"""
+import bisect
+import heapq
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or that the this to was were will with
+""".split())
+
+# Suffixes stripped by the light stemmer, longest first
+_SUFFIXES = (
+    ("ational", "ate"), ("ization", "ize"), ("fulness", "ful"), ("iveness", "ive"),
+    ("ements", "e"), ("ement", "e"), ("ments", ""), ("ment", ""), ("ings", ""), ("ing", ""),
+    ("ies", "y"), ("ied", "y"), ("sses", "ss"), ("edly", ""), ("ed", ""), ("ly", ""), ("es", ""), ("s", "")
+)
+
+# Field weights: a term in the title or tags counts more than one in the body
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+
+
+def _drop_final_e(stem: str) -> str:
+    """Drop a trailing "e" so "rate" and "rates" (stripped of "es") agree."""
+    return stem[:-1] if stem.endswith("e") and len(stem) > 3 else stem
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Reduce a word to a crude stem ("savings", "saving" -> "sav").
+    
+    Only suffixes that leave at least three characters are stripped, so
+    short words are kept intact. A final "e" is dropped as well, so
+    singular and plural -e words match ("expense", "expenses" -> "expens").
+    
+    Args:
+        word: Lowercase word
+    
+    Returns:
+        str: Stemmed word
+    """
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                return word
+            return _drop_final_e(word[:-len(suffix)] + replacement)
+    return _drop_final_e(word)
+
+
+def tokenize(text: str) -> list:
+    """
+    Split text into lowercase stemmed terms, dropping stopwords.
+    
+    Args:
+        text: Raw text
+    
+    Returns:
+        list: Terms in text order
+    """
+    return [stem(w) for w in _TOKEN_RE.findall(text.lower()) if w not in STOPWORDS]
+
+
+class InvertedIndex:
+    """
+    Incrementally maintained term -> postings index.
+    
+    Postings map each term to ``{doc_id: weighted term frequency}``. A
+    sorted vocabulary supports prefix queries with binary search, and
+    per-document lengths feed BM25 scoring.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_expansions: int = 32):
+        """
+        Initialize an empty index.
+        
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            max_expansions: Most terms a prefix may expand to (the most frequent are kept)
+        """
+        self.k1 = k1
+        self.b = b
+        self.max_expansions = max_expansions
+        self.postings = {}
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0
+        self.vocabulary = []
+    
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+    
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self.doc_lengths
+    
+    def add(self, doc_id: int, title: str, content: str, tags: list = None):
+        """
+        Index a document, replacing any previous version.
+        
+        Args:
+            doc_id: Document ID
+            title: Title text
+            content: Body text
+            tags: Tag strings
+        """
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+        
+        terms = Counter()
+        for term in tokenize(title):
+            terms[term] += TITLE_WEIGHT
+        for term in tokenize(" ".join(tags or [])):
+            terms[term] += TAG_WEIGHT
+        terms.update(tokenize(content))
+        
+        for term, frequency in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+            postings[doc_id] = frequency
+        
+        length = sum(terms.values())
+        self.doc_terms[doc_id] = tuple(terms)
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+    
+    def remove(self, doc_id: int) -> bool:
+        """
+        Remove a document from the index.
+        
+        Args:
+            doc_id: Document ID
+        
+        Returns:
+            bool: True if the document was indexed
+        """
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                i = bisect.bisect_left(self.vocabulary, term)
+                del self.vocabulary[i]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        return True
+    
+    def expand_prefix(self, prefix: str) -> list:
+        """
+        Get every indexed term starting with a prefix.
+        
+        Args:
+            prefix: Lowercase prefix
+        
+        Returns:
+            list: Matching terms in sorted order
+        """
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + "\uffff", lo=start)
+        return self.vocabulary[start:end]
+    
+    def _partial_suffix_stems(self, fragment: str) -> list:
+        """
+        Indexed stems of words that ``fragment`` is the start of, cut inside a suffix.
+        
+        The vocabulary holds stems, so "savi" (of "savings", stem "sav")
+        is not a prefix of anything indexed. For each stemmer suffix whose
+        beginning ends the fragment, the stem the whole word would get is
+        looked up instead.
+        
+        Args:
+            fragment: Lowercase partial word
+        
+        Returns:
+            list: Matching stems
+        """
+        stems = []
+        for suffix, replacement in _SUFFIXES:
+            for cut in range(1, len(suffix)):
+                if fragment.endswith(suffix[:cut]) and len(fragment) - cut >= 3:
+                    candidate = _drop_final_e(fragment[:-cut] + replacement)
+                    if candidate in self.postings and candidate not in stems:
+                        stems.append(candidate)
+        return stems
+    
+    def _expand(self, word: str, prefix: bool) -> list:
+        """Terms a query word stands for: its stem, plus prefix matches if requested."""
+        terms = [t for t in tokenize(word) if t in self.postings]
+        if prefix:
+            raw = "".join(_TOKEN_RE.findall(word.lower()))
+            if raw:
+                expanded = self.expand_prefix(raw) + self._partial_suffix_stems(raw)
+                if len(expanded) > self.max_expansions:
+                    # A short prefix can match thousands of terms; keep the common ones
+                    expanded = sorted(expanded, key=lambda t: len(self.postings[t]), reverse=True)
+                    expanded = expanded[:self.max_expansions]
+                terms.extend(t for t in expanded if t not in terms)
+        return terms
+    
+    def search(self, query: str, limit: int = None, prefix_last: bool = True) -> list:
+        """
+        Run a query and rank the matches with BM25.
+        
+        Words are ANDed; ``OR`` (upper case) separates alternatives, e.g.
+        ``tax deduction OR retirement``. A trailing ``*`` makes a word a
+        prefix, and with ``prefix_last`` the final word is always treated
+        as a prefix so results appear while the user is still typing.
+        
+        Args:
+            query: Query string
+            limit: Maximum number of results (all if None)
+            prefix_last: Treat the last word as a prefix
+        
+        Returns:
+            list: (doc_id, score) pairs, best first
+        """
+        groups = [[]]
+        for word in query.split():
+            if word == "OR":
+                groups.append([])
+            else:
+                groups[-1].append(word)
+        groups = [g for g in groups if g]
+        if not groups:
+            return []
+        
+        matches = set()
+        scored_terms = set()
+        for g, words in enumerate(groups):
+            docs = None
+            for w, word in enumerate(words):
+                is_prefix = word.endswith("*") or (prefix_last and g == len(groups) - 1 and w == len(words) - 1)
+                terms = self._expand(word.rstrip("*"), is_prefix)
+                if not terms:
+                    if tokenize(word.rstrip("*")) or is_prefix:
+                        docs = set()
+                        break
+                    continue  # stopword only
+                word_docs = set()
+                for term in terms:
+                    word_docs.update(self.postings[term])
+                docs = word_docs if docs is None else docs & word_docs
+                scored_terms.update(terms)
+                if not docs:
+                    break
+            if docs:
+                matches |= docs
+        
+        if not matches:
+            return []
+        
+        scores = dict.fromkeys(matches, 0.0)
+        n = len(self.doc_lengths)
+        average_length = self.total_length / n if n else 1.0
+        lengths = self.doc_lengths
+        k1 = self.k1
+        base = k1 * (1 - self.b)
+        slope = k1 * self.b / average_length
+        for term in scored_terms:
+            postings = self.postings[term]
+            weight = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5)) * (k1 + 1)
+            # Walk whichever side is smaller: the postings or the matched documents
+            if len(postings) <= len(scores):
+                for doc_id, frequency in postings.items():
+                    if doc_id in scores:
+                        scores[doc_id] += weight * frequency / (frequency + base + slope * lengths[doc_id])
+            else:
+                for doc_id in scores:
+                    frequency = postings.get(doc_id)
+                    if frequency:
+                        scores[doc_id] += weight * frequency / (frequency + base + slope * lengths[doc_id])
+        
+        # Ties go to the newest topic
+        if limit:
+            return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True)
@@ -0,0 +1,14 @@
+"""Import the repository as the ``utils`` package, the way the app uses it"""
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+if getattr(sys.modules.get("utils"), "__path__", None) != [str(ROOT)]:
+    spec = importlib.util.spec_from_file_location(
+        "utils", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["utils"] = package
+    spec.loader.exec_module(package)
@@ -0,0 +1,56 @@
+import re
+
+from utils.categorizer import Categorizer, _required_literal, _trie_regex
+
+
+def test_keywords_match_whole_words_only():
+    categorizer = Categorizer()
+    assert categorizer.categorize("SHELL OIL 5532") == "Transportation"
+    assert categorizer.categorize("SHELLFISH SHACK") == "Other"
+
+
+def test_longest_keyword_wins():
+    categorizer = Categorizer()
+    assert categorizer.match("UBER EATS 8841") == ("Food", "uber eats")
+    assert categorizer.match("UBER 8841") == ("Transportation", "uber")
+
+
+def test_regex_rules_take_precedence_over_keywords():
+    categorizer = Categorizer()
+    assert categorizer.categorize("AMZN Mktp US*2K4") == "Shopping"
+    assert categorizer.categorize("UBER *TRIP HELP.UBER.COM") == "Transportation"
+
+
+def test_trie_regex_matches_exactly_the_keywords():
+    pattern = re.compile(rf"(?:{_trie_regex(['car', 'card', 'cart', 'cab'])})$")
+    for word in ("car", "card", "cart", "cab"):
+        assert pattern.match(word), word
+    for word in ("ca", "cars", "cabs"):
+        assert not pattern.match(word), word
+
+
+def test_required_literal_skips_optional_characters():
+    assert _required_literal(r"paypals{0,1}") == "paypal"
+    assert _required_literal(r"\bvenmo\s+payment\b") == "payment"
+    assert _required_literal(r"zelles?") == "zelle"
+    assert _required_literal(r"ab*") is None
+    assert _required_literal(r"venmo|zelle") is None
+
+
+def test_quantified_regex_rules_are_not_prefiltered_away():
+    categorizer = Categorizer(rules=(), regex_rules=[("Transfers", r"paypals{0,1}")])
+    assert categorizer.categorize("PAYPAL *JOHNDOE") == "Transfers"
+    assert categorizer.categorize("PAYPALS INC") == "Transfers"
+    assert categorizer.categorize("VENMO") == "Other"
+
+
+def test_stats_count_every_call_including_memo_hits():
+    categorizer = Categorizer()
+    assert categorizer.categorize_many(["NETFLIX.COM", "NETFLIX.COM", "UNKNOWN"]) == [
+        "Entertainment", "Entertainment", "Other"
+    ]
+    assert categorizer.calls == 3
+    assert categorizer.rule_hits["netflix"] == 2
+    assert categorizer.category_hits["Other"] == 1
+    categorizer.reset_stats()
+    assert categorizer.calls == 0
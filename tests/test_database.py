@@ -0,0 +1,103 @@
+import pytest
+
+st = pytest.importorskip("streamlit")
+
+from utils.database import (
+    ResearchDatabase,
+    SessionStateStorage,
+    SharedMemoryStorage,
+    SharedStoreRegistry,
+    SQLiteStorage,
+    TopicStore,
+    normalize_tag,
+)
+
+
+def make_store(count: int = 5) -> TopicStore:
+    store = TopicStore()
+    for i in range(count):
+        store.add(f"Topic {i}", f"notes {i}", ["even" if i % 2 == 0 else "odd", "all"])
+    return store
+
+
+def test_ids_are_monotonic_and_never_reused():
+    store = make_store(3)
+    assert store.delete(3)
+    assert store.add("New", "notes", [])["id"] == 4
+    assert store.get(3) is None
+
+
+def test_pages_are_keyset_ordered():
+    store = make_store(5)
+    assert [t["id"] for t in store.page(limit=2)] == [5, 4]
+    assert [t["id"] for t in store.page(after_id=4, limit=2)] == [3, 2]
+    assert [t["id"] for t in store.page(after_id=2, limit=2, order="asc")] == [3, 4]
+
+
+def test_delete_leaves_tombstones_until_compaction():
+    store = make_store(200)
+    for topic_id in range(1, 101):
+        assert store.delete(topic_id)
+    assert not store.delete(1)
+    assert store.tombstones == 100
+    assert store.delete(101)
+    assert store.tombstones == 0
+    assert len(store.topics) == len(store) == 99
+    assert [t["id"] for t in store.page(limit=2, order="asc")] == [102, 103]
+    assert store.get(150)["title"] == "Topic 149"
+
+
+def test_tag_index_follows_updates_and_deletes():
+    store = make_store(4)
+    assert store.ids_by_tags(["EVEN", "all"]) == {1, 3}
+    assert store.ids_by_tags(["even", "odd"], match_all=False) == {1, 2, 3, 4}
+    store.update(1, tags=["odd"])
+    store.delete(2)
+    assert store.ids_by_tags(["odd"]) == {1, 4}
+    assert store.tag_counts() == {"odd": 2, "all": 2, "even": 1}
+    assert normalize_tag("  Even ") == "even"
+
+
+def test_update_is_searchable_and_keeps_other_fields():
+    store = make_store(2)
+    assert store.update(1, content="mortgage refinancing")
+    topic = store.get(1)
+    assert topic["title"] == "Topic 0" and topic["tags"] == ["even", "all"]
+    assert [doc_id for doc_id, _ in store.search_index.search("mortgage")] == [1]
+    assert not store.update(99, title="Missing")
+
+
+@pytest.fixture(params=["session", "shared", "sqlite"])
+def research_db(request, monkeypatch, tmp_path):
+    if request.param == "session":
+        st.session_state.pop("research_store", None)
+        backend = SessionStateStorage()
+    elif request.param == "shared":
+        backend = SharedMemoryStorage(SharedStoreRegistry(), namespace="test")
+    else:
+        backend = SQLiteStorage(str(tmp_path / "topics.db"))
+    monkeypatch.setattr(ResearchDatabase, "_backend", backend)
+    ResearchDatabase.initialize()
+    return ResearchDatabase
+
+
+def test_search_page_filters_by_tag_before_paging(research_db):
+    for i in range(12):
+        research_db.add_topic(f"Rate note {i}", "interest rates", ["odd"] if i % 2 else ["even"])
+    first = research_db.search_page("rate", offset=0, limit=4, tags=["odd"])
+    second = research_db.search_page("rate", offset=4, limit=4, tags=["odd"])
+    assert len(first) == 4 and len(second) == 2
+    assert all("odd" in t["tags"] for t in first + second)
+    assert not {t["id"] for t in first} & {t["id"] for t in second}
+    assert research_db.search_page("mortgage") == []
+
+
+def test_list_topics_pages_newest_first(research_db):
+    for i in range(5):
+        research_db.add_topic(f"Topic {i}", "notes", ["a"] if i < 3 else ["b"])
+    newest = research_db.list_topics(limit=2)
+    assert [t["title"] for t in newest] == ["Topic 4", "Topic 3"]
+    rest = research_db.list_topics(after_id=newest[-1]["id"], limit=10)
+    assert [t["title"] for t in rest] == ["Topic 2", "Topic 1", "Topic 0"]
+    tagged = research_db.list_topics(limit=10, tags=["a"])
+    assert [t["title"] for t in tagged] == ["Topic 2", "Topic 1", "Topic 0"]
@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+from utils.insights import DEBT_TO_ANNUAL_INCOME_LIMIT, MAX_FINDINGS, compute_insights, describe, get_insights
+
+
+def budget(**overrides) -> dict:
+    data = {
+        'monthly_income': 5000.0,
+        'monthly_expenses': 4000.0,
+        'total_debt': 0.0,
+        'spending': {'Housing': 1500.0, 'Food': 600.0}
+    }
+    data.update(overrides)
+    return data
+
+
+class FakeModel:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+    
+    def generate_response(self, messages, user_type="professional", max_tokens=512, temperature=0.7):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def kinds(summary: dict) -> list:
+    return [finding['kind'] for finding in summary['findings']]
+
+
+def test_typical_budget_has_no_findings():
+    summary = compute_insights(budget())
+    assert summary['ratios'] == {'savings_rate': 20.0, 'debt_to_annual_income': 0.0, 'expense_ratio': 80.0}
+    assert summary['categories']['Housing'] == {'amount': 1500.0, 'share': 0.3, 'z': 0.0}
+    assert summary['findings'] == []
+
+
+def test_debt_is_compared_with_a_year_of_income():
+    # 15000 is three months of income but only a quarter of a year's
+    assert compute_insights(budget(total_debt=15000.0))['ratios']['debt_to_annual_income'] == 25.0
+    assert 'high_debt' in kinds(compute_insights(budget(total_debt=15000.0)))
+    assert DEBT_TO_ANNUAL_INCOME_LIMIT == 20
+    assert 'high_debt' not in kinds(compute_insights(budget(total_debt=6000.0)))
+
+
+def test_categories_far_from_the_benchmark_are_findings():
+    summary = compute_insights(budget(monthly_expenses=4900.0, spending={'Housing': 2500.0, 'Food': 100.0}))
+    assert kinds(summary) == ['above_benchmark', 'below_benchmark', 'low_savings']
+    assert all(describe(finding) for finding in summary['findings'])
+
+
+def test_month_over_month_changes_need_size_and_share():
+    history = {
+        '2026-08': {'Food': 400.0, 'Shopping': 100.0, 'Utilities': 300.0},
+        '2026-09': {'Food': 600.0, 'Shopping': 140.0, 'Utilities': 330.0}
+    }
+    summary = compute_insights(budget(), history)
+    assert summary['categories']['Food']['mom'] == 0.5
+    increases = [finding['category'] for finding in summary['findings'] if finding['kind'] == 'increase']
+    assert increases == ['Food']
+
+
+def test_findings_are_capped_and_ordered_by_weight():
+    spending = {category: 1200.0 for category in ('Food', 'Transportation', 'Entertainment', 'Healthcare', 'Shopping', 'Utilities')}
+    findings = compute_insights(budget(monthly_expenses=7200.0, spending=spending))['findings']
+    assert len(findings) == MAX_FINDINGS
+    weights = [finding['weight'] for finding in findings]
+    assert weights == sorted(weights, reverse=True)
+
+
+def test_failed_narratives_are_not_cached():
+    data = budget(monthly_income=5123.0)
+    model = FakeModel("Error generating response: timeout", "  Spend less on food.  ")
+    assert get_insights(data, model=model)['narrative'] is None
+    assert get_insights(data, model=model)['narrative'] == "Spend less on food."
+    assert get_insights(data, model=model)['narrative'] == "Spend less on food."
+    assert model.calls == 2
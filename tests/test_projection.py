@@ -0,0 +1,56 @@
+import numpy as np
+
+from utils.projection import ProjectionAssumptions, debt_schedule, project
+
+# No growth, inflation, interest or randomness: every path is plain arithmetic
+FLAT = ProjectionAssumptions(
+    income_growth=0.0,
+    income_growth_volatility=0.0,
+    inflation=0.0,
+    inflation_volatility=0.0,
+    investment_return=0.0,
+    investment_volatility=0.0,
+    debt_interest_rate=0.0
+)
+
+
+def test_debt_schedule_stops_paying_once_repaid():
+    balances, payments = debt_schedule(250.0, 100.0, 0.0, 5)
+    assert balances.tolist() == [150.0, 50.0, 0.0, 0.0, 0.0]
+    assert payments.tolist() == [100.0, 100.0, 50.0, 0.0, 0.0]
+
+
+def test_debt_schedule_accrues_monthly_interest():
+    balances, payments = debt_schedule(1000.0, 0.0, 0.12, 2)
+    assert np.allclose(balances, [1010.0, 1020.1])
+    assert payments.tolist() == [0.0, 0.0]
+
+
+def test_flat_projection_adds_the_surplus_each_month():
+    result = project(5000, 4000, savings=1000, years=2, paths=10, chunk_size=4, assumptions=FLAT, seed=1)
+    assert result.months.tolist() == [12, 24]
+    assert result.balances.shape == (10, 2)
+    assert np.allclose(result.balances, [13000.0, 25000.0])
+    assert result.debt_free_month() == 0
+
+
+def test_debt_payments_come_out_of_savings():
+    result = project(5000, 4000, debt=1000, debt_payment=500, years=1, paths=3, assumptions=FLAT, seed=1)
+    assert np.allclose(result.balances[:, -1], 12000 - 1000)
+    assert result.debt_free_month() == 2
+
+
+def test_same_seed_same_paths():
+    first = project(5000, 4000, years=3, paths=500, chunk_size=128, seed=7)
+    second = project(5000, 4000, years=3, paths=500, chunk_size=128, seed=7)
+    assert np.array_equal(first.balances, second.balances)
+
+
+def test_percentiles_and_probabilities_are_per_month():
+    result = project(5000, 4500, years=5, paths=2000, seed=3)
+    fan = result.percentiles((5, 50, 95))
+    assert list(fan.columns) == ["p5", "p50", "p95"]
+    assert (fan["p5"] <= fan["p50"]).all() and (fan["p50"] <= fan["p95"]).all()
+    odds = result.probability_above(0)
+    assert list(odds.index) == [12, 24, 36, 48, 60]
+    assert ((odds >= 0) & (odds <= 1)).all()
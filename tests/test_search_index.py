@@ -0,0 +1,79 @@
+from utils.search_index import InvertedIndex, stem, tokenize
+
+
+def make_index() -> InvertedIndex:
+    index = InvertedIndex()
+    index.add(1, "Interest rates", "How rates affect savings accounts", ["banking"])
+    index.add(2, "Monthly expenses", "Track every expense and cut recurring costs", ["budget"])
+    index.add(3, "Retirement planning", "Roth IRA and 401k contributions", ["retirement"])
+    return index
+
+
+def ids(results: list) -> list:
+    return [doc_id for doc_id, _ in results]
+
+
+def test_singular_and_plural_e_words_share_a_stem():
+    assert stem("rate") == stem("rates")
+    assert stem("expense") == stem("expenses")
+    assert stem("income") == stem("incomes")
+    assert stem("saving") == stem("savings") == "sav"
+    assert stem("glass") == "glass"
+
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("The rate of the fund") == [stem("rate"), "fund"]
+
+
+def test_plural_matches_singular_query_in_any_position():
+    index = make_index()
+    assert ids(index.search("rate interest")) == [1]
+    assert ids(index.search("expenses track")) == [2]
+
+
+def test_words_cut_off_while_typing_still_match():
+    index = make_index()
+    for fragment in ("sav", "savi", "savin", "retirem", "retiremen", "expen"):
+        assert ids(index.search(fragment)), fragment
+
+
+def test_prefix_only_applies_to_the_last_word_unless_starred():
+    index = make_index()
+    assert index.search("retirem planning", prefix_last=False) == []
+    assert ids(index.search("plan* retirement", prefix_last=False)) == [3]
+
+
+def test_words_are_anded_and_or_separates_alternatives():
+    index = make_index()
+    assert index.search("interest budget") == []
+    assert sorted(ids(index.search("interest OR budget"))) == [1, 2]
+
+
+def test_title_matches_outrank_body_matches():
+    index = InvertedIndex()
+    index.add(1, "Notes", "emergency fund basics", [])
+    index.add(2, "Emergency fund", "notes", [])
+    assert ids(index.search("emergency", prefix_last=False)) == [2, 1]
+
+
+def test_limit_keeps_the_best_results():
+    index = make_index()
+    assert len(index.search("rates OR expense OR roth", limit=2)) == 2
+
+
+def test_readding_a_document_replaces_it():
+    index = make_index()
+    index.add(1, "Mortgage", "fixed or variable", [])
+    assert index.search("interest") == []
+    assert ids(index.search("mortgage")) == [1]
+    assert len(index) == 3
+
+
+def test_remove_drops_postings_and_vocabulary():
+    index = make_index()
+    assert index.remove(3)
+    assert not index.remove(3)
+    assert 3 not in index
+    assert index.search("roth") == []
+    assert "roth" not in index.vocabulary
+    assert index.total_length == sum(index.doc_lengths.values())
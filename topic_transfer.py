@@ -0,0 +1,212 @@
+"""Streaming JSONL/Parquet readers and writers for research topic import/export"""
+import argparse
+import json
+import sys
+import time
+from typing import Iterable, Iterator
+
+
+FORMATS = ("jsonl", "parquet")
+
+# Column order used by every export
+EXPORT_FIELDS = ('id', 'title', 'content', 'tags', 'created_at', 'updated_at')
+
+
+def _require_pyarrow():
+    """Import pyarrow lazily; it is only needed for Parquet."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet import/export needs pyarrow: pip install pyarrow") from e
+    return pyarrow, pyarrow.parquet
+
+
+def read_jsonl(stream) -> Iterator[dict]:
+    """
+    Read topic records from JSON Lines, one line at a time.
+    
+    Args:
+        stream: Text or binary file object
+    
+    Yields:
+        dict: One record per non-blank line
+    """
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object")
+        yield record
+
+
+def write_jsonl(stream, topics: Iterable[dict]) -> int:
+    """
+    Write topics as JSON Lines.
+    
+    Args:
+        stream: Text file object
+        topics: Topic dicts
+    
+    Returns:
+        int: Number of topics written
+    """
+    count = 0
+    for topic in topics:
+        stream.write(json.dumps({field: topic.get(field) for field in EXPORT_FIELDS}, ensure_ascii=False))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def read_parquet(source, batch_size: int = 1000) -> Iterator[dict]:
+    """
+    Read topic records from Parquet one record batch at a time.
+    
+    Args:
+        source: Path or binary file object
+        batch_size: Rows decoded per batch
+    
+    Yields:
+        dict: One record per row
+    """
+    _, pq = _require_pyarrow()
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def write_parquet(stream, topics: Iterable[dict], batch_size: int = 1000) -> int:
+    """
+    Write topics to Parquet, one row group per ``batch_size`` topics.
+    
+    Args:
+        stream: Path or binary file object
+        topics: Topic dicts
+        batch_size: Topics buffered per row group
+    
+    Returns:
+        int: Number of topics written
+    """
+    pa, pq = _require_pyarrow()
+    schema = pa.schema([
+        ('id', pa.int64()),
+        ('title', pa.string()),
+        ('content', pa.string()),
+        ('tags', pa.list_(pa.string())),
+        ('created_at', pa.string()),
+        ('updated_at', pa.string())
+    ])
+    count = 0
+    rows = []
+    with pq.ParquetWriter(stream, schema) as writer:
+        for topic in topics:
+            rows.append({field: topic.get(field) for field in EXPORT_FIELDS})
+            if len(rows) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                count += len(rows)
+                rows = []
+        if rows or not count:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            count += len(rows)
+    return count
+
+
+def read_topics(source, format: str = "jsonl", batch_size: int = 1000) -> Iterator[dict]:
+    """
+    Read topic records in either supported format.
+    
+    Args:
+        source: File object (binary for Parquet) or path for Parquet
+        format: "jsonl" or "parquet"
+        batch_size: Rows decoded per Parquet batch
+    
+    Returns:
+        Iterator[dict]: Records in file order
+    """
+    if format == "jsonl":
+        return read_jsonl(source)
+    if format == "parquet":
+        return read_parquet(source, batch_size)
+    raise ValueError(f"Unsupported format {format!r}; expected one of {', '.join(FORMATS)}")
+
+
+def write_topics(stream, topics: Iterable[dict], format: str = "jsonl", batch_size: int = 1000) -> int:
+    """
+    Write topics in either supported format.
+    
+    Args:
+        stream: Text file object for JSONL, binary file object or path for Parquet
+        topics: Topic dicts
+        format: "jsonl" or "parquet"
+        batch_size: Topics per Parquet row group
+    
+    Returns:
+        int: Number of topics written
+    """
+    if format == "jsonl":
+        return write_jsonl(stream, topics)
+    if format == "parquet":
+        return write_parquet(stream, topics, batch_size)
+    raise ValueError(f"Unsupported format {format!r}; expected one of {', '.join(FORMATS)}")
+
+
+def _run_command(command: str, file: str, format: str, batch_size: int) -> int:
+    """Run one import or export against the configured database; return the topic count."""
+    from utils.database import ResearchDatabase
+    
+    if command == "import":
+        if file == "-":
+            return ResearchDatabase.bulk_import(read_jsonl(sys.stdin), batch_size)
+        if format == "parquet":
+            return ResearchDatabase.bulk_import(read_parquet(file, batch_size), batch_size)
+        with open(file, encoding="utf-8") as f:
+            return ResearchDatabase.bulk_import(read_jsonl(f), batch_size)
+    
+    if file == "-":
+        return ResearchDatabase.export(sys.stdout, format, batch_size)
+    if format == "parquet":
+        return ResearchDatabase.export(file, format, batch_size)
+    with open(file, "w", encoding="utf-8") as f:
+        return ResearchDatabase.export(f, format, batch_size)
+
+
+def main():
+    """Command line entry point: ``python -m utils.topic_transfer {import,export} FILE``."""
+    from utils.database import ResearchDatabase, SQLiteStorage
+    
+    parser = argparse.ArgumentParser(description="Import or export research topics")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("file", help="JSONL or Parquet file, or - for stdin/stdout (JSONL only)")
+    parser.add_argument("--db", required=True, help="SQLite research database")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000, help="topics per transaction / row group")
+    args = parser.parse_args()
+    
+    format = args.format or ("parquet" if args.file.endswith(".parquet") else "jsonl")
+    if args.file == "-" and format == "parquet":
+        parser.error("Parquet needs a file path")
+    ResearchDatabase.configure(SQLiteStorage(args.db))
+    
+    start = time.perf_counter()
+    try:
+        count = _run_command(args.command, args.file, format, args.batch_size)
+    except (ImportError, ValueError) as e:
+        sys.exit(f"error: {e}")
+    elapsed = time.perf_counter() - start
+    
+    # Stats go to stderr so exporting to stdout stays clean
+    print(json.dumps({
+        'command': args.command,
+        'format': format,
+        'topics': count,
+        'seconds': round(elapsed, 3),
+        'topics_per_second': round(count / elapsed, 1) if elapsed else None
+    }), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()